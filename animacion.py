@@ -0,0 +1,128 @@
+import os
+import threading
+
+from pantalla import TAMANOS, Pantalla
+from simulacion import Local
+
+
+class LocalAnimado(Local):
+    """
+    Local que se dibuja con pygame cada 100 segundos simulados, a fps actualizaciones por segundo.
+    Las subclases indican el modelo ("tp7" o "tp8"), que define la ventana y el formato de los textos.
+    """
+    modelo = None
+
+    def __init__(self, cantidad_boxes, fps=None, **opciones):
+        super().__init__(cantidad_boxes, **opciones)
+        self.fps = fps
+        self.pantalla = None  # Pantalla que dibuja la animación
+        self.reloj = None  # pygame.time.Clock que limita las actualizaciones por segundo
+        self.bloqueo = threading.Lock()  # Protege la superficie de la pantalla
+        self.grabador = None  # GrabadorVideo que recibe un frame por actualización de pantalla
+
+    def simular(self, motor=None, headless=False, al_observar=None):
+        """
+        Simula la operación del local durante un día actualizando la pantalla.
+        Con headless=True no la actualiza (no necesita pygame ni limita los fps), y al_observar
+        reemplaza a actualizar_pantalla: se llama cada 100 segundos con el tiempo actual.
+        """
+        if al_observar is None and not headless:
+            al_observar = self.actualizar_pantalla
+        return super().simular(motor, al_observar)
+
+    def __getstate__(self):
+        estado = super().__getstate__()
+        for nombre in ("pantalla", "reloj", "grabador", "bloqueo"):  # La ventana y el video no son parte del estado
+            estado[nombre] = None
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self.bloqueo = threading.Lock()
+
+    def actualizar_pantalla(self, tiempo_actual):
+        """
+        Actualiza la pantalla con los datos de la simulación (solo lo que cambió desde la última vez).
+        """
+        # --- Bloquear la superficie de la pantalla antes de modificarla ---
+        with self.bloqueo:
+            self.pantalla.dibujar(self, tiempo_actual)
+            if self.grabador is not None:
+                self.grabador.capturar(self.pantalla.superficie, tiempo_actual)
+            if self.reloj is not None:
+                self.reloj.tick(self.fps)  # Limitar la velocidad de la animación
+
+
+def pedir_configuracion(velocidades):
+    """
+    Pide por consola la cantidad de boxes (entre 1 y 10) y una de las velocidades (en fps).
+    Si no ingresa uno válido, vuelve a pedirlo.
+    """
+    opciones = ", ".join(f"{i}: {fps} fps" for i, fps in enumerate(velocidades, 1))
+    cantidad_boxes = int(input("\nIngrese la cantidad de boxes (entre 1 y 10): "))
+    opcion = int(input(f"\nIngrese una velocidad ({opciones}): "))
+
+    while cantidad_boxes < 1 or cantidad_boxes > 10:
+        print("\n\nPor favor ingrese una cantidad de box válida\n\n")
+        cantidad_boxes = int(input("Ingrese la cantidad de boxes (entre 1 y 10): "))
+
+    while opcion < 1 or opcion > len(velocidades):
+        print("\n\nPor favor ingrese una velocidad válida\n\n")
+        opcion = int(input(f"Ingrese una velocidad ({opciones}): "))
+
+    return cantidad_boxes, velocidades[opcion - 1]
+
+
+def nombre_disponible(modelo):
+    """
+    Busca un nombre de archivo de video que no exista.
+    """
+    nombre_archivo = f"animacion_{modelo}.avi"
+    contador = 2
+    while os.path.exists(nombre_archivo):
+        nombre_archivo = f"animacion{contador}_{modelo}.avi"
+        contador += 1
+    return nombre_archivo
+
+
+def animar(local, motor=None):
+    """
+    Simula el día de local en un thread mostrando la animación en una ventana de pygame y
+    grabándola en video.
+    """
+    import pygame
+
+    from grabacion import GrabadorVideo
+
+    # Inicializar pygame
+    pygame.init()
+    screen = pygame.display.set_mode(TAMANOS[local.modelo])
+    pygame.display.set_caption("Simulación de Boxes de Atención")
+    local.reloj = pygame.time.Clock()
+    local.pantalla = Pantalla(screen, local.modelo, local.cantidad_boxes)
+
+    # --- Configuración de la exportación de video (del mismo tamaño que la ventana) ---
+    local.grabador = GrabadorVideo(nombre_disponible(local.modelo), local.fps, screen.get_size())
+
+    # Simular en un thread separado (cada actualizar_pantalla entrega su frame al grabador)
+    simulation_thread = threading.Thread(target=local.simular, kwargs={"motor": motor})
+    simulation_thread.start()
+
+    # Loop principal de pygame: atender los eventos de la ventana mientras dura la simulación
+    running = True
+    while running and simulation_thread.is_alive():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        simulation_thread.join(timeout=0.05)  # Esperar sin ocupar el procesador
+
+    # --- Mantener la ventana abierta por un breve tiempo después de la simulación ---
+    if running:
+        pygame.time.delay(500)  # Esperar 500 milisegundos (medio segundo)
+
+    # --- Esperar a que la simulación termine antes de cerrar el archivo ---
+    simulation_thread.join()  # Espera a que el hilo termine
+
+    # --- Liberar recursos ---
+    local.grabador.imprimir_resumen(local.grabador.cerrar())  # Cierra el archivo de video
+    pygame.quit()
@@ -0,0 +1,237 @@
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from llegadas import PERFILES
+from motor_vectorizado import simular_lote
+from muestreo_atencion import DISTRIBUCIONES_CLI
+from semillas import entropia, flujos_replicas, reduccion_varianza
+
+
+def intervalo_confianza(valores, nivel=0.95):
+    """
+    Devuelve la media y el semiancho del intervalo de confianza (t de Student) de la media.
+    """
+    from scipy.stats import t
+
+    n = len(valores)
+    media = float(np.mean(valores))
+    if n < 2:
+        return media, math.inf
+    return media, float(t.ppf(0.5 + nivel / 2, n - 1) * np.std(valores, ddof=1) / math.sqrt(n))
+
+
+class ResumenConfiguracion:
+    """
+    Estadísticas agregadas de todas las réplicas de una cantidad de boxes.
+    """
+    def __init__(self, cantidad_boxes, costo, atendidos, abandonados, tiempo_max_espera, nivel=0.95):
+        self.cantidad_boxes = cantidad_boxes
+        self.replicas = len(costo)
+        self.costos = costo  # Costo de cada réplica, en orden de réplica
+        self.costo_medio, self.costo_ic = intervalo_confianza(costo, nivel)
+        self.abandonados_medio, self.abandonados_ic = intervalo_confianza(abandonados, nivel)
+        self.atendidos_medio = float(np.mean(atendidos))
+        ingresados = atendidos + abandonados
+        self.tasa_abandono = float(abandonados.sum() / max(ingresados.sum(), 1))
+        # Semiancho del intervalo de confianza de la fracción de clientes abandonados en cada réplica
+        self.tasa_abandono_ic = intervalo_confianza(abandonados / np.maximum(ingresados, 1), nivel)[1]
+        self.espera_max_media = float(np.mean(tiempo_max_espera))
+
+    def __repr__(self):
+        return f"ResumenConfiguracion(cantidad_boxes={self.cantidad_boxes}, costo_medio={self.costo_medio:.0f} ± {self.costo_ic:.0f})"
+
+
+def _simular_tarea(tarea):
+    """
+    Simula un bloque de réplicas de una cantidad de boxes (se ejecuta en un proceso del pool).
+    """
+    cantidad_boxes, desde, replicas, modelo, atencion, semilla, comunes = tarea
+    flujos = flujos_replicas(semilla, replicas, desde, configuracion=None if comunes else cantidad_boxes)
+    resultados = simular_lote(cantidad_boxes, replicas, perfil=PERFILES[modelo], muestreador=atencion, flujos=flujos)
+    return cantidad_boxes, resultados.calcular_costo(), resultados.clientes_atendidos, resultados.clientes_abandonados, resultados.tiempo_max_espera
+
+
+def dividir_tareas(cantidades_boxes, replicas, modelo, atencion, semilla, tamano_bloque, comunes=True, desde=0):
+    """
+    Reparte las réplicas desde..desde+replicas de cada cantidad de boxes en bloques. Con comunes, la
+    réplica i usa los mismos flujos aleatorios en todas las cantidades de boxes.
+    """
+    semilla = entropia(semilla)
+    return [
+        (cantidad_boxes, inicio, min(tamano_bloque, desde + replicas - inicio), modelo, atencion, semilla, comunes)
+        for cantidad_boxes in cantidades_boxes
+        for inicio in range(desde, desde + replicas, tamano_bloque)
+    ]
+
+
+def barrer_boxes(cantidades_boxes=range(1, 11), replicas=1000, modelo="tp8", semilla=None, procesos=None, tamano_bloque=250, nivel=0.95, atencion=None, comunes=True):
+    """
+    Simula todas las cantidades de boxes repartiendo los bloques de réplicas entre los núcleos.
+    atencion es la configuración de la distribución de los tiempos de atención (ver crear_muestreador)
+    y comunes indica si se usan números aleatorios comunes entre cantidades de boxes.
+
+    Devuelve el resumen de cada cantidad de boxes, ordenado por cantidad de boxes.
+    """
+    cantidades_boxes = list(cantidades_boxes)
+    tareas = dividir_tareas(cantidades_boxes, replicas, modelo, atencion, semilla, tamano_bloque, comunes)
+    procesos = procesos or os.cpu_count()
+
+    if procesos == 1:
+        salidas = list(map(_simular_tarea, tareas))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            salidas = list(pool.map(_simular_tarea, tareas))
+
+    resumenes = [resumir(cantidad_boxes, [salida[1:] for salida in salidas if salida[0] == cantidad_boxes], nivel)
+                 for cantidad_boxes in cantidades_boxes]
+    comparar_con_mejor(resumenes, nivel)
+    return resumenes
+
+
+def resumir(cantidad_boxes, partes, nivel=0.95):
+    """
+    Resume los bloques de réplicas (en orden de réplica) de una cantidad de boxes.
+    """
+    costo, atendidos, abandonados, tiempo_max_espera = (np.concatenate(columna) for columna in zip(*partes))
+    return ResumenConfiguracion(cantidad_boxes, costo, atendidos, abandonados, tiempo_max_espera, nivel)
+
+
+def barrer_secuencial(cantidades_boxes=range(1, 11), tolerancia_costo=500, tolerancia_abandono=0.01, lote=100,
+                      presupuesto=100000, modelo="tp8", semilla=None, procesos=None, tamano_bloque=250, nivel=0.95,
+                      atencion=None, comunes=True, relativa=False):
+    """
+    Simula cada cantidad de boxes en tandas hasta que el semiancho del intervalo de confianza del
+    costo medio baja de tolerancia_costo (con relativa, de esa fracción del costo medio) y el de
+    la tasa de abandono de tolerancia_abandono (None para no exigirlo), o hasta gastar presupuesto
+    réplicas entre todas las configuraciones.
+
+    Todas empiezan con lote réplicas. Después, cada configuración que no llegó a la tolerancia pide
+    las réplicas que le faltarían según su varianza (n * (semiancho / tolerancia) ** 2 en total),
+    a lo sumo duplicando las que tiene. Con comunes, la réplica i es el mismo día en todas.
+
+    presupuesto tiene que alcanzar para las 2 réplicas mínimas de cada configuración.
+
+    Devuelve el resumen de cada cantidad de boxes, con convergio indicando si llegó a la tolerancia.
+    """
+    cantidades_boxes = list(cantidades_boxes)
+    if presupuesto < 2 * len(cantidades_boxes):
+        raise ValueError(f"El presupuesto tiene que alcanzar para 2 réplicas de cada cantidad de boxes "
+                         f"(al menos {2 * len(cantidades_boxes)})")
+    semilla = entropia(semilla)
+    procesos = procesos or os.cpu_count()
+    partes = {cantidad_boxes: [] for cantidad_boxes in cantidades_boxes}
+    hechas = dict.fromkeys(cantidades_boxes, 0)
+    pedidas = dict.fromkeys(cantidades_boxes, lote)  # Réplicas a simular en la próxima tanda
+    resumenes = {}
+
+    pool = ProcessPoolExecutor(max_workers=procesos) if procesos > 1 else None
+    try:
+        while pedidas and presupuesto > 0:
+            # 1. Repartir las réplicas pedidas en bloques; si no alcanza el presupuesto, en proporción a lo pedido
+            escala = min(1.0, presupuesto / sum(pedidas.values()))
+            tareas = []
+            for cantidad_boxes, replicas in pedidas.items():
+                replicas = min(max(int(replicas * escala), 2), presupuesto)
+                presupuesto -= replicas
+                tareas.extend(dividir_tareas([cantidad_boxes], replicas, modelo, atencion, semilla, tamano_bloque, comunes,
+                                             desde=hechas[cantidad_boxes]))
+                hechas[cantidad_boxes] += replicas
+
+            # 2. Simular la tanda
+            salidas = map(_simular_tarea, tareas) if pool is None else pool.map(_simular_tarea, tareas)
+            for salida in salidas:
+                partes[salida[0]].append(salida[1:])
+
+            # 3. Decidir cuántas réplicas más necesita cada configuración
+            pedidas = {}
+            for cantidad_boxes in cantidades_boxes:
+                resumen = resumenes[cantidad_boxes] = resumir(cantidad_boxes, partes[cantidad_boxes], nivel)
+                razon = resumen.costo_ic / (tolerancia_costo * abs(resumen.costo_medio) if relativa else tolerancia_costo)
+                if tolerancia_abandono is not None:
+                    razon = max(razon, resumen.tasa_abandono_ic / tolerancia_abandono)
+                resumen.convergio = razon <= 1
+                if not resumen.convergio:
+                    faltan = resumen.replicas * (razon ** 2 - 1) if math.isfinite(razon) else lote
+                    pedidas[cantidad_boxes] = int(min(max(math.ceil(faltan), lote), resumen.replicas))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    resumenes = [resumenes[cantidad_boxes] for cantidad_boxes in cantidades_boxes]
+    comparar_con_mejor(resumenes, nivel)
+    return resumenes
+
+
+def mejor_configuracion(resumenes):
+    """
+    Devuelve el resumen con menor costo esperado.
+    """
+    return min(resumenes, key=lambda resumen: resumen.costo_medio)
+
+
+def comparar_con_mejor(resumenes, nivel=0.95):
+    """
+    Calcula para cada configuración la diferencia de costo réplica a réplica con la mejor, su
+    intervalo de confianza y la reducción de varianza lograda por los números aleatorios comunes.
+    """
+    mejor = mejor_configuracion(resumenes)
+    for resumen in resumenes:
+        n = min(resumen.replicas, mejor.replicas)
+        diferencias = resumen.costos[:n] - mejor.costos[:n]
+        resumen.diferencia_media, resumen.diferencia_ic = intervalo_confianza(diferencias, nivel)
+        resumen.reduccion_varianza = reduccion_varianza(resumen.costos[:n], mejor.costos[:n]) if resumen is not mejor else None
+
+
+def imprimir_barrido(resumenes):
+    print(f"\n{'Boxes':>5} {'Réplicas':>9} {'Costo medio':>14} {'IC 95%':>10} {'Abandonos':>10} {'% abandono':>11} {'IC %':>6} {'Espera máx (min)':>17} {'Dif. vs mejor':>14} {'IC dif.':>10} {'Red. var.':>10}")
+    for resumen in resumenes:
+        reduccion = "-" if resumen.reduccion_varianza is None else f"{resumen.reduccion_varianza:.1f}x"
+        print(f"{resumen.cantidad_boxes:>5} {resumen.replicas:>9} {resumen.costo_medio:>14.0f} {resumen.costo_ic:>10.0f} "
+              f"{resumen.abandonados_medio:>10.1f} {resumen.tasa_abandono * 100:>10.1f}% {resumen.tasa_abandono_ic * 100:>6.1f} {resumen.espera_max_media / 60:>17.2f} "
+              f"{resumen.diferencia_media:>14.0f} {resumen.diferencia_ic:>10.0f} {reduccion:>10}")
+    sin_converger = [resumen.cantidad_boxes for resumen in resumenes if not getattr(resumen, "convergio", True)]
+    if sin_converger:
+        print(f"\nNo llegaron a la tolerancia antes de agotar el presupuesto: {sin_converger}")
+    print(f"Réplicas simuladas en total: {sum(resumen.replicas for resumen in resumenes)}")
+    mejor = mejor_configuracion(resumenes)
+    print(f"\nCantidad de boxes recomendada: {mejor.cantidad_boxes} (costo esperado ${mejor.costo_medio:.0f} ± {mejor.costo_ic:.0f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara el costo esperado de cada cantidad de boxes.")
+    parser.add_argument("--boxes", type=int, nargs=2, default=(1, 10), metavar=("MIN", "MAX"))
+    parser.add_argument("--replicas", type=int, default=1000)
+    parser.add_argument("--tolerancia", type=float, default=None,
+                        help="Simular en tandas hasta que el semiancho del IC del costo medio baje de este valor")
+    parser.add_argument("--tolerancia-abandono", type=float, default=0.01,
+                        help="Semiancho máximo del IC de la tasa de abandono (con --tolerancia)")
+    parser.add_argument("--relativa", action="store_true", help="--tolerancia es una fracción del costo medio")
+    parser.add_argument("--presupuesto", type=int, default=100000, help="Réplicas máximas en total (con --tolerancia)")
+    parser.add_argument("--modelo", choices=sorted(PERFILES), default="tp8")
+    parser.add_argument("--atencion", choices=DISTRIBUCIONES_CLI, default="normal_recortada")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--independientes", action="store_true", help="No usar números aleatorios comunes entre cantidades de boxes")
+    parser.add_argument("--preseleccionar", action="store_true", help="Simular solo las cantidades de boxes prometedoras según la estimación de Erlang")
+    args = parser.parse_args()
+
+    cantidades_boxes = range(args.boxes[0], args.boxes[1] + 1)
+    if args.preseleccionar:
+        from erlang import estimar_boxes, preseleccionar
+
+        cantidades_boxes = preseleccionar(estimar_boxes(cantidades_boxes, args.modelo, args.atencion))
+        print(f"Cantidades de boxes preseleccionadas: {cantidades_boxes}")
+    if args.tolerancia is None:
+        resumenes = barrer_boxes(cantidades_boxes, args.replicas, args.modelo, args.semilla, args.procesos, atencion=args.atencion, comunes=not args.independientes)
+    else:
+        try:
+            resumenes = barrer_secuencial(cantidades_boxes, args.tolerancia, args.tolerancia_abandono, presupuesto=args.presupuesto,
+                                          modelo=args.modelo, semilla=args.semilla, procesos=args.procesos, atencion=args.atencion,
+                                          comunes=not args.independientes, relativa=args.relativa)
+        except ValueError as error:
+            parser.error(str(error))
+    imprimir_barrido(resumenes)
@@ -0,0 +1,340 @@
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+
+from llegadas import DURACION, TRAMOS_TP7, TRAMOS_TP8, PerfilTramos
+from motor_vectorizado import simular_lote
+from simulacion import MOTORES, Local
+
+SEMILLA = 12345  # Todas las mediciones simulan los mismos días
+TRAMOS = {"tp7": TRAMOS_TP7, "tp8": TRAMOS_TP8}
+APERTURAS = {"tp7": 0, "tp8": 8 * 3600}
+REPLICAS_LOTE = 200  # Días que simula juntos el motor vectorizado en cada medición
+UMBRAL = 0.10  # Aumento relativo del tiempo que se considera una regresión
+GRUPOS = ("simulacion", "pantalla", "video", "graficos")
+
+
+def perfil_dias(modelo, dias):
+    """
+    Perfil de llegadas de dias jornadas seguidas del modelo (un horizonte de dias * 4 horas).
+    """
+    tramos = [(desde + d * DURACION, hasta + d * DURACION, prob) for d in range(dias) for desde, hasta, prob in TRAMOS[modelo]]
+    return PerfilTramos(tramos, DURACION * dias)
+
+
+def medir(funcion, repeticiones, propio=False):
+    """
+    Llama a funcion una vez para calentar y luego repeticiones veces y cuenta lo que tarda cada
+    llamada. Con propio, funcion mide y devuelve los segundos a contar (por ejemplo, por frame).
+
+    Devuelve el caso con la mediana (segundos), el mínimo y los tiempos de cada repetición.
+    """
+    funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()
+        inicio = time.perf_counter()
+        medido = funcion()
+        tiempos.append(medido if propio else time.perf_counter() - inicio)
+    return {"segundos": statistics.median(tiempos), "minimo": min(tiempos), "repeticiones": tiempos}
+
+
+def memoria_pico(funcion):
+    """
+    Memoria máxima (en bytes) reservada por Python durante una llamada a funcion.
+    """
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def medir_simulacion(repeticiones, rapido=False):
+    """
+    Local.simular con cada motor (y simular_lote, por día simulado) para cada modelo, cantidad de
+    boxes y horizonte. La aceleración es respecto del bucle por segundos con la misma configuración.
+    """
+    casos = {}
+    for modelo in TRAMOS:
+        for dias in (1,) if rapido else (1, 4):
+            perfil = perfil_dias(modelo, dias)
+            for cantidad_boxes in (5,) if rapido else (2, 5, 10):
+                referencia = None
+                for motor in ("ticks",) + tuple(m for m in MOTORES if m != "ticks") + ("lote",):
+                    if motor == "lote":
+                        replicas = REPLICAS_LOTE
+
+                        def simular():
+                            resultados = simular_lote(cantidad_boxes, replicas, perfil=perfil, rng=np.random.default_rng(SEMILLA))
+                            return int(resultados.clientes_atendidos.sum() + resultados.clientes_abandonados.sum())
+                    else:
+                        replicas = 1
+
+                        def simular():
+                            local = Local(cantidad_boxes, perfil=perfil, apertura=APERTURAS[modelo], semilla=SEMILLA, motor=motor)
+                            local.simular()
+                            return local.clientes_atendidos + local.clientes_abandonados
+
+                    clientes = simular()
+                    caso = medir(simular, repeticiones)
+                    por_dia = caso["segundos"] / replicas
+                    referencia = referencia or por_dia
+                    caso.update({
+                        "replicas": replicas,
+                        "segundos_simulados_por_segundo": perfil.duracion * replicas / caso["segundos"],
+                        "clientes_por_segundo": clientes / caso["segundos"],
+                        "memoria_pico_mb": memoria_pico(simular) / 2 ** 20,
+                        "aceleracion_vs_ticks": referencia / por_dia,
+                    })
+                    casos[f"simulacion/{modelo}/{motor}/boxes={cantidad_boxes}/dias={dias}"] = caso
+    return casos
+
+
+def medir_pantalla(repeticiones, rapido=False):
+    """
+    Costo por frame de actualizar_pantalla (sin límite de fps) durante un día de cada modelo.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+
+    from pantalla import TAMANOS, Pantalla
+
+    pygame.init()
+    casos = {}
+    try:
+        for modelo in TAMANOS:
+            modulo = importlib.import_module(modelo)
+            superficie = pygame.display.set_mode(TAMANOS[modelo])
+            frames = []
+
+            def animar():
+                local = modulo.Local(5, semilla=SEMILLA)
+                local.pantalla = Pantalla(superficie, modelo, local.cantidad_boxes)
+                tiempos = []
+
+                def observar(tiempo_actual):
+                    inicio = time.perf_counter()
+                    local.actualizar_pantalla(tiempo_actual)
+                    tiempos.append(time.perf_counter() - inicio)
+
+                local.simular(al_observar=observar)
+                frames.append(len(tiempos))
+                return sum(tiempos) / len(tiempos)
+
+            caso = medir(animar, repeticiones, propio=True)
+            caso.update({"frames": frames[-1], "frames_por_segundo": 1 / caso["segundos"]})
+            casos[f"pantalla/actualizar_pantalla/{modelo}"] = caso
+    finally:
+        pygame.quit()
+    return casos
+
+
+def medir_video(repeticiones, rapido=False):
+    """
+    Costo por frame de capturar la ventana (lo que hace GrabadorVideo.capturar en el hilo de la
+    simulación), de dibujarlo sin pygame (video_offline) y de convertirlo y codificarlo en XVID.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import cv2
+    import pygame
+
+    from pantalla import TAMANOS
+    from video_offline import Rasterizador, grabar_instantaneas
+
+    frames = 20 if rapido else 100
+    casos = {}
+    pygame.init()
+    try:
+        for modelo in TAMANOS:
+            ancho, alto = TAMANOS[modelo]
+            superficie = pygame.display.set_mode((ancho, alto))
+
+            def capturar():
+                inicio = time.perf_counter()
+                for _ in range(frames):
+                    pygame.image.tobytes(superficie, "RGB")
+                return (time.perf_counter() - inicio) / frames
+
+            casos[f"video/captura/{modelo}"] = medir(capturar, repeticiones, propio=True)
+
+            instantaneas = grabar_instantaneas(modelo, 5, semilla=SEMILLA)[0][:frames]
+            rasterizador = Rasterizador(modelo, 5)
+            lienzo = rasterizador.nuevo_frame()
+
+            def rasterizar():
+                inicio = time.perf_counter()
+                for instantanea in instantaneas:
+                    rasterizador.dibujar(instantanea, lienzo)
+                return (time.perf_counter() - inicio) / len(instantaneas)
+
+            casos[f"video/rasterizado/{modelo}"] = medir(rasterizar, repeticiones, propio=True)
+
+            imagenes = [cv2.cvtColor(rasterizador.dibujar(instantanea, rasterizador.nuevo_frame()), cv2.COLOR_BGR2RGB)
+                        for instantanea in instantaneas]
+
+            def codificar():
+                with tempfile.TemporaryDirectory() as carpeta:
+                    out = cv2.VideoWriter(os.path.join(carpeta, "benchmark.avi"), cv2.VideoWriter_fourcc(*'XVID'), 30, (ancho, alto))
+                    inicio = time.perf_counter()
+                    for imagen in imagenes:
+                        out.write(cv2.cvtColor(imagen, cv2.COLOR_RGB2BGR))
+                    out.release()
+                    return (time.perf_counter() - inicio) / len(imagenes)
+
+            casos[f"video/codificacion/{modelo}"] = medir(codificar, repeticiones, propio=True)
+    finally:
+        pygame.quit()
+    return casos
+
+
+def medir_graficos(repeticiones, rapido=False):
+    """
+    Tiempo de graficar_resultados con el backend Agg, incluido el dibujo de la figura.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    from graficos import graficar_resultados
+
+    casos = {}
+    for modelo in TRAMOS:
+        local = Local(5, perfil=perfil_dias(modelo, 1), apertura=APERTURAS[modelo], semilla=SEMILLA)
+        estadisticas = local.simular()
+
+        def graficar():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # plt.show() avisa que Agg no abre ventanas
+                graficar_resultados(local, estadisticas)
+            plt.gcf().canvas.draw()
+            plt.close("all")
+
+        casos[f"graficos/graficar_resultados/{modelo}"] = medir(graficar, repeticiones)
+    return casos
+
+
+MEDICIONES = {
+    "simulacion": medir_simulacion,
+    "pantalla": medir_pantalla,
+    "video": medir_video,
+    "graficos": medir_graficos,
+}
+
+
+def entorno():
+    """
+    Datos de la máquina y del código medido, para poder comparar corridas.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "nucleos": os.cpu_count(),
+    }
+
+
+def ejecutar(grupos=GRUPOS, repeticiones=5, rapido=False):
+    """
+    Ejecuta las mediciones de los grupos indicados. Un grupo cuya dependencia opcional (pygame,
+    OpenCV o matplotlib) no está instalada queda en omitidos.
+    """
+    informe = {"entorno": entorno(), "repeticiones": repeticiones, "rapido": rapido, "casos": {}, "omitidos": {}}
+    for grupo in grupos:
+        try:
+            casos = MEDICIONES[grupo](repeticiones, rapido)
+        except ImportError as error:
+            informe["omitidos"][grupo] = str(error)
+            continue
+        informe["casos"].update(casos)
+    return informe
+
+
+def comparar(informe, base, umbral=UMBRAL):
+    """
+    Compara el tiempo mínimo de cada caso (el menos afectado por el ruido de la máquina) con el
+    de un informe anterior. Devuelve una lista de (caso, segundos antes, segundos ahora, razón,
+    es_regresion) para los casos de ambos informes.
+    """
+    filas = []
+    for nombre, caso in informe["casos"].items():
+        anterior = base["casos"].get(nombre)
+        if anterior is None:
+            continue
+        razon = caso["minimo"] / anterior["minimo"]
+        filas.append((nombre, anterior["minimo"], caso["minimo"], razon, razon > 1 + umbral))
+    return filas
+
+
+def _formatear_segundos(segundos):
+    if segundos >= 1:
+        return f"{segundos:.3f} s"
+    if segundos >= 1e-3:
+        return f"{segundos * 1e3:.3f} ms"
+    return f"{segundos * 1e6:.1f} µs"
+
+
+def imprimir_informe(informe):
+    print(f"\n{'Caso':<48} {'Mediana':>11} {'Mínimo':>11}  Otras métricas")
+    for nombre, caso in informe["casos"].items():
+        otras = ", ".join(f"{clave}={valor:.3g}" for clave, valor in caso.items()
+                          if clave not in ("segundos", "minimo", "repeticiones"))
+        print(f"{nombre:<48} {_formatear_segundos(caso['segundos']):>11} {_formatear_segundos(caso['minimo']):>11}  {otras}")
+    for grupo, motivo in informe["omitidos"].items():
+        print(f"Grupo {grupo} omitido: {motivo}")
+
+
+def imprimir_comparacion(filas, umbral=UMBRAL):
+    print(f"\n{'Caso':<48} {'Antes':>11} {'Ahora':>11} {'Razón':>7}")
+    for nombre, antes, ahora, razon, regresion in filas:
+        marca = "  REGRESIÓN" if regresion else ""
+        print(f"{nombre:<48} {_formatear_segundos(antes):>11} {_formatear_segundos(ahora):>11} {razon:>7.2f}{marca}")
+    regresiones = sum(fila[4] for fila in filas)
+    print(f"\n{regresiones} de {len(filas)} casos más de {umbral:.0%} más lentos")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide la simulación, la animación, el video y los gráficos.")
+    parser.add_argument("--grupos", nargs="+", choices=GRUPOS, default=list(GRUPOS))
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--rapido", action="store_true", help="Menos configuraciones y frames")
+    parser.add_argument("--salida", default=None, help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", default=None, help="JSON de una corrida anterior contra el que comparar")
+    parser.add_argument("--umbral", type=float, default=UMBRAL, help="Aumento relativo del tiempo que cuenta como regresión")
+    args = parser.parse_args()
+
+    informe = ejecutar(args.grupos, args.repeticiones, args.rapido)
+    imprimir_informe(informe)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en {args.salida}")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            filas = comparar(informe, json.load(archivo), args.umbral)
+        imprimir_comparacion(filas, args.umbral)
+        if any(fila[4] for fila in filas):
+            sys.exit(1)
@@ -0,0 +1,114 @@
+import argparse
+import importlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from barrido import intervalo_confianza
+from semillas import entropia, semilla_replica
+from simulacion import Local
+
+
+def _simular_rama(tarea):
+    """
+    Restaura la instantánea y termina el día con otra cantidad de boxes (se ejecuta en un proceso
+    del pool). Con futuro, antes resortea las llegadas con los flujos de esa réplica de semilla.
+    """
+    datos, cantidad_boxes, semilla, futuro = tarea
+    local = Local.restaurar(datos)
+    if cantidad_boxes != local.cantidad_boxes:
+        local.cambiar_boxes(cantidad_boxes)
+    if futuro is not None:
+        local.resortear(semilla_replica(semilla, futuro))  # Los mismos futuros para todas las cantidades de boxes
+    local.terminar()
+    return cantidad_boxes, local.calcular_costo(), local.clientes_atendidos, local.clientes_abandonados
+
+
+def explorar(local, cantidades_boxes, futuros=1, semilla=None, procesos=None, nivel=0.95):
+    """
+    Continúa el día en pausa de local (ver Local.iniciar y avanzar_hasta) con cada cantidad de
+    boxes, repartiendo las ramas entre procesos. Todas parten de la misma instantánea, así que no
+    se vuelve a simular la parte del día ya simulada.
+
+    Con futuros == 1 cada rama sigue con las mismas llegadas que habría tenido el día. Con más,
+    cada rama se repite con futuros sorteos de las llegadas desde la pausa (los mismos para todas
+    las cantidades de boxes, con números aleatorios comunes).
+
+    Como los boxes ocupados no se pueden cerrar (ver Local.cambiar_boxes), ninguna cantidad puede
+    ser menor que la de boxes ocupados en la pausa.
+
+    Devuelve {cantidad_boxes: {"costos", "costo_medio", "costo_ic", "atendidos_medio", "abandonados_medio"}}.
+    """
+    ocupados = sum(box.ocupado for box in local.boxes)
+    invalidas = [cantidad_boxes for cantidad_boxes in cantidades_boxes if cantidad_boxes < max(ocupados, 1)]
+    if invalidas:
+        raise ValueError(f"Hay {ocupados} boxes ocupados en la pausa: no se puede seguir con {invalidas} boxes")
+    datos = local.instantanea()
+    semilla = entropia(semilla)
+    indices = [None] if futuros == 1 else range(futuros)
+    tareas = [(datos, cantidad_boxes, semilla, futuro) for cantidad_boxes in cantidades_boxes for futuro in indices]
+
+    procesos = procesos or os.cpu_count()
+    if procesos == 1:
+        salidas = list(map(_simular_rama, tareas))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            salidas = list(pool.map(_simular_rama, tareas, chunksize=max(1, len(tareas) // (4 * procesos))))
+
+    ramas = {}
+    for cantidad_boxes in cantidades_boxes:
+        costos, atendidos, abandonados = (np.array(columna, dtype=float) for columna in
+                                          zip(*(salida[1:] for salida in salidas if salida[0] == cantidad_boxes)))
+        costo_medio, costo_ic = intervalo_confianza(costos, nivel)
+        ramas[cantidad_boxes] = {
+            "costos": costos,
+            "costo_medio": costo_medio,
+            "costo_ic": costo_ic,
+            "atendidos_medio": float(atendidos.mean()),
+            "abandonados_medio": float(abandonados.mean()),
+        }
+    return ramas
+
+
+def hora_a_tiempo(local, hora):
+    """
+    Segundo de la simulación de local que corresponde a una hora "HH:MM" del día (abre a las 8:00).
+    """
+    horas, minutos = (int(parte) for parte in hora.split(":"))
+    return local.apertura + (horas - 8) * 3600 + minutos * 60
+
+
+def imprimir_ramas(local, ramas):
+    print(f"\nEstado a la pausa: {len(local.cola)} clientes en la cola, "
+          f"{sum(box.ocupado for box in local.boxes)} de {local.cantidad_boxes} boxes ocupados, "
+          f"{local.clientes_atendidos} atendidos y {local.clientes_abandonados} abandonos hasta ahora")
+    print(f"\n{'Boxes':>5} {'Costo medio':>12} {'IC 95%':>8} {'Atendidos':>10} {'Abandonos':>10}")
+    for cantidad_boxes, rama in ramas.items():
+        print(f"{cantidad_boxes:>5} {rama['costo_medio']:>12.0f} {rama['costo_ic']:>8.0f} "
+              f"{rama['atendidos_medio']:>10.1f} {rama['abandonados_medio']:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simula hasta una hora y compara cómo sigue el día con otras cantidades de boxes.")
+    parser.add_argument("--modelo", choices=("tp7", "tp8"), default="tp8")
+    parser.add_argument("--boxes", type=int, default=5, help="Boxes abiertos hasta la pausa")
+    parser.add_argument("--hora", default="10:00", help="Hora de la pausa (HH:MM)")
+    parser.add_argument("--cantidades", type=int, nargs="+", default=None, help="Cantidades de boxes desde la pausa")
+    parser.add_argument("--futuros", type=int, default=200, help="Sorteos de las llegadas desde la pausa")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--procesos", type=int, default=None)
+    args = parser.parse_args()
+
+    local = importlib.import_module(args.modelo).Local(args.boxes, semilla=args.semilla)
+    local.iniciar()
+    local.avanzar_hasta(hora_a_tiempo(local, args.hora))
+    cantidades = args.cantidades or list(range(args.boxes, args.boxes + 5))
+    inicio = time.perf_counter()
+    try:
+        ramas = explorar(local, cantidades, args.futuros, args.semilla, args.procesos)
+    except ValueError as error:
+        parser.error(str(error))
+    imprimir_ramas(local, ramas)
+    print(f"\n{len(cantidades) * args.futuros} ramas en {time.perf_counter() - inicio:.2f} s")
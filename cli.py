@@ -0,0 +1,147 @@
+import argparse
+import importlib
+import sys
+
+MODELOS = ("tp7", "tp8")
+MOTORES = ("eventos", "ticks")  # Los de simulacion.MOTORES (sin importar el simulador para armar la ayuda)
+
+# Herramientas que ya tienen su propia línea de comandos: cli.py les pasa el resto de los argumentos
+HERRAMIENTAS = {
+    "barrer": ("barrido", ["sweep"], "Compara el costo esperado de cada cantidad de boxes"),
+    "video": ("video_offline", ["render-video"], "Genera el video de la simulación sin abrir ninguna ventana"),
+    "horarios": ("horarios", ["schedule"], "Busca el horario de boxes por media hora de menor costo"),
+    "periodo": ("multidia", ["period"], "Simula semanas, meses o años y guarda un resumen por día"),
+    "red": ("multisitio", ["network"], "Simula una red de locales que se derivan clientes"),
+    "bifurcar": ("bifurcacion", ["fork"], "Simula hasta una hora y compara cómo sigue el día con otros boxes"),
+    "tablero": ("tablero", ["dashboard"], "Simula días sin ventana y los transmite por HTTP"),
+    "reportes": ("reportes", ["report"], "Simula muchas réplicas y guarda los gráficos por media hora en PNG o SVG"),
+    "benchmark": ("benchmark", [], "Mide el rendimiento y compara con resultados anteriores"),
+}
+
+
+def cantidad_boxes(texto):
+    cantidad = int(texto)
+    if cantidad < 1 or cantidad > 10:
+        raise argparse.ArgumentTypeError("la cantidad de boxes debe estar entre 1 y 10")
+    return cantidad
+
+
+def crear_perfilador(args):
+    if not (args.perfilar or args.traza):
+        return None
+    from perfilador import Perfilador
+
+    return Perfilador(traza=args.traza is not None)
+
+
+def simular(args):
+    """
+    Un día sin ventana ni video (solo numpy y el simulador).
+    """
+    modulo = importlib.import_module(args.modelo)
+    perfilador = crear_perfilador(args)
+    if args.tablero is None:
+        modulo.simular_sin_pantalla(args.boxes, args.motor, args.semilla, args.atencion, perfilador)
+    else:
+        from tablero import Tablero
+
+        with Tablero(args.tablero) as tablero:
+            print(f"Tablero en http://127.0.0.1:{tablero.puerto}/")
+            modulo.simular_sin_pantalla(args.boxes, args.motor, args.semilla, args.atencion, perfilador, tablero, args.ritmo or None)
+            print("Día terminado: el tablero sigue mostrando los totales (Ctrl+C para terminar)")
+            tablero.esperar()
+    if perfilador is not None:
+        perfilador.informar(args.traza)
+
+
+def animar(args):
+    """
+    La animación en una ventana de pygame, grabada en video (pygame y cv2).
+    """
+    import animacion
+
+    modulo = importlib.import_module(args.modelo)
+    perfilador = crear_perfilador(args)
+    animacion.animar(modulo.Local(args.boxes, args.fps, muestreador=args.atencion, semilla=args.semilla, perfilador=perfilador), args.motor)
+    if perfilador is not None:
+        perfilador.informar(args.traza)
+
+
+def graficar(args):
+    """
+    Un día con los gráficos de resultados (matplotlib).
+    """
+    modulo = importlib.import_module(f"graficas_{args.modelo}")
+    perfilador = crear_perfilador(args)
+    local = modulo.Local(args.boxes, muestreador=args.atencion, semilla=args.semilla, detallado=args.detallado,
+                         motor=args.motor, perfilador=perfilador)
+    estadisticas = local.simular()
+    local.imprimir_resultados()
+    if perfilador is not None:
+        perfilador.informar(args.traza)
+    local.graficar_resultados(estadisticas, args.salida)
+    if args.salida is not None:
+        print(f"Gráfico guardado en {args.salida}")
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Simulación de boxes de atención. Cada comando importa solo lo que usa: simular no carga pygame, cv2 ni matplotlib.",
+    )
+    comandos = parser.add_subparsers(dest="comando", metavar="COMANDO", required=True)
+
+    # Opciones comunes de los comandos que simulan un día
+    dia = argparse.ArgumentParser(add_help=False)
+    dia.add_argument("--modelo", choices=MODELOS, default="tp8")
+    dia.add_argument("--boxes", type=cantidad_boxes, required=True, help="Cantidad de boxes (entre 1 y 10)")
+    dia.add_argument("--semilla", type=int, default=None)
+    dia.add_argument("--motor", choices=MOTORES, default="eventos")
+    dia.add_argument("--atencion", default=None, help="Distribución de los tiempos de atención (ver muestreo_atencion.DISTRIBUCIONES_CLI)")
+    dia.add_argument("--perfilar", action="store_true", help="Medir el tiempo de cada fase de la simulación")
+    dia.add_argument("--traza", default=None, help="Guardar la traza de las fases en este JSON (formato Chrome trace)")
+
+    comando = comandos.add_parser("simular", aliases=["simulate"], parents=[dia], help="Simula un día sin ventana y muestra los resultados")
+    comando.add_argument("--tablero", type=int, default=None, metavar="PUERTO",
+                         help="Transmitir la pantalla en http://127.0.0.1:PUERTO/ mientras simula")
+    comando.add_argument("--ritmo", type=float, default=600, help="Segundos simulados por segundo real con --tablero (0: sin límite)")
+    comando.set_defaults(funcion=simular)
+
+    comando = comandos.add_parser("animar", aliases=["animate"], parents=[dia], help="Muestra la animación y la graba en video")
+    comando.add_argument("--fps", type=int, default=30, help="Actualizaciones de la pantalla por segundo")
+    comando.set_defaults(funcion=animar)
+
+    comando = comandos.add_parser("graficar", aliases=["plot"], parents=[dia], help="Simula un día y grafica los resultados")
+    comando.add_argument("--salida", default=None, help="Guardar el gráfico en este archivo en lugar de mostrarlo")
+    comando.add_argument("--detallado", action="store_true", help="Informar cada atención")
+    comando.set_defaults(funcion=graficar)
+
+    for nombre, (modulo, alias, ayuda) in HERRAMIENTAS.items():
+        comando = comandos.add_parser(nombre, aliases=alias, help=f"{ayuda} (opciones: cli.py {nombre} --help)", add_help=False)
+        comando.set_defaults(modulo=modulo, nombre=nombre)
+    return parser
+
+
+def main(argv=None):
+    parser = crear_parser()
+    args, resto = parser.parse_known_args(argv)
+    if "modulo" in args:
+        # Ejecutar la herramienta como script, con sus propios argumentos
+        import runpy
+
+        sys.argv = [f"cli.py {args.nombre}", *resto]
+        runpy.run_module(args.modulo, run_name="__main__", alter_sys=True)
+        return
+    if resto:
+        parser.error(f"argumentos no reconocidos: {' '.join(resto)}")
+    if args.atencion is not None:
+        # Se valida después de leer los argumentos para no importar numpy al pedir la ayuda
+        from muestreo_atencion import DISTRIBUCIONES_CLI
+
+        if args.atencion not in DISTRIBUCIONES_CLI:
+            parser.error(f"--atencion debe ser una de: {', '.join(DISTRIBUCIONES_CLI)}")
+    args.funcion(args)
+
+
+if __name__ == "__main__":
+    main()
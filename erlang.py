@@ -0,0 +1,237 @@
+import argparse
+import math
+
+import numpy as np
+
+from llegadas import PERFILES, PERFIL_TP8
+from motor_eventos import PACIENCIA
+from muestreo_atencion import DISTRIBUCIONES_CLI, crear_muestreador
+from simulacion import COSTO_ABANDONO, COSTO_BOX
+
+ANCHO_TRAMO = 1800  # Tramos estacionarios de media hora
+
+
+def espera_virtual(tasa_llegada, cantidad_boxes, media_atencion, paciencia, variabilidad=1.0):
+    """
+    Cola M/M/n+D estacionaria (Erlang-A con paciencia fija): llegadas de Poisson, atención
+    exponencial y clientes que abandonan la cola al esperar más de paciencia segundos.
+
+    Devuelve (probabilidad de no esperar, densidad inicial, tasa de decaimiento) de la espera
+    virtual V de un cliente que llega: P(V = 0) más una densidad f(x) = f0 * exp(-decaimiento * x)
+    hasta la paciencia, que después decae con tasa cantidad_boxes / media_atencion / variabilidad.
+    variabilidad escala los tiempos de espera, por ejemplo (1 + cv²) / 2 para una atención con
+    coeficiente de variación cv (aproximación de Allen-Cunneen). tasa_llegada y media_atencion
+    pueden ser arrays (un valor por tramo).
+    """
+    # Con algún box libre la distribución es la de Erlang: p_k proporcional a a^k / k!
+    a = np.asarray(tasa_llegada * media_atencion, dtype=float)
+    terminos = np.cumprod(np.concatenate((np.ones(a.shape + (1,)), a[..., None] / np.arange(1, cantidad_boxes)), axis=-1), axis=-1)
+    libres = terminos.sum(axis=-1)
+    anterior = terminos[..., -1]  # a^(n-1) / (n-1)!
+    mu_total = cantidad_boxes / media_atencion
+    decaimiento = (mu_total - tasa_llegada) / variabilidad
+    f0 = tasa_llegada * anterior / variabilidad  # Sin normalizar: el que ocupa el último box libre deja V > 0
+
+    # Masa de la densidad antes y después de la paciencia (con decaimiento 0, f0 * paciencia)
+    casi_cero = np.abs(decaimiento) < 1e-12
+    hasta_paciencia = f0 * np.where(casi_cero, paciencia, -np.expm1(-decaimiento * paciencia) / np.where(casi_cero, 1.0, decaimiento))
+    despues = f0 * np.exp(-decaimiento * paciencia) * variabilidad / mu_total
+    total = libres + hasta_paciencia + despues
+    return libres / total, f0 / total, decaimiento
+
+
+def tasas_por_tramo(perfil, ancho=ANCHO_TRAMO, retardo=0):
+    """
+    Tasa media de llegadas (clientes por segundo) de cada tramo de ancho segundos del perfil. Con
+    retardo, el promedio incluye además los retardo segundos anteriores al tramo.
+    """
+    acumuladas = np.concatenate(([0.0], np.cumsum(perfil.probabilidades())))
+    tramos = math.ceil((len(acumuladas) - 1) / ancho)
+    tasas = []
+    for i in range(tramos):
+        desde, hasta = max(0, i * ancho - retardo), min((i + 1) * ancho, len(acumuladas) - 1)
+        tasas.append(float(acumuladas[hasta] - acumuladas[desde]) / (hasta - desde))
+    return tasas
+
+
+class EstimacionErlang:
+    """
+    Estimación analítica del día de una cantidad de boxes.
+    """
+    def __init__(self, cantidad_boxes, ingresados, abandonados, espera_cola, prob_espera, utilizacion, costo):
+        self.cantidad_boxes = cantidad_boxes
+        self.ingresados = ingresados
+        self.abandonados = abandonados
+        self.prob_abandono = abandonados / ingresados if ingresados else 0.0
+        self.espera_cola = espera_cola  # Segundos medios en la cola, por cliente ingresado
+        self.prob_espera = prob_espera
+        self.utilizacion = utilizacion
+        self.costo = costo
+
+    def __repr__(self):
+        return f"EstimacionErlang(cantidad_boxes={self.cantidad_boxes}, costo={self.costo:.0f})"
+
+
+class EstimadorErlang:
+    """
+    Estima abandonos, espera y costo del día con una aproximación estacionaria por tramos: cada
+    media hora se trata como una cola M/M/n+D estacionaria. Como la cola tarda en reaccionar a los
+    cambios de la tasa de llegadas, la cola de cada tramo usa la tasa promediada también sobre la
+    paciencia anterior.
+
+    Adaptaciones al modelo del local:
+    - la atención no es exponencial: las esperas se escalan por (1 + cv²) / 2 (Allen-Cunneen);
+    - la paciencia cuenta desde la llegada, así que un cliente que pasa a un box también abandona
+      si su espera más su atención la superan; esa probabilidad se integra con la distribución real
+      de la atención (de una muestra del muestreador);
+    - quien abandona en el box lo ocupa solo hasta vencer su paciencia, así que el tiempo medio de
+      ocupación de un box depende de la espera: se resuelve como punto fijo;
+    - al cierre abandonan los que siguen en la cola (por Little, tasa de llegada por espera media
+      del último tramo).
+    """
+    def __init__(self, perfil=PERFIL_TP8, atencion=None, paciencia=PACIENCIA, costo_box=COSTO_BOX,
+                 costo_abandono=COSTO_ABANDONO, puntos=61, iteraciones=20, tamano_muestra=20000):
+        self.ancho = ANCHO_TRAMO
+        self.tasas = np.array(tasas_por_tramo(perfil, self.ancho))
+        # Sin llegadas no hay cola: se usa una tasa ínfima para no dividir por cero
+        self.tasas_cola = np.maximum(tasas_por_tramo(perfil, self.ancho, retardo=paciencia), 1e-12)
+        self.paciencia = paciencia
+        self.costo_box = costo_box
+        self.costo_abandono = costo_abandono
+        self.iteraciones = iteraciones
+        muestra = np.sort(crear_muestreador(atencion, np.random.default_rng(0)).muestra(tamano_muestra))
+        self.media_atencion = float(muestra.mean())
+        self.variabilidad = (1 + (muestra.std() / self.media_atencion) ** 2) / 2
+
+        # En una grilla de esperas v entre 0 y la paciencia, con R = paciencia - v lo que le queda:
+        # P(atención > R) y la ocupación media del box E[min(atención, R)]
+        self.esperas = np.linspace(0, paciencia, puntos)
+        restante = paciencia - self.esperas
+        self.supervivencia = 1 - np.searchsorted(muestra, restante, side="right") / muestra.size
+        acumulada = np.concatenate(([0.0], np.cumsum(muestra)))
+        menores = np.searchsorted(muestra, restante, side="right")
+        self.ocupacion = (acumulada[menores] + restante * (muestra.size - menores)) / muestra.size
+
+        # Pesos de la regla del trapecio para integrar densidad * valor en la grilla con un producto
+        self.pesos = np.full(puntos, paciencia / (puntos - 1))
+        self.pesos[[0, -1]] /= 2
+        self.pesos_ocupacion = self.pesos * self.ocupacion
+        self.pesos_supervivencia = self.pesos * self.supervivencia
+        self.pesos_esperas = self.pesos * self.esperas
+
+    def _tramos(self, cantidad_boxes):
+        """
+        Espera virtual de cada tramo con el tiempo de ocupación de los boxes en equilibrio. La
+        ocupación que resulta de la espera baja cuando la supuesta sube, así que el punto fijo es
+        único y se busca por bisección (todos los tramos a la vez).
+        """
+        tasas = self.tasas_cola
+        desde = np.ones_like(tasas)
+        hasta = np.full_like(tasas, self.ocupacion[0])
+        for _ in range(self.iteraciones):
+            ocupacion = (desde + hasta) / 2
+            sin_espera, f0, decaimiento = espera_virtual(tasas, cantidad_boxes, ocupacion, self.paciencia, self.variabilidad)
+            densidad = f0[:, None] * np.exp(-decaimiento[:, None] * self.esperas)
+            atendidos = sin_espera + densidad @ self.pesos
+            resultante = (sin_espera * self.ocupacion[0] + densidad @ self.pesos_ocupacion) / atendidos
+            sube = resultante > ocupacion
+            desde = np.where(sube, ocupacion, desde)
+            hasta = np.where(sube, hasta, ocupacion)
+            if (hasta - desde).max() < 1.0:
+                break
+        return sin_espera, f0, decaimiento, densidad, ocupacion
+
+    def estimar(self, cantidad_boxes):
+        sin_espera, f0, decaimiento, densidad, ocupacion = self._tramos(cantidad_boxes)
+        abandona_cola = f0 * np.exp(-decaimiento * self.paciencia) * self.variabilidad * ocupacion / cantidad_boxes  # P(V > paciencia)
+        abandona_box = sin_espera * self.supervivencia[0] + densidad @ self.pesos_supervivencia
+        espera_media = densidad @ self.pesos_esperas  # E[V; V <= paciencia]
+
+        llegadas = self.tasas * self.ancho
+        ingresados = float(llegadas.sum())
+        # Los que quedan en la cola al cierre, por Little con la espera del último tramo
+        abandonados = float(llegadas @ (abandona_cola + abandona_box) + self.tasas[-1] * espera_media[-1])
+        ocupado = float(llegadas @ ((1 - abandona_cola) * ocupacion))
+
+        duracion = self.ancho * len(self.tasas)
+        costo = cantidad_boxes * self.costo_box + abandonados * self.costo_abandono
+        return EstimacionErlang(
+            cantidad_boxes, ingresados, abandonados,
+            float(llegadas @ espera_media) / ingresados if ingresados else 0.0,
+            float(llegadas @ (1 - sin_espera)) / ingresados if ingresados else 0.0,
+            min(1.0, ocupado / (cantidad_boxes * duracion)), costo,
+        )
+
+
+def estimar_boxes(cantidades_boxes=range(1, 11), modelo="tp8", atencion=None, paciencia=PACIENCIA):
+    """
+    Estima cada cantidad de boxes con el perfil del modelo.
+    """
+    estimador = EstimadorErlang(PERFILES[modelo], atencion, paciencia)
+    return [estimador.estimar(cantidad_boxes) for cantidad_boxes in cantidades_boxes]
+
+
+def preseleccionar(estimaciones, margen=0.25, vecinos=1):
+    """
+    Cantidades de boxes que vale la pena simular: las de costo estimado hasta margen por encima del
+    mínimo, más vecinos cantidades a cada lado de la mejor.
+    """
+    mejor = min(estimaciones, key=lambda estimacion: estimacion.costo)
+    candidatas = {e.cantidad_boxes for e in estimaciones if e.costo <= mejor.costo * (1 + margen)}
+    disponibles = {e.cantidad_boxes for e in estimaciones}
+    for delta in range(-vecinos, vecinos + 1):
+        if mejor.cantidad_boxes + delta in disponibles:
+            candidatas.add(mejor.cantidad_boxes + delta)
+    return sorted(candidatas)
+
+
+def validar(estimaciones, resumenes):
+    """
+    Compara las estimaciones con los resúmenes de barrer_boxes de las mismas cantidades de boxes.
+
+    Devuelve una lista de (cantidad_boxes, abandonos estimados, abandonos simulados, costo
+    estimado, costo simulado, error relativo del costo).
+    """
+    simulados = {resumen.cantidad_boxes: resumen for resumen in resumenes}
+    filas = []
+    for estimacion in estimaciones:
+        resumen = simulados.get(estimacion.cantidad_boxes)
+        if resumen is None:
+            continue
+        error = (estimacion.costo - resumen.costo_medio) / resumen.costo_medio
+        filas.append((estimacion.cantidad_boxes, estimacion.abandonados, resumen.abandonados_medio,
+                      estimacion.costo, resumen.costo_medio, error))
+    return filas
+
+
+def imprimir_estimaciones(estimaciones):
+    print(f"\n{'Boxes':>5} {'Abandonos':>10} {'% abandono':>11} {'P(espera)':>10} {'Espera cola (min)':>18} {'Utilización':>12} {'Costo':>10}")
+    for e in estimaciones:
+        print(f"{e.cantidad_boxes:>5} {e.abandonados:>10.1f} {e.prob_abandono * 100:>10.1f}% {e.prob_espera:>10.2f} "
+              f"{e.espera_cola / 60:>18.2f} {e.utilizacion * 100:>11.1f}% {e.costo:>10.0f}")
+
+
+def imprimir_validacion(filas):
+    print(f"\n{'Boxes':>5} {'Aband. est.':>12} {'Aband. sim.':>12} {'Costo est.':>11} {'Costo sim.':>11} {'Error':>8}")
+    for cantidad_boxes, abandonos_est, abandonos_sim, costo_est, costo_sim, error in filas:
+        print(f"{cantidad_boxes:>5} {abandonos_est:>12.1f} {abandonos_sim:>12.1f} {costo_est:>11.0f} {costo_sim:>11.0f} {error * 100:>7.1f}%")
+
+
+if __name__ == "__main__":
+    from barrido import barrer_boxes
+
+    parser = argparse.ArgumentParser(description="Estima analíticamente (Erlang-A) el costo de cada cantidad de boxes.")
+    parser.add_argument("--boxes", type=int, nargs=2, default=(1, 10), metavar=("MIN", "MAX"))
+    parser.add_argument("--modelo", choices=sorted(PERFILES), default="tp8")
+    parser.add_argument("--atencion", choices=DISTRIBUCIONES_CLI, default="normal_recortada")
+    parser.add_argument("--validar", action="store_true", help="Comparar con la simulación de todas las cantidades de boxes")
+    parser.add_argument("--replicas", type=int, default=500, help="Réplicas por cantidad de boxes al validar")
+    parser.add_argument("--semilla", type=int, default=None)
+    args = parser.parse_args()
+
+    estimaciones = estimar_boxes(range(args.boxes[0], args.boxes[1] + 1), args.modelo, args.atencion)
+    imprimir_estimaciones(estimaciones)
+    print(f"\nCantidades de boxes a simular: {preseleccionar(estimaciones)}")
+    if args.validar:
+        resumenes = barrer_boxes([e.cantidad_boxes for e in estimaciones], args.replicas, args.modelo, args.semilla, atencion=args.atencion)
+        imprimir_validacion(validar(estimaciones, resumenes))
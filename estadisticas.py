@@ -0,0 +1,275 @@
+import math
+
+import numpy as np
+
+from llegadas import DURACION
+
+ANCHO_TRAMO = 1800  # Media hora en segundos
+
+
+class Momentos:
+    """
+    Media, varianza, mínimo y máximo de una serie de valores sin guardarlos (algoritmo de Welford).
+    """
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0  # Suma de los cuadrados de los desvíos respecto de la media
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def agregar(self, valor):
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+        if valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def unir(self, otro):
+        """
+        Agrega los valores resumidos en otro Momentos (fórmula de Chan para varianzas en paralelo).
+        """
+        if otro.n == 0:
+            return self
+        n = self.n + otro.n
+        delta = otro.media - self.media
+        self.media += delta * otro.n / n
+        self.m2 += otro.m2 + delta * delta * self.n * otro.n / n
+        self.n = n
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        return self
+
+    def varianza(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def desvio(self):
+        return math.sqrt(self.varianza())
+
+
+class DigestoCuantiles:
+    """
+    Resumen aproximado de una distribución para estimar cuantiles (t-digest con fusión).
+
+    Guarda a lo sumo unos pocos cientos de centroides (media, peso): los de las colas representan
+    pocos valores y los del centro muchos, así los cuantiles extremos son los más precisos. Dos
+    digestos de procesos distintos se pueden unir.
+    """
+    def __init__(self, compresion=100):
+        self.compresion = compresion
+        self.medias = []
+        self.pesos = []
+        self.n = 0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self._pendientes = []
+
+    def agregar(self, valor):
+        self._pendientes.append(valor)
+        self.n += 1
+        if valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+        if len(self._pendientes) >= 5 * self.compresion:
+            self._comprimir()
+
+    def unir(self, otro):
+        otro._comprimir()
+        self._comprimir(otro.medias, otro.pesos)
+        self.n += otro.n
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        return self
+
+    def _comprimir(self, medias=(), pesos=()):
+        if not self._pendientes and not medias:
+            return
+        todas_medias = np.concatenate((self.medias, medias, self._pendientes))
+        todos_pesos = np.concatenate((self.pesos, pesos, np.ones(len(self._pendientes))))
+        self._pendientes = []
+        orden = np.argsort(todas_medias, kind="stable")
+        todas_medias, todos_pesos = todas_medias[orden], todos_pesos[orden]
+
+        # Se fusionan centroides vecinos mientras no superen el tamaño permitido por la función
+        # de escala k(q) = compresion / (2 pi) * asin(2q - 1), que achica los centroides en las colas
+        total = todos_pesos.sum()
+        medias_nuevas, pesos_nuevos = [], []
+        acumulado = 0.0
+        limite = self._limite(0.0, total)
+        media, peso = todas_medias[0], todos_pesos[0]
+        for m, w in zip(todas_medias[1:].tolist(), todos_pesos[1:].tolist()):
+            if acumulado + peso + w <= limite:
+                peso += w
+                media += (m - media) * w / peso
+            else:
+                medias_nuevas.append(media)
+                pesos_nuevos.append(peso)
+                acumulado += peso
+                limite = self._limite(acumulado, total)
+                media, peso = m, w
+        medias_nuevas.append(media)
+        pesos_nuevos.append(peso)
+        self.medias, self.pesos = medias_nuevas, pesos_nuevos
+
+    def _limite(self, acumulado, total):
+        """
+        Peso acumulado hasta el que puede crecer el centroide que empieza en acumulado.
+        """
+        k = self.compresion / (2 * math.pi) * math.asin(2 * acumulado / total - 1) + 1
+        if k >= self.compresion / 4:
+            return total
+        return total * (math.sin(2 * math.pi * k / self.compresion) + 1) / 2
+
+    def cuantil(self, q):
+        """
+        Estima el cuantil q (entre 0 y 1), interpolando entre los centros de los centroides y los
+        valores mínimo y máximo.
+        """
+        self._comprimir()
+        if not self.medias:
+            return math.nan
+        pesos = np.asarray(self.pesos)
+        centros = np.cumsum(pesos) - pesos / 2  # Posición (en peso acumulado) del centro de cada centroide
+        posiciones = np.concatenate(([0.0], centros, [self.n]))
+        valores = np.concatenate(([self.minimo], self.medias, [self.maximo]))
+        return float(np.interp(q * self.n, posiciones, valores))
+
+
+class HistogramaTramos:
+    """
+    Cantidad de eventos en cada tramo fijo del día (por defecto, cada media hora desde la apertura).
+    """
+    def __init__(self, duracion=DURACION, ancho=ANCHO_TRAMO):
+        self.ancho = ancho
+        self.cuentas = np.zeros(math.ceil(duracion / ancho), dtype=np.int64)
+
+    def agregar(self, tiempo, cantidad=1):
+        """
+        Cuenta cantidad eventos en el segundo tiempo (desde la apertura); el cierre va al último tramo.
+        """
+        self.cuentas[min(int(tiempo) // self.ancho, len(self.cuentas) - 1)] += cantidad
+
+    def unir(self, otro):
+        self.cuentas += otro.cuentas
+        return self
+
+
+class PromedioTemporal:
+    """
+    Promedio en el tiempo de un valor que cambia de a saltos (por ejemplo, el largo de la cola).
+    """
+    def __init__(self):
+        self.area = 0.0
+        self.duracion = 0.0
+        self.valor = 0.0
+        self.desde = None
+
+    def actualizar(self, tiempo, valor):
+        """
+        El valor pasa a ser valor desde el segundo tiempo.
+        """
+        if self.desde is not None:
+            self.area += self.valor * (tiempo - self.desde)
+            self.duracion += tiempo - self.desde
+        self.valor = valor
+        self.desde = tiempo
+
+    def cerrar(self, tiempo):
+        self.actualizar(tiempo, 0.0)
+        self.desde = None
+
+    def promedio(self):
+        return self.area / self.duracion if self.duracion else 0.0
+
+    def unir(self, otro):
+        self.area += otro.area
+        self.duracion += otro.duracion
+        return self
+
+
+class Estadisticas:
+    """
+    Estadísticas de la operación que se acumulan mientras se simula, con memoria constante.
+
+    Los motores llaman a registrar_llegada, registrar_atencion, registrar_abandono y
+    registrar_estado. Las estadísticas de réplicas simuladas en procesos distintos se unen con unir.
+    """
+    def __init__(self, cantidad_boxes, apertura=0, duracion=DURACION, ancho_tramo=ANCHO_TRAMO, compresion=100):
+        self.cantidad_boxes = cantidad_boxes
+        self.apertura = apertura
+        self.replicas = 1
+        self.espera = Momentos()
+        self.atencion = Momentos()
+        self.cuantiles_espera = DigestoCuantiles(compresion)
+        self.cuantiles_atencion = DigestoCuantiles(compresion)
+        self.llegadas = HistogramaTramos(duracion, ancho_tramo)
+        self.abandonos = HistogramaTramos(duracion, ancho_tramo)
+        self.largo_cola = PromedioTemporal()
+        self.utilizacion = PromedioTemporal()  # Fracción de boxes ocupados
+
+    def registrar_llegada(self, tiempo):
+        self.llegadas.agregar(tiempo - self.apertura)
+
+    def registrar_atencion(self, tiempo_atencion, tiempo_espera):
+        self.atencion.agregar(tiempo_atencion)
+        self.cuantiles_atencion.agregar(tiempo_atencion)
+        self.espera.agregar(tiempo_espera)
+        self.cuantiles_espera.agregar(tiempo_espera)
+
+    def registrar_abandono(self, tiempo, cantidad=1):
+        self.abandonos.agregar(tiempo - self.apertura, cantidad)
+
+    def registrar_estado(self, tiempo, largo_cola, boxes_ocupados):
+        """
+        Estado del local desde el segundo tiempo hasta el próximo registro.
+        """
+        self.largo_cola.actualizar(tiempo, largo_cola)
+        self.utilizacion.actualizar(tiempo, boxes_ocupados / self.cantidad_boxes)
+
+    def cerrar(self, tiempo):
+        self.largo_cola.cerrar(tiempo)
+        self.utilizacion.cerrar(tiempo)
+
+    def unir(self, otra):
+        self.replicas += otra.replicas
+        for nombre in ("espera", "atencion", "cuantiles_espera", "cuantiles_atencion",
+                       "llegadas", "abandonos", "largo_cola", "utilizacion"):
+            getattr(self, nombre).unir(getattr(otra, nombre))
+        return self
+
+    def resumen(self):
+        """
+        Devuelve las estadísticas como un diccionario (tiempos en segundos).
+        """
+        return {
+            "replicas": self.replicas,
+            "clientes_atendidos": self.espera.n,
+            "espera_media": self.espera.media,
+            "espera_desvio": self.espera.desvio(),
+            "espera_mediana": self.cuantiles_espera.cuantil(0.5),
+            "espera_p90": self.cuantiles_espera.cuantil(0.9),
+            "espera_p95": self.cuantiles_espera.cuantil(0.95),
+            "atencion_media": self.atencion.media,
+            "atencion_desvio": self.atencion.desvio(),
+            "atencion_mediana": self.cuantiles_atencion.cuantil(0.5),
+            "atencion_p90": self.cuantiles_atencion.cuantil(0.9),
+            "largo_cola_medio": self.largo_cola.promedio(),
+            "utilizacion": self.utilizacion.promedio(),
+            "llegadas_por_tramo": self.llegadas.cuentas.tolist(),
+            "abandonos_por_tramo": self.abandonos.cuentas.tolist(),
+        }
+
+
+def unir_estadisticas(estadisticas):
+    """
+    Une una secuencia de Estadisticas (por ejemplo, las de cada proceso) en la primera.
+    """
+    estadisticas = iter(estadisticas)
+    total = next(estadisticas)
+    for otra in estadisticas:
+        total.unir(otra)
+    return total
@@ -0,0 +1,82 @@
+import queue
+import threading
+
+import cv2
+import numpy as np
+import pygame
+
+
+class GrabadorVideo:
+    """
+    Graba en video los frames de la animación. La simulación entrega cada frame a una cola
+    acotada y un hilo aparte los convierte a BGR y los codifica con cv2.VideoWriter.
+
+    Con bloquear=True la simulación espera si la cola está llena (no se pierde ningún frame);
+    con bloquear=False el frame se descarta y se cuenta en frames_descartados.
+    """
+    def __init__(self, nombre_archivo, fps, tamano, capacidad=32, bloquear=True):
+        self.nombre_archivo = nombre_archivo
+        self.ancho, self.alto = tamano
+        self.bloquear = bloquear
+        self.out = cv2.VideoWriter(nombre_archivo, cv2.VideoWriter_fourcc(*'XVID'), fps, (self.ancho, self.alto))
+        if not self.out.isOpened():
+            raise RuntimeError(f"No se pudo abrir {nombre_archivo} para escribir el video")
+        self.cola = queue.Queue(maxsize=capacidad)
+        self.frames_enviados = 0
+        self.frames_escritos = 0
+        self.frames_descartados = 0
+        self.frames_duplicados = 0
+        self.ultimo_tiempo = None
+        self.hilo = threading.Thread(target=self._codificar, name="grabador-video", daemon=True)
+        self.hilo.start()
+
+    def capturar(self, superficie, tiempo_actual):
+        """
+        Copia el contenido de la superficie y lo encola como el frame del segundo tiempo_actual.
+        Se llama una vez por actualización de pantalla, con la superficie ya dibujada.
+        """
+        if tiempo_actual == self.ultimo_tiempo:
+            # Mismo estado de la simulación que el frame anterior
+            self.frames_duplicados += 1
+            return
+        if superficie.get_size() != (self.ancho, self.alto):
+            raise ValueError(f"El frame mide {superficie.get_size()} y el video {(self.ancho, self.alto)}")
+        self.ultimo_tiempo = tiempo_actual
+        self.enviar(pygame.image.tobytes(superficie, "RGB"))
+
+    def enviar(self, datos):
+        """
+        Encola un frame RGB (bytes o array de alto x ancho x 3).
+        """
+        self.frames_enviados += 1
+        try:
+            self.cola.put(datos, block=self.bloquear)
+        except queue.Full:
+            self.frames_descartados += 1
+
+    def _codificar(self):
+        while True:
+            datos = self.cola.get()
+            if datos is None:
+                break
+            frame = np.frombuffer(datos, dtype=np.uint8).reshape(self.alto, self.ancho, 3)
+            self.out.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))  # OpenCV espera BGR
+            self.frames_escritos += 1
+
+    def cerrar(self):
+        """
+        Espera a que se codifiquen los frames pendientes, cierra el archivo y devuelve los contadores.
+        """
+        self.cola.put(None)
+        self.hilo.join()
+        self.out.release()
+        return {
+            "frames_enviados": self.frames_enviados,
+            "frames_escritos": self.frames_escritos,
+            "frames_descartados": self.frames_descartados,
+            "frames_duplicados": self.frames_duplicados,
+        }
+
+    def imprimir_resumen(self, contadores):
+        print(f"\nVideo {self.nombre_archivo}: {contadores['frames_escritos']} frames escritos, "
+              f"{contadores['frames_descartados']} descartados, {contadores['frames_duplicados']} duplicados")
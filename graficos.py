@@ -0,0 +1,51 @@
+import numpy as np
+
+
+def graficar_resultados(local, estadisticas, ruta=None):
+    """
+    Muestra la cantidad de clientes del día y las llegadas por media hora desde la apertura. Con
+    ruta, guarda la figura en ese archivo sin abrir ninguna ventana.
+    """
+    import matplotlib
+
+    if ruta is not None:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(12, 8))  # Ajusta el tamaño para tres gráficos
+
+    # Histograma de clientes
+    plt.subplot(2, 2, 1)  # Crea la primera fila de subplots (izquierda)
+    categorias = ['Clientes Ingresados', 'Clientes Atendidos', 'Clientes Perdidos']
+    cantidades = [
+        local.clientes_atendidos + local.clientes_abandonados,
+        local.clientes_atendidos,
+        local.clientes_abandonados
+    ]
+    plt.bar(categorias, cantidades, color=['skyblue', 'green', 'red'])
+    plt.ylabel("Cantidad")
+    plt.title("Cantidad de Clientes en la Simulación")
+    for i, v in enumerate(cantidades):
+        plt.text(i, v + 0.5, str(v), ha='center', va='bottom')
+
+    # Histograma de clientes por hora
+    plt.subplot(2, 2, 2)  # Crea la primera fila de subplots (derecha)
+    cuentas = estadisticas.llegadas.cuentas  # Llegadas de cada media hora desde la apertura (8 AM)
+    ancho = estadisticas.llegadas.ancho / 3600
+    plt.bar(np.arange(len(cuentas)) * ancho, cuentas, width=ancho, align='edge', edgecolor='black', color='blue')
+    plt.xlabel("Hora del día")
+    plt.ylabel("Cantidad de Clientes")
+    plt.title("Clientes Ingresados por Hora")
+    plt.xticks(np.arange(0, 4.5, 0.5), labels=[
+    '8', '8:30', '9', '9:30', '10', '10:30',
+    '11', '11:30', '12'  # Elimina la etiqueta '12:30 PM'
+    ])
+
+    # Puedes agregar más subplots o gráficos aquí según tus necesidades
+
+    plt.tight_layout()  # Ajusta el layout para evitar solapamiento
+    if ruta is None:
+        plt.show()
+    else:
+        plt.savefig(ruta)
+        plt.close()
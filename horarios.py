@@ -0,0 +1,225 @@
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from barrido import intervalo_confianza
+from llegadas import PERFILES
+from motor_vectorizado import ANCHO_TRAMO, simular_lote, sortear_clientes
+from muestreo_atencion import DISTRIBUCIONES_CLI, crear_muestreador
+from semillas import entropia, flujos_replicas
+
+
+def _evaluar_tarea(tarea):
+    """
+    Simula las réplicas desde..desde+replicas de varios horarios con los mismos días (se ejecuta en
+    un proceso del pool). Devuelve una matriz de costos (horario, réplica).
+    """
+    horarios, desde, replicas, modelo, atencion, semilla = tarea
+    perfil = PERFILES[modelo]
+    llegadas, atenciones = sortear_clientes(replicas, perfil, atencion, flujos=flujos_replicas(semilla, replicas, desde))
+    cantidad = len(horarios)
+    resultados = simular_lote(None, cantidad * replicas, perfil=perfil, horario=np.repeat(horarios, replicas, axis=0),
+                              clientes=(np.tile(llegadas, (cantidad, 1)), np.tile(atenciones, (cantidad, 1))))
+    return resultados.calcular_costo().reshape(cantidad, replicas)
+
+
+class EvaluadorHorarios:
+    """
+    Costo de cada réplica de cada horario evaluado, con números aleatorios comunes: la réplica i es
+    el mismo día para todos los horarios. Solo se simulan las réplicas que todavía no se tienen.
+    """
+    def __init__(self, modelo="tp8", atencion=None, semilla=None, procesos=None, filas_por_tarea=2000):
+        self.modelo = modelo
+        self.atencion = atencion
+        self.semilla = entropia(semilla)
+        self.procesos = procesos or os.cpu_count()
+        self.filas_por_tarea = filas_por_tarea  # Días simulados juntos en cada tarea (limita la memoria)
+        self.costos = {}  # Horario (tupla) -> costos de sus réplicas, en orden de réplica
+        self.simulados = 0  # Días simulados en total
+        self.pool = None
+
+    def __enter__(self):
+        if self.procesos > 1:
+            self.pool = ProcessPoolExecutor(max_workers=self.procesos)
+        return self
+
+    def __exit__(self, *error):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def evaluar(self, horarios, replicas):
+        """
+        Completa hasta replicas réplicas de cada horario y devuelve el costo medio de cada uno.
+        """
+        # Agrupar los horarios por la réplica desde la que les faltan resultados
+        faltantes = {}
+        for horario in map(tuple, horarios):
+            desde = len(self.costos.get(horario, ()))
+            if desde < replicas:
+                faltantes.setdefault(desde, []).append(horario)
+
+        # Cada tarea simula un bloque de réplicas de varios horarios, con a lo sumo filas_por_tarea días
+        tareas = []
+        for desde, grupo in faltantes.items():
+            for inicio in range(desde, replicas, self.filas_por_tarea):
+                cantidad = min(self.filas_por_tarea, replicas - inicio)
+                por_tarea = max(1, self.filas_por_tarea // cantidad)
+                for i in range(0, len(grupo), por_tarea):
+                    tareas.append((np.array(grupo[i:i + por_tarea]), inicio, cantidad, self.modelo, self.atencion, self.semilla))
+
+        salidas = map(_evaluar_tarea, tareas) if self.pool is None else self.pool.map(_evaluar_tarea, tareas)
+        for (grupo, *_), costos in zip(tareas, salidas):
+            for horario, fila in zip(map(tuple, grupo), costos):
+                self.costos[horario] = np.concatenate((self.costos.get(horario, np.empty(0)), fila))
+                self.simulados += len(fila)
+        return [float(self.costos[tuple(horario)][:replicas].mean()) for horario in horarios]
+
+
+def mitades_sucesivas(evaluador, candidatos, presupuesto, eta=2):
+    """
+    Selección por mitades sucesivas (successive halving): simula pocas réplicas de todos los
+    candidatos, se queda con el mejor 1/eta, multiplica las réplicas por eta y repite hasta que
+    queda uno. Cada ronda gasta aproximadamente la misma parte del presupuesto (días simulados):
+    el presupuesto es una referencia, no un límite, porque cada ronda agrega al menos una réplica a
+    cada candidato aunque ya no alcance.
+
+    Devuelve los candidatos ordenados por costo medio en la última ronda en la que participaron.
+    """
+    candidatos = [tuple(candidato) for candidato in dict.fromkeys(map(tuple, candidatos))]
+    rondas = max(1, math.ceil(math.log(len(candidatos), eta))) + 1
+    por_ronda = presupuesto / rondas
+    replicas = 0
+    eliminados = []
+    while True:
+        replicas = max(replicas + 1, int(por_ronda / len(candidatos)))
+        costos = evaluador.evaluar(candidatos, replicas)
+        orden = sorted(range(len(candidatos)), key=costos.__getitem__)
+        candidatos = [candidatos[i] for i in orden]
+        if len(candidatos) == 1:
+            return candidatos + eliminados
+        quedan = math.ceil(len(candidatos) / eta)
+        eliminados = candidatos[quedan:] + eliminados
+        candidatos = candidatos[:quedan]
+
+
+def horarios_iniciales(perfil, minimo, maximo, media_atencion=600):
+    """
+    Horarios de partida: todas las cantidades fijas de boxes y la regla de la raíz cuadrada, con
+    n = a + beta * raiz(a) boxes en cada tramo para la carga a = tasa * media de atención del tramo.
+    """
+    probabilidades = perfil.probabilidades()
+    tramos = math.ceil(len(probabilidades) / ANCHO_TRAMO)
+    carga = np.array([probabilidades[i * ANCHO_TRAMO:(i + 1) * ANCHO_TRAMO].mean() for i in range(tramos)]) * media_atencion
+    horarios = [(cantidad,) * tramos for cantidad in range(minimo, maximo + 1)]
+    for beta in np.linspace(-1, 3, 17):
+        horarios.append(tuple(np.clip(np.round(carga + beta * np.sqrt(carga)), minimo, maximo).astype(int).tolist()))
+    return list(dict.fromkeys(horarios))
+
+
+def vecinos(horario, cantidad, minimo, maximo, rng):
+    """
+    Horarios que difieren del dado en uno o dos tramos por un box de más o de menos.
+    """
+    resultado = set()
+    intentos = 0
+    while len(resultado) < cantidad and intentos < 50 * cantidad:
+        intentos += 1
+        nuevo = list(horario)
+        for tramo in rng.choice(len(horario), size=rng.integers(1, 3), replace=False):
+            nuevo[tramo] = int(np.clip(nuevo[tramo] + rng.choice((-1, 1)), minimo, maximo))
+        if tuple(nuevo) != tuple(horario):
+            resultado.add(tuple(nuevo))
+    return list(resultado)
+
+
+def optimizar_horario(modelo="tp8", presupuesto=20000, candidatos=64, rondas=3, eta=2, minimo=1, maximo=10,
+                      atencion=None, semilla=None, procesos=None, finalistas=5):
+    """
+    Busca el horario de boxes por media hora de menor costo esperado (boxes cobrados por hora).
+
+    La primera ronda compite entre los horarios iniciales (ver horarios_iniciales) completados con
+    vecinos de ellos hasta tener candidatos; las siguientes, entre el mejor hasta el momento y sus
+    vecinos. Cada ronda es una selección por mitades sucesivas con aproximadamente presupuesto /
+    rondas días simulados, todos con números aleatorios comunes. Al final, los finalistas de la
+    última ronda y el mejor horario fijo se completan hasta las réplicas del ganador y se reordenan;
+    esos días no se descuentan del presupuesto, así que el total (evaluador.simulados) puede
+    superarlo.
+
+    Devuelve (evaluador, horarios ordenados del mejor al peor).
+    """
+    rng = np.random.default_rng(semilla)
+    iniciales = horarios_iniciales(PERFILES[modelo], minimo, maximo, float(crear_muestreador(atencion).muestra(20000).mean()))
+    semillas = iniciales[maximo - minimo + 1:] or iniciales
+    primeros = list(iniciales)
+    while len(primeros) < candidatos:
+        primeros.extend(vecinos(semillas[rng.integers(len(semillas))], 1, minimo, maximo, rng))
+        primeros = list(dict.fromkeys(primeros))
+
+    with EvaluadorHorarios(modelo, atencion, semilla, procesos) as evaluador:
+        ranking = mitades_sucesivas(evaluador, primeros, presupuesto / rondas, eta)
+        for _ in range(rondas - 1):
+            mejor = ranking[0]
+            ranking = mitades_sucesivas(evaluador, [mejor] + vecinos(mejor, candidatos - 1, minimo, maximo, rng), presupuesto / rondas, eta)
+
+        # Los finalistas y el mejor horario fijo se comparan con las mismas réplicas que el ganador
+        ranking = ranking[:finalistas]
+        fijo = mejor_fijo(evaluador)
+        if fijo is not None and fijo not in ranking:
+            ranking.append(fijo)
+        replicas = len(evaluador.costos[ranking[0]])
+        costos = evaluador.evaluar(ranking, replicas)
+        ranking = [ranking[i] for i in sorted(range(len(ranking)), key=costos.__getitem__)]
+    return evaluador, ranking
+
+
+def mejor_fijo(evaluador):
+    """
+    Horario con la misma cantidad de boxes todo el día de menor costo medio entre los evaluados.
+    """
+    fijos = [horario for horario in evaluador.costos if len(set(horario)) == 1]
+    return min(fijos, key=lambda horario: evaluador.costos[horario].mean(), default=None)
+
+
+def formatear_horario(horario, apertura=8 * 3600):
+    return " ".join(f"{(apertura + i * ANCHO_TRAMO) // 3600}:{(apertura + i * ANCHO_TRAMO) % 3600 // 60:02d}={boxes}"
+                    for i, boxes in enumerate(horario))
+
+
+def imprimir_horarios(evaluador, ranking, nivel=0.95):
+    """
+    Imprime el costo de cada horario del ranking y su diferencia con el primero en las mismas réplicas.
+    """
+    mejor = ranking[0]
+    replicas = len(evaluador.costos[mejor])
+    costos_mejor = evaluador.costos[mejor][:replicas]
+    print(f"\nDías simulados: {evaluador.simulados} ({replicas} réplicas por finalista)")
+    print(f"\n{'Costo medio':>12} {'IC 95%':>8} {'Dif. vs mejor':>14} {'IC dif.':>8}  Horario (boxes por media hora)")
+    for horario in ranking:
+        costos = evaluador.costos[horario][:replicas]
+        media, ic = intervalo_confianza(costos, nivel)
+        diferencia, ic_diferencia = intervalo_confianza(costos - costos_mejor, nivel)
+        fijo = " (fijo)" if len(set(horario)) == 1 else ""
+        print(f"{media:>12.0f} {ic:>8.0f} {diferencia:>14.0f} {ic_diferencia:>8.0f}  {formatear_horario(horario)}{fijo}")
+    print(f"\nHorario recomendado: {formatear_horario(mejor)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Busca el horario de boxes por media hora de menor costo esperado.")
+    parser.add_argument("--modelo", choices=sorted(PERFILES), default="tp8")
+    parser.add_argument("--atencion", choices=DISTRIBUCIONES_CLI, default="normal_recortada")
+    parser.add_argument("--presupuesto", type=int, default=20000, help="Días simulados aproximados en la búsqueda (la comparación final de los finalistas se suma aparte)")
+    parser.add_argument("--candidatos", type=int, default=64, help="Horarios que compiten en cada ronda")
+    parser.add_argument("--rondas", type=int, default=3)
+    parser.add_argument("--boxes", type=int, nargs=2, default=(1, 10), metavar=("MIN", "MAX"))
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--procesos", type=int, default=None)
+    args = parser.parse_args()
+
+    evaluador, ranking = optimizar_horario(args.modelo, args.presupuesto, args.candidatos, args.rondas,
+                                           minimo=args.boxes[0], maximo=args.boxes[1], atencion=args.atencion,
+                                           semilla=args.semilla, procesos=args.procesos)
+    imprimir_horarios(evaluador, ranking)
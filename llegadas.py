@@ -0,0 +1,151 @@
+import math
+
+import numpy as np
+
+DURACION = 14400  # 8:00 a 12:00 en segundos
+SIN_LLEGADA = np.iinfo(np.int32).max  # Relleno de las filas en los lotes de llegadas
+
+# Tramos de llegada (inicio, fin, probabilidad por segundo), en segundos desde la apertura
+TRAMOS_TP7 = [(0, 14400, 1/144)]
+TRAMOS_TP8 = [
+    (0, 1800, 1/250),        # 8:00 - 8:30
+    (1800, 3600, 1/210),     # 8:30 - 9:00
+    (3600, 5400, 1/130),     # 9:00 - 9:30
+    (5400, 9000, 1/70),      # 9:30 - 10:30
+    (9000, 10800, 1/130),    # 10:30 - 11:00
+    (10800, 12600, 1/210),   # 11:00 - 11:30
+    (12600, 14400, 1/250),   # 11:30 - 12:00
+]
+
+
+def _saltos_geometricos(prob, desde, hasta, replicas, rng):
+    """
+    Segundos con llegada en [desde, hasta) para cada réplica, con una probabilidad fija por segundo.
+
+    Devuelve una matriz (replicas, n) con SIN_LLEGADA después de la última llegada de cada fila.
+    """
+    media = (hasta - desde) * prob
+    ancho = int(media + 6 * math.sqrt(media) + 10)
+    tiempos = desde - 1 + np.cumsum(rng.geometric(prob, size=(replicas, ancho)), axis=1)
+    while tiempos[:, -1].min() < hasta:
+        # Alguna réplica no llegó al final del tramo: extender todas
+        extra = tiempos[:, -1:] + np.cumsum(rng.geometric(prob, size=(replicas, ancho)), axis=1)
+        tiempos = np.concatenate((tiempos, extra), axis=1)
+    return np.where(tiempos < hasta, tiempos, SIN_LLEGADA)
+
+
+def _compactar(columnas, replicas):
+    """
+    Une las llegadas de varias matrices, las ordena por fila y recorta las columnas sobrantes.
+    """
+    if not columnas:
+        return np.full((replicas, 1), SIN_LLEGADA, dtype=np.int64)
+    llegadas = np.sort(np.concatenate(columnas, axis=1), axis=1)
+    usadas = int((llegadas < SIN_LLEGADA).sum(axis=1).max())
+    # Siempre queda al menos una columna SIN_LLEGADA al final de cada fila
+    return np.concatenate((llegadas[:, :usadas], np.full((replicas, 1), SIN_LLEGADA)), axis=1)
+
+
+class PerfilLlegadas:
+    """
+    Proceso de llegadas con una probabilidad de llegada por segundo que depende de la hora.
+
+    Equivale a sortear random.random() < probabilidad cada segundo, pero genera el día completo de
+    una vez con costo proporcional a la cantidad de llegadas. Los tiempos son relativos a la apertura.
+    """
+    def __init__(self, duracion=DURACION):
+        self.duracion = duracion
+
+    def probabilidad(self, tiempo):
+        """
+        Probabilidad de que llegue un cliente en el segundo indicado (acepta arrays).
+        """
+        raise NotImplementedError
+
+    def probabilidades(self):
+        """
+        Probabilidad de llegada de cada segundo del día.
+        """
+        return self.probabilidad(np.arange(self.duracion))
+
+    def llegadas_esperadas(self):
+        return float(self.probabilidades().sum())
+
+    def generar_lote(self, replicas, rng):
+        """
+        Sortea las llegadas de muchas réplicas por raleo: se generan candidatos con la probabilidad
+        máxima y cada uno se acepta con probabilidad(t) / máxima.
+
+        Devuelve una matriz (replicas, n) ordenada por fila y completada con SIN_LLEGADA.
+        """
+        prob = self.probabilidades()
+        maxima = float(prob.max()) if prob.size else 0.0
+        if maxima <= 0:
+            return _compactar([], replicas)
+        candidatos = _saltos_geometricos(maxima, 0, self.duracion, replicas, rng)
+        validos = candidatos < SIN_LLEGADA
+        aceptados = np.zeros_like(validos)
+        aceptados[validos] = rng.random(validos.sum()) * maxima < prob[candidatos[validos]]
+        return _compactar([np.where(aceptados, candidatos, SIN_LLEGADA)], replicas)
+
+    def generar(self, rng):
+        """
+        Sortea los segundos de llegada de un día.
+        """
+        llegadas = self.generar_lote(1, rng)[0]
+        return llegadas[llegadas < SIN_LLEGADA]
+
+
+class PerfilTramos(PerfilLlegadas):
+    """
+    Llegadas con una probabilidad constante por segundo dentro de cada tramo de la tabla
+    (inicio, fin, probabilidad). Dentro de un tramo el tiempo entre llegadas es geométrico.
+    """
+    def __init__(self, tramos, duracion=None):
+        self.tramos = [(int(desde), int(hasta), float(prob)) for desde, hasta, prob in tramos]
+        super().__init__(max(hasta for _, hasta, _ in self.tramos) if duracion is None else duracion)
+
+    def probabilidad(self, tiempo):
+        tiempo = np.asarray(tiempo)
+        prob = np.zeros(tiempo.shape)
+        for desde, hasta, p in self.tramos:
+            prob[(desde <= tiempo) & (tiempo < hasta)] = p
+        return prob
+
+    def generar_lote(self, replicas, rng):
+        columnas = []
+        for desde, hasta, prob in self.tramos:
+            hasta = min(hasta, self.duracion)
+            if prob > 0 and hasta > desde:
+                columnas.append(_saltos_geometricos(min(prob, 1.0), desde, hasta, replicas, rng))
+        return _compactar(columnas, replicas)
+
+
+def PerfilConstante(prob, duracion=DURACION):
+    """
+    Llegadas con la misma probabilidad todo el día (el modelo 1/144 de tp7).
+    """
+    return PerfilTramos([(0, duracion, prob)], duracion)
+
+
+class PerfilNormal(PerfilLlegadas):
+    """
+    Llegadas con probabilidad proporcional a la densidad normal: más probables cerca de la media
+    (por defecto las 10:00, como probabilidad_llegada de graficas_tp7/graficas_tp8).
+    """
+    def __init__(self, media=7200, desvio=7200, escala=1.0, duracion=DURACION):
+        super().__init__(duracion)
+        self.media = media
+        self.desvio = desvio
+        self.escala = escala
+
+    def probabilidad(self, tiempo):
+        z = (np.asarray(tiempo, dtype=float) - self.media) / self.desvio
+        return self.escala * np.exp(-0.5 * z * z) / (self.desvio * math.sqrt(2 * math.pi))
+
+
+PERFIL_TP7 = PerfilTramos(TRAMOS_TP7)
+PERFIL_TP8 = PerfilTramos(TRAMOS_TP8)
+PERFIL_NORMAL = PerfilNormal()
+
+PERFILES = {"tp7": PERFIL_TP7, "tp8": PERFIL_TP8, "normal": PERFIL_NORMAL}
@@ -0,0 +1,253 @@
+import heapq
+import math
+
+import numpy as np
+
+from estadisticas import Estadisticas
+from muestreo_atencion import crear_muestreador
+from perfilador import ASIGNACION, BOXES, COLA, LLEGADAS, OBSERVACION
+from registro_clientes import ABANDONO, ATENDIDO
+from sala_espera import SalaEspera, SalaEsperaVariable
+from semillas import FlujosReplica
+
+PACIENCIA = 1800  # 30 minutos en segundos
+
+
+class MotorEventos:
+    """
+    Simula la operación de un Local saltando de evento en evento en lugar de avanzar segundo a segundo.
+
+    Reproduce las mismas reglas del bucle por segundos (orden llegada, asignación, fin de atención y
+    abandono de la cola dentro de cada segundo) y actualiza los mismos contadores del Local.
+
+    Las llegadas, los tiempos de atención y la paciencia salen de los flujos de la réplica
+    (FlujosReplica), y cada cliente recibe su tiempo de atención según su orden de llegada, así dos
+    configuraciones con los mismos flujos ven exactamente los mismos clientes. paciencia puede ser
+    un número de segundos o la configuración de una distribución (ver crear_muestreador).
+    al_atender(cliente, tiempo) se llama cada vez que un cliente pasa a un box. Las llegadas,
+    atenciones, abandonos y el estado de la cola y los boxes se acumulan en estadisticas, cada
+    cliente queda en registro (un RegistroClientes) si se indica y perfilador (un Perfilador) mide
+    el tiempo de cada fase.
+
+    Para simular varios locales conectados (ver multisitio.py), derivar(tiempo, tiempo_atencion,
+    paciencia) se llama con cada llegada propia y devuelve True si el cliente se va a otro local, y
+    recibir agrega clientes derivados desde otros locales.
+    """
+    def __init__(self, local, perfil, crear_cliente, paciencia=PACIENCIA, flujos=None, muestreador=None, al_observar=None, cada=100,
+                 al_atender=None, estadisticas=None, registro=None, perfilador=None):
+        self.local = local
+        self.crear_cliente = crear_cliente
+        self.paciencia = paciencia
+        self.al_observar = al_observar
+        self.al_atender = al_atender
+        self.cada = cada
+
+        self.tiempo = local.tiempo_inicio_operacion - 1  # Último segundo procesado
+        self.fin = local.tiempo_fin_operacion
+        self.perfil = perfil
+        self.muestreador = muestreador
+        self.sortear(FlujosReplica() if flujos is None else flujos)
+        if isinstance(paciencia, (int, float)):
+            if not isinstance(local.cola, SalaEspera):
+                local.cola = SalaEspera(paciencia)
+        elif not isinstance(local.cola, SalaEsperaVariable):
+            local.cola = SalaEsperaVariable()
+        self.eventos_box = []  # Heap de (tiempo, indice_box) con el próximo fin de atención o abandono
+        self.reasignar = False  # Hay un box liberado con clientes esperando
+        self.derivar = None
+        self.recibidos = []  # Heap de (tiempo, orden, tiempo_atencion, paciencia) de clientes derivados de otros locales
+
+        if estadisticas is None:
+            estadisticas = Estadisticas(len(local.boxes), local.tiempo_inicio_operacion, self.fin - local.tiempo_inicio_operacion)
+        self.estadisticas = estadisticas
+        self.registro = registro
+        self.perfilador = perfilador
+
+    def sortear(self, flujos):
+        """
+        Sortea con flujos las llegadas posteriores al último segundo procesado, con sus tiempos de
+        atención y paciencias. Llamado de nuevo a mitad del día, reemplaza las llegadas futuras
+        (por ejemplo, para simular varios futuros desde una misma instantánea).
+        """
+        self.flujos = flujos
+        llegadas = self.local.tiempo_inicio_operacion + self.perfil.generar(flujos.llegadas)
+        llegadas = llegadas[(llegadas > self.tiempo) & (llegadas < self.fin)]
+        self.llegadas = iter(llegadas.tolist())
+        self.prox_llegada = next(self.llegadas, math.inf)
+        self.atenciones = iter(crear_muestreador(self.muestreador).con_generador(flujos.atencion).muestra(len(llegadas)).tolist())
+        self.paciencias = None
+        if not isinstance(self.paciencia, (int, float)):
+            paciencias = crear_muestreador(self.paciencia, flujos.paciencia).muestra(len(llegadas))
+            self.paciencias = iter(np.rint(paciencias).astype(int).tolist())
+
+    def renumerar_boxes(self, renumerados):
+        """
+        Actualiza los eventos después de un cambio en la cantidad de boxes del local; renumerados
+        indica el nuevo índice de los boxes ocupados que cambiaron de lugar.
+        """
+        self.eventos_box = [(tiempo, renumerados.get(i, i)) for tiempo, i in self.eventos_box]
+        heapq.heapify(self.eventos_box)
+        self.reasignar = bool(self.local.cola)  # Los boxes nuevos pueden tomar clientes en el segundo siguiente
+        self.estadisticas.cantidad_boxes = len(self.local.boxes)
+
+    def recibir(self, tiempo, orden, tiempo_atencion, paciencia):
+        """
+        Agenda la llegada de un cliente derivado de otro local en el segundo tiempo (posterior al
+        último procesado). Los que llegan en el mismo segundo entran a la cola según orden, después
+        de la llegada propia.
+        """
+        heapq.heappush(self.recibidos, (tiempo, orden, tiempo_atencion, paciencia))
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado["al_observar"] = None  # La animación y las mediciones no forman parte del estado
+        estado["perfilador"] = None
+        return estado
+
+    def proximo_tiempo(self):
+        """
+        Devuelve el próximo segundo en el que ocurre algo.
+        """
+        proximo = self.prox_llegada
+        if self.recibidos and self.recibidos[0][0] < proximo:
+            proximo = self.recibidos[0][0]
+        if self.eventos_box and self.eventos_box[0][0] < proximo:
+            proximo = self.eventos_box[0][0]
+        if self.reasignar and self.tiempo + 1 < proximo:
+            proximo = self.tiempo + 1
+        vencimiento = self.local.cola.proximo_vencimiento()
+        if vencimiento < proximo:
+            proximo = vencimiento
+        if self.al_observar is not None:
+            proxima_observacion = (self.tiempo // self.cada + 1) * self.cada
+            if proxima_observacion < proximo:
+                proximo = proxima_observacion
+        return proximo
+
+    def procesar(self, tiempo_actual):
+        """
+        Procesa todos los eventos de un segundo en el mismo orden que el bucle por segundos.
+        """
+        local = self.local
+        cola = local.cola
+        estadisticas = self.estadisticas
+        perfilador = self.perfilador
+
+        # 1. Llegada de un cliente (y de los derivados desde otros locales)
+        if perfilador is not None:
+            perfilador.marcar(LLEGADAS)
+        if tiempo_actual == self.prox_llegada:
+            tiempo_atencion = next(self.atenciones)  # Tiempo de atención en segundos
+            paciencia = self.paciencia if self.paciencias is None else next(self.paciencias)
+            self.prox_llegada = next(self.llegadas, math.inf)
+            if self.derivar is None or not self.derivar(tiempo_actual, tiempo_atencion, paciencia):
+                self._ingresar(tiempo_actual, tiempo_atencion, paciencia)
+        while self.recibidos and self.recibidos[0][0] == tiempo_actual:
+            _, _, tiempo_atencion, paciencia = heapq.heappop(self.recibidos)
+            self._ingresar(tiempo_actual, tiempo_atencion, paciencia)
+
+        # 2. Atender a los clientes en la cola
+        if perfilador is not None:
+            perfilador.marcar(ASIGNACION, len(cola))
+        if cola:
+            for i, box in enumerate(local.boxes):
+                if not box.ocupado and cola:
+                    cliente, vencimiento = cola.extraer()
+                    box.ocupado = True
+                    box.cliente_actual = cliente
+                    box.tiempo_inicio_atencion = tiempo_actual
+                    # Termina en el primer segundo con atención completa, salvo que antes supere la paciencia
+                    fin_atencion = tiempo_actual + math.ceil(cliente.tiempo_atencion)
+                    abandono = vencimiento + 1
+                    heapq.heappush(self.eventos_box, (min(fin_atencion, abandono), i))
+                    if self.registro is not None:
+                        self.registro.iniciar_atencion(cliente.indice, tiempo_actual, i, cliente.tiempo_atencion)
+                    if self.al_atender is not None:
+                        self.al_atender(cliente, tiempo_actual)
+        self.reasignar = False
+
+        # 3. Fin de atención o abandono de los clientes en los boxes
+        if perfilador is not None:
+            perfilador.marcar(BOXES)
+        while self.eventos_box and self.eventos_box[0][0] == tiempo_actual:
+            _, i = heapq.heappop(self.eventos_box)
+            box = local.boxes[i]
+            cliente = box.cliente_actual
+            box.ocupado = False
+            if tiempo_actual - box.tiempo_inicio_atencion >= cliente.tiempo_atencion:
+                # Cliente termina atención
+                cliente.tiempo_salida = tiempo_actual
+                cliente.tiempo_espera = cliente.tiempo_salida - cliente.tiempo_llegada
+                estadisticas.registrar_atencion(cliente.tiempo_atencion, cliente.tiempo_espera)
+                local.clientes_atendidos += 1
+                if self.registro is not None:
+                    self.registro.terminar(cliente.indice, tiempo_actual, ATENDIDO)
+
+                local.tiempo_min_atencion = min(local.tiempo_min_atencion, cliente.tiempo_atencion)
+                local.tiempo_max_atencion = max(local.tiempo_max_atencion, cliente.tiempo_atencion)
+                local.tiempo_min_espera = min(local.tiempo_min_espera, cliente.tiempo_espera)
+                local.tiempo_max_espera = max(local.tiempo_max_espera, cliente.tiempo_espera)
+            else:
+                # Cliente que estaba siendo atendido abandona el local
+                local.clientes_abandonados += 1
+                estadisticas.registrar_abandono(tiempo_actual)
+                if self.registro is not None:
+                    self.registro.terminar(cliente.indice, tiempo_actual, ABANDONO)
+            if cola:
+                self.reasignar = True
+
+        # 4. Eliminar clientes que abandonan la cola
+        if perfilador is not None:
+            perfilador.marcar(COLA)
+        expirados = cola.expirar(tiempo_actual)
+        if expirados:
+            local.clientes_abandonados += expirados
+            estadisticas.registrar_abandono(tiempo_actual, expirados)
+        estadisticas.registrar_estado(tiempo_actual, len(cola), len(self.eventos_box))
+
+        # 5. Observar el estado (animación)
+        if perfilador is not None:
+            perfilador.marcar(OBSERVACION)
+        if self.al_observar is not None and tiempo_actual % self.cada == 0:
+            self.al_observar(tiempo_actual)
+        if perfilador is not None:
+            perfilador.marcar(None)
+
+    def _ingresar(self, tiempo_actual, tiempo_atencion, paciencia):
+        """
+        Agrega a la cola un cliente que llega en tiempo_actual.
+        """
+        cliente = self.crear_cliente(tiempo_actual)
+        cliente.tiempo_atencion = tiempo_atencion
+        self.local.cola.append(cliente, None if self.paciencias is None else paciencia)
+        self.estadisticas.registrar_llegada(tiempo_actual)
+        if self.registro is not None:
+            cliente.indice = self.registro.agregar(tiempo_actual, tiempo_actual + paciencia)
+
+    def avanzar_hasta(self, tiempo_limite):
+        """
+        Procesa los eventos anteriores a tiempo_limite.
+        """
+        while True:
+            tiempo_actual = self.proximo_tiempo()
+            if tiempo_actual >= tiempo_limite:
+                break
+            self.tiempo = tiempo_actual
+            self.procesar(tiempo_actual)
+        # Los segundos hasta el límite ya están simulados aunque no haya pasado nada en ellos
+        self.tiempo = max(self.tiempo, tiempo_limite - 1)
+
+    def ejecutar(self):
+        """
+        Simula el día completo y devuelve las estadísticas acumuladas.
+        """
+        self.avanzar_hasta(self.fin)
+
+        # Al finalizar la simulación, agregar los clientes que quedaron en la cola a los abandonados
+        self.local.clientes_abandonados += len(self.local.cola)
+        self.estadisticas.registrar_abandono(self.fin, len(self.local.cola))
+        self.estadisticas.cerrar(self.fin)
+        if self.registro is not None:
+            self.registro.cerrar(self.fin)
+
+        return self.estadisticas
@@ -0,0 +1,232 @@
+import numpy as np
+
+from llegadas import DURACION, PERFIL_TP7, SIN_LLEGADA
+from motor_eventos import PACIENCIA
+from muestreo_atencion import crear_muestreador
+from registro_clientes import ABANDONO, ATENDIDO, RegistroClientes
+from simulacion import COSTO_ABANDONO, COSTO_BOX
+
+SIN_EVENTO = SIN_LLEGADA
+ANCHO_TRAMO = 1800  # Tramos de media hora de los horarios de boxes
+
+
+class ResultadosLote:
+    """
+    Contadores de una simulación en lote, con un elemento por réplica (día simulado). Con un horario
+    de boxes, horas_box tiene las horas de box abiertas de cada réplica. costo_box y costo_abandono
+    son los costos del Local simulado y duracion la del día en segundos (ver calcular_costo).
+    """
+    def __init__(self, cantidad_boxes, replicas, horas_box=None, costo_box=COSTO_BOX, costo_abandono=COSTO_ABANDONO,
+                 duracion=DURACION):
+        self.cantidad_boxes = cantidad_boxes
+        self.horas_box = horas_box
+        self.duracion = duracion
+        self.costo_box = costo_box
+        self.costo_abandono = costo_abandono
+        self.clientes_atendidos = np.zeros(replicas, dtype=np.int64)
+        self.clientes_abandonados = np.zeros(replicas, dtype=np.int64)
+        self.tiempo_min_atencion = np.full(replicas, np.inf)
+        self.tiempo_max_atencion = np.zeros(replicas)
+        self.tiempo_min_espera = np.full(replicas, np.inf)
+        self.tiempo_max_espera = np.zeros(replicas)
+        self.registro = None  # RegistroClientes con todos los clientes, si se pidió registrar
+
+    def __len__(self):
+        return len(self.clientes_atendidos)
+
+    def calcular_costo(self):
+        """
+        Calcula el costo total de la operación de cada réplica. Con horario, cada box se cobra en
+        proporción a las horas que estuvo abierto (costo_box es el de un día completo), como en
+        Local.calcular_costo.
+        """
+        if self.horas_box is None:
+            costo_boxes = self.cantidad_boxes * self.costo_box  # Costo de los boxes
+        else:
+            costo_boxes = self.horas_box * 3600 * self.costo_box / self.duracion  # costo_box por día completo, prorrateado
+        costo_perdida_clientes = self.clientes_abandonados * self.costo_abandono  # Costo por clientes abandonados
+        return costo_boxes + costo_perdida_clientes
+
+
+def sortear_clientes(replicas, perfil, muestreador, rng=None, flujos=None):
+    """
+    Sortea las llegadas y el tiempo de atención de cada cliente (según su orden de llegada).
+
+    Con flujos (una FlujosReplica por réplica) cada réplica usa sus propios generadores y obtiene
+    los mismos clientes que MotorEventos con esos flujos; si no, todo sale de rng en bloque.
+    """
+    muestreador = crear_muestreador(muestreador)
+    if flujos is None:
+        rng = np.random.default_rng() if rng is None else rng
+        llegadas = perfil.generar_lote(replicas, rng)
+        atenciones = muestreador.con_generador(rng).muestra(llegadas.size).reshape(llegadas.shape)
+        return llegadas, atenciones
+
+    if len(flujos) != replicas:
+        raise ValueError("Se necesita un FlujosReplica por réplica")
+    por_replica = [perfil.generar(f.llegadas) for f in flujos]
+    ancho = max(len(tiempos) for tiempos in por_replica) + 1
+    llegadas = np.full((replicas, ancho), SIN_EVENTO, dtype=np.int64)
+    atenciones = np.zeros((replicas, ancho))
+    for i, (tiempos, f) in enumerate(zip(por_replica, flujos)):
+        llegadas[i, :len(tiempos)] = tiempos
+        atenciones[i, :len(tiempos)] = muestreador.con_generador(f.atencion).muestra(len(tiempos))
+    return llegadas, atenciones
+
+
+def simular_lote(cantidad_boxes, replicas, perfil=PERFIL_TP7, paciencia=PACIENCIA, rng=None, muestreador=None, flujos=None,
+                 registrar=False, horario=None, ancho_tramo=ANCHO_TRAMO, clientes=None, costo_box=COSTO_BOX,
+                 costo_abandono=COSTO_ABANDONO):
+    """
+    Simula muchas réplicas del mismo Local a la vez, con las réplicas como una dimensión de los arrays.
+
+    Cada vuelta avanza todas las réplicas juntas, cada una a su propio próximo segundo con eventos, y
+    lo procesa con las reglas del bucle por segundos de Local.simular: llegada, asignación de boxes
+    libres por orden, fin de atención (o abandono dentro del box) y abandono de la cola. Los tiempos
+    son relativos a la apertura. muestreador es un MuestreadorAtencion o su configuración, y flujos
+    una lista de FlujosReplica para usar números aleatorios comunes (ver sortear_clientes). Con
+    registrar, resultados.registro guarda a cada cliente en un RegistroClientes.
+
+    horario reemplaza a cantidad_boxes por la cantidad de boxes abiertos en cada tramo de ancho_tramo
+    segundos: una lista para todas las réplicas o una fila por réplica. Un box que cierra con un
+    cliente lo termina de atender. clientes son las llegadas y atenciones ya sorteadas (como las
+    devuelve sortear_clientes), por ejemplo para repetir los mismos días con varios horarios.
+    costo_box y costo_abandono son los de Local (ver ResultadosLote.calcular_costo).
+    """
+    if not isinstance(paciencia, (int, np.integer)):
+        raise ValueError("simular_lote requiere la misma paciencia para todos los clientes; usar MotorEventos")
+    horas_box = None
+    if horario is not None:
+        horario = np.asarray(horario, dtype=np.int64)
+        horario = np.broadcast_to(horario, (replicas, horario.shape[-1]))
+        cantidad_boxes = max(int(horario.max()), 1)
+        horas_box = horario.sum(axis=1) * ancho_tramo / 3600
+        ultimo_tramo = horario.shape[1] - 1
+        numero_box = np.arange(cantidad_boxes)
+    resultados = ResultadosLote(cantidad_boxes, replicas, horas_box, costo_box, costo_abandono, perfil.duracion)
+    filas = np.arange(replicas)
+
+    duracion = perfil.duracion
+    if clientes is None:
+        llegadas, atenciones = sortear_clientes(replicas, perfil, muestreador, rng, flujos)
+    else:
+        llegadas, atenciones = clientes
+    proxima_llegada = np.zeros(replicas, dtype=np.int64)  # Índice de la próxima llegada de cada réplica
+
+    # La cola es un buffer circular por réplica: con una llegada por segundo como máximo y la
+    # paciencia acotada, nunca hay más de paciencia + 2 clientes esperando
+    capacidad = paciencia + 2
+    cola = np.zeros((replicas, capacidad), dtype=np.int64)  # Índice (orden de llegada) de cada cliente en espera
+    inicio_cola = np.zeros(replicas, dtype=np.int64)
+    fin_cola = np.zeros(replicas, dtype=np.int64)
+
+    ocupado = np.zeros((replicas, cantidad_boxes), dtype=bool)
+    evento_box = np.full((replicas, cantidad_boxes), SIN_EVENTO, dtype=np.int64)  # Segundo de fin de atención o abandono
+    termina_atendido = np.zeros((replicas, cantidad_boxes), dtype=bool)
+    atencion_box = np.zeros((replicas, cantidad_boxes))
+    llegada_box = np.zeros((replicas, cantidad_boxes), dtype=np.int64)
+    tiempo = np.full(replicas, -1, dtype=np.int64)  # Último segundo procesado de cada réplica
+    reasignar = np.zeros(replicas, dtype=bool)  # Se liberó un box con clientes esperando
+    if registrar:
+        cliente_box = np.zeros((replicas, cantidad_boxes), dtype=np.int64)  # Índice del cliente en cada box
+        inicio_atencion = np.full(llegadas.shape, -1, dtype=np.int64)
+        box_cliente = np.full(llegadas.shape, -1, dtype=np.int16)
+        salida = np.full(llegadas.shape, -1, dtype=np.int64)
+        resultado = np.zeros(llegadas.shape, dtype=np.int8)
+
+    while True:
+        # Próximo segundo con eventos de cada réplica
+        llegada_siguiente = llegadas[filas, proxima_llegada]
+        vencimiento = np.where(fin_cola > inicio_cola, llegadas[filas, cola[filas, inicio_cola % capacidad]] + paciencia + 1, SIN_EVENTO)
+        tiempo_actual = np.minimum(llegada_siguiente, evento_box.min(axis=1))
+        tiempo_actual = np.minimum(tiempo_actual, vencimiento)
+        tiempo_actual = np.minimum(tiempo_actual, np.where(reasignar, tiempo + 1, SIN_EVENTO))
+        if horario is not None:
+            # Al empezar cada tramo pueden abrirse boxes
+            tiempo_actual = np.minimum(tiempo_actual, (tiempo // ancho_tramo + 1) * ancho_tramo)
+        activas = tiempo_actual < duracion
+        if not activas.any():
+            break
+        tiempo_actual[~activas] = -1  # Las réplicas terminadas no coinciden con ningún evento
+        tiempo = np.where(activas, tiempo_actual, tiempo)
+
+        # 1. Llegada de clientes
+        llegan = np.flatnonzero(llegada_siguiente == tiempo_actual)
+        cola[llegan, fin_cola[llegan] % capacidad] = proxima_llegada[llegan]
+        fin_cola[llegan] += 1
+        proxima_llegada[llegan] += 1
+
+        # 2. Atender a los clientes en la cola (boxes libres en orden, primero en llegar primero en ser atendido)
+        libres = ~ocupado
+        if horario is not None:
+            abiertos = horario[filas, np.minimum(np.maximum(tiempo_actual, 0) // ancho_tramo, ultimo_tramo)]
+            libres &= numero_box < abiertos[:, None]
+        esperan = np.flatnonzero(activas & (fin_cola > inicio_cola) & libres.any(axis=1))
+        if esperan.size:
+            libres = libres[esperan]
+            orden_libre = np.cumsum(libres, axis=1)
+            asigna = libres & (orden_libre <= (fin_cola[esperan] - inicio_cola[esperan])[:, None])
+            r, b = np.nonzero(asigna)
+            r_global = esperan[r]
+            cliente = cola[r_global, (inicio_cola[r_global] + orden_libre[r, b] - 1) % capacidad]
+            llegada = llegadas[r_global, cliente]
+            atencion = atenciones[r_global, cliente]  # Tiempo de atención en segundos
+
+            fin_atencion = tiempo_actual[r_global] + np.ceil(atencion).astype(np.int64)
+            abandono = llegada + paciencia + 1
+            ocupado[r_global, b] = True
+            evento_box[r_global, b] = np.minimum(fin_atencion, abandono)
+            termina_atendido[r_global, b] = fin_atencion <= abandono
+            atencion_box[r_global, b] = atencion
+            llegada_box[r_global, b] = llegada
+            inicio_cola[esperan] += asigna.sum(axis=1)
+            if registrar:
+                cliente_box[r_global, b] = cliente
+                inicio_atencion[r_global, cliente] = tiempo_actual[r_global]
+                box_cliente[r_global, cliente] = b
+
+        # 3. Fin de atención o abandono de los clientes en los boxes
+        termina = evento_box == tiempo_actual[:, None]
+        liberadas = np.flatnonzero(termina.any(axis=1))
+        reasignar[:] = False
+        if liberadas.size:
+            termina = termina[liberadas]
+            atendido = termina & termina_atendido[liberadas]
+            resultados.clientes_atendidos[liberadas] += atendido.sum(axis=1)
+            resultados.clientes_abandonados[liberadas] += (termina & ~atendido).sum(axis=1)
+
+            atencion = atencion_box[liberadas]
+            espera = tiempo_actual[liberadas, None] - llegada_box[liberadas]
+            resultados.tiempo_min_atencion[liberadas] = np.minimum(resultados.tiempo_min_atencion[liberadas], np.where(atendido, atencion, np.inf).min(axis=1))
+            resultados.tiempo_max_atencion[liberadas] = np.maximum(resultados.tiempo_max_atencion[liberadas], np.where(atendido, atencion, 0).max(axis=1))
+            resultados.tiempo_min_espera[liberadas] = np.minimum(resultados.tiempo_min_espera[liberadas], np.where(atendido, espera, np.inf).min(axis=1))
+            resultados.tiempo_max_espera[liberadas] = np.maximum(resultados.tiempo_max_espera[liberadas], np.where(atendido, espera, 0).max(axis=1))
+
+            if registrar:
+                r, b = np.nonzero(termina)
+                cliente = cliente_box[liberadas[r], b]
+                salida[liberadas[r], cliente] = tiempo_actual[liberadas[r]]
+                resultado[liberadas[r], cliente] = np.where(atendido[r, b], ATENDIDO, ABANDONO)
+
+            ocupado[liberadas] &= ~termina
+            evento_box[liberadas] = np.where(termina, SIN_EVENTO, evento_box[liberadas])
+            reasignar[liberadas] = fin_cola[liberadas] > inicio_cola[liberadas]
+
+        # 4. Eliminar clientes que abandonan la cola (el primero en llegar es el primero en vencer)
+        vence = (fin_cola > inicio_cola) & (llegadas[filas, cola[filas, inicio_cola % capacidad]] + paciencia < tiempo_actual)
+        inicio_cola += vence
+        resultados.clientes_abandonados += vence
+
+    # Al finalizar la simulación, agregar los clientes que quedaron en la cola a los abandonados
+    resultados.clientes_abandonados += fin_cola - inicio_cola
+
+    if registrar:
+        validos = llegadas < duracion
+        replica, _ = np.nonzero(validos)
+        resultados.registro = RegistroClientes.desde_columnas(
+            replica=replica, llegada=llegadas[validos], vencimiento=llegadas[validos] + paciencia,
+            inicio_atencion=inicio_atencion[validos], duracion=np.where(box_cliente >= 0, atenciones, np.nan)[validos],
+            salida=salida[validos], resultado=resultado[validos], box=box_cliente[validos],
+        )
+        resultados.registro.cerrar(duracion)
+    return resultados
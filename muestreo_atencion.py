@@ -0,0 +1,135 @@
+import copy
+import math
+
+import numpy as np
+
+
+class MuestreadorAtencion:
+    """
+    Sortea tiempos de atención (en segundos) en lotes grandes y los entrega de a uno desde un buffer.
+    """
+    def __init__(self, rng=None, tamano_lote=4096):
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.tamano_lote = tamano_lote
+        self._buffer = []
+
+    def _sortear(self, n):
+        """
+        Sortea n tiempos de atención de una vez.
+        """
+        raise NotImplementedError
+
+    def muestra(self, n):
+        """
+        Devuelve un array con n tiempos de atención.
+        """
+        return self._sortear(n)
+
+    def con_generador(self, rng):
+        """
+        Devuelve una copia con la misma distribución que sortea con otro generador.
+        """
+        copia = copy.copy(self)
+        copia.rng = rng
+        copia._buffer = []
+        return copia
+
+    def siguiente(self):
+        """
+        Devuelve un tiempo de atención, reponiendo el buffer cuando se vacía.
+        """
+        try:
+            return self._buffer.pop()
+        except IndexError:
+            self._buffer = self._sortear(self.tamano_lote).tolist()
+            return self._buffer.pop()
+
+
+class NormalRecortada(MuestreadorAtencion):
+    """
+    max(0, normal(media, desvio)): el modelo original, con los negativos acumulados en 0.
+    """
+    def __init__(self, media=600, desvio=300, rng=None, tamano_lote=4096):
+        super().__init__(rng, tamano_lote)
+        self.media = media
+        self.desvio = desvio
+
+    def _sortear(self, n):
+        return np.maximum(0, self.rng.normal(loc=self.media, scale=self.desvio, size=n))
+
+
+class NormalTruncada(MuestreadorAtencion):
+    """
+    Normal(media, desvio) condicionada a valores no negativos (se vuelven a sortear los negativos).
+    """
+    def __init__(self, media=600, desvio=300, rng=None, tamano_lote=4096):
+        super().__init__(rng, tamano_lote)
+        self.media = media
+        self.desvio = desvio
+
+    def _sortear(self, n):
+        valores = self.rng.normal(loc=self.media, scale=self.desvio, size=n)
+        negativos = np.flatnonzero(valores < 0)
+        while negativos.size:
+            valores[negativos] = self.rng.normal(loc=self.media, scale=self.desvio, size=negativos.size)
+            negativos = negativos[valores[negativos] < 0]
+        return valores
+
+
+class LogNormal(MuestreadorAtencion):
+    """
+    Lognormal con la media y el desvío indicados (en segundos, no en escala logarítmica).
+    """
+    def __init__(self, media=600, desvio=300, rng=None, tamano_lote=4096):
+        super().__init__(rng, tamano_lote)
+        self.media = media
+        self.desvio = desvio
+        self.sigma = math.sqrt(math.log(1 + (desvio / media) ** 2))
+        self.mu = math.log(media) - self.sigma ** 2 / 2
+
+    def _sortear(self, n):
+        return self.rng.lognormal(mean=self.mu, sigma=self.sigma, size=n)
+
+
+class Empirica(MuestreadorAtencion):
+    """
+    Remuestrea con reposición tiempos de atención observados.
+    """
+    def __init__(self, datos, rng=None, tamano_lote=4096):
+        super().__init__(rng, tamano_lote)
+        self.datos = np.asarray(datos, dtype=float)
+        if self.datos.size == 0:
+            raise ValueError("Se necesita al menos un tiempo de atención observado")
+        self.media = float(self.datos.mean())
+        self.desvio = float(self.datos.std())
+
+    def _sortear(self, n):
+        return self.datos[self.rng.integers(0, self.datos.size, size=n)]
+
+
+DISTRIBUCIONES = {
+    "normal_recortada": NormalRecortada,
+    "normal_truncada": NormalTruncada,
+    "lognormal": LogNormal,
+    "empirica": Empirica,
+}
+# Las que se pueden elegir por nombre en la línea de comandos (empirica necesita los datos observados)
+DISTRIBUCIONES_CLI = sorted(nombre for nombre in DISTRIBUCIONES if nombre != "empirica")
+
+
+def crear_muestreador(config=None, rng=None):
+    """
+    Crea un muestreador a partir de un nombre de distribución o de un diccionario de configuración,
+    por ejemplo {"distribucion": "lognormal", "media": 600, "desvio": 300}.
+    """
+    if config is None:
+        config = "normal_recortada"
+    if isinstance(config, MuestreadorAtencion):
+        return config
+    if isinstance(config, str):
+        config = {"distribucion": config}
+    parametros = dict(config)
+    distribucion = parametros.pop("distribucion", "normal_recortada")
+    if distribucion not in DISTRIBUCIONES:
+        raise ValueError(f"Distribución de atención desconocida: {distribucion}")
+    return DISTRIBUCIONES[distribucion](rng=rng, **parametros)
@@ -0,0 +1,218 @@
+import argparse
+import json
+import math
+import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from estadisticas import Momentos
+from llegadas import PERFIL_TP7, PERFIL_TP8, PerfilTramos
+from motor_vectorizado import ANCHO_TRAMO, simular_lote
+from registro_clientes import ATENDIDO
+from semillas import FlujosReplica, entropia, semilla_replica
+
+DIAS_SEMANA = ("lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo")
+
+# Jornada completa de 8:00 a 20:00: el pico de la mañana del tp8, una tarde tranquila y otro pico al cierre
+TRAMOS_DIA_COMPLETO = [
+    (0, 1800, 1/250), (1800, 3600, 1/210), (3600, 5400, 1/130), (5400, 9000, 1/70),
+    (9000, 10800, 1/130), (10800, 12600, 1/210), (12600, 18000, 1/250),
+    (18000, 27000, 1/180), (27000, 36000, 1/150), (36000, 39600, 1/90), (39600, 43200, 1/160),
+]
+PERFIL_DIA_COMPLETO = PerfilTramos(TRAMOS_DIA_COMPLETO, 12 * 3600)
+
+
+class Jornada:
+    """
+    Cómo opera el local un día de la semana: el perfil de llegadas (su duración es la del día, con
+    los tiempos relativos a la apertura) y los boxes, como cantidad fija o como horario por media
+    hora (ver simular_lote). Con boxes=None se repite el horario del último día abierto.
+    """
+    def __init__(self, perfil, boxes=None):
+        self.perfil = perfil
+        self.boxes = boxes
+
+    def horario(self, anterior=None):
+        """
+        Boxes abiertos en cada media hora del día. Un horario heredado de otro día se recorta o se
+        completa repitiendo su último tramo.
+        """
+        tramos = math.ceil(self.perfil.duracion / ANCHO_TRAMO)
+        boxes = self.boxes if self.boxes is not None else anterior
+        if boxes is None:
+            raise ValueError("El primer día abierto necesita una cantidad de boxes o un horario")
+        if np.ndim(boxes) == 0:
+            return (int(boxes),) * tramos
+        boxes = tuple(int(b) for b in boxes)
+        return (boxes + boxes[-1:] * tramos)[:tramos]
+
+
+# Semana de cada plan (None: el local no abre ese día)
+PLANES = {
+    "tp8": [Jornada(PERFIL_TP8, boxes=10)] + [Jornada(PERFIL_TP8)] * 4 + [Jornada(PERFIL_TP7, boxes=7), None],
+    "tp7": [Jornada(PERFIL_TP7, boxes=8)] + [Jornada(PERFIL_TP7)] * 5 + [None],
+    "completo": [Jornada(PERFIL_DIA_COMPLETO, boxes=[6, 6, 8, 10, 10, 10, 8, 6, 6, 6] + [5] * 10 + [6] * 4)]
+                + [Jornada(PERFIL_DIA_COMPLETO)] * 4 + [Jornada(PERFIL_TP8, boxes=10), None],
+}
+
+
+def calendario(plan, inicio, dias):
+    """
+    Días abiertos entre inicio y inicio + dias: (número de día, fecha, jornada, horario), con los
+    horarios heredados ya resueltos.
+    """
+    anterior = None
+    for numero in range(dias):
+        fecha = inicio + timedelta(days=numero)
+        jornada = plan[fecha.weekday()]
+        if jornada is None:
+            continue
+        anterior = jornada.horario(anterior)
+        yield numero, fecha, jornada, anterior
+
+
+def _resumir_dias(resultados, dias):
+    """
+    Resumen de cada réplica de un lote (un día simulado cada una), en el orden de dias.
+    """
+    registro = resultados.registro
+    replica = registro["replica"]
+    atendido = registro["resultado"] == ATENDIDO
+    espera = (registro["salida"] - registro["llegada"]).astype(float)
+    limites = np.searchsorted(replica, np.arange(len(dias) + 1))  # Las filas del registro están por réplica
+    costos = resultados.calcular_costo()
+
+    resumenes = []
+    for k, (numero, fecha, jornada, horario) in enumerate(dias):
+        filas = slice(limites[k], limites[k + 1])
+        esperas = espera[filas][atendido[filas]]
+        cuantiles = np.percentile(esperas, (50, 90, 95)) if esperas.size else (math.nan,) * 3
+        resumenes.append({
+            "dia": numero,
+            "fecha": fecha.isoformat(),
+            "dia_semana": DIAS_SEMANA[fecha.weekday()],
+            "duracion": jornada.perfil.duracion,
+            "llegadas": int(limites[k + 1] - limites[k]),
+            "atendidos": int(resultados.clientes_atendidos[k]),
+            "abandonados": int(resultados.clientes_abandonados[k]),
+            "horas_box": float(resultados.horas_box[k]),
+            "costo": float(costos[k]),
+            "espera_media": float(esperas.mean()) if esperas.size else math.nan,
+            "espera_p50": float(cuantiles[0]),
+            "espera_p90": float(cuantiles[1]),
+            "espera_p95": float(cuantiles[2]),
+            "espera_max": float(esperas.max()) if esperas.size else math.nan,
+            "boxes_max": max(horario),
+        })
+    # JSON estricto: las esperas de un día sin atendidos van como null en lugar de NaN
+    return [{clave: None if isinstance(valor, float) and math.isnan(valor) else valor for clave, valor in resumen.items()}
+            for resumen in resumenes]
+
+
+def simular_periodo(plan, inicio, dias, ruta, semilla=None, atencion=None, dias_por_bloque=56):
+    """
+    Simula dias días desde inicio según el plan semanal y agrega una línea JSON por día abierto a
+    ruta (JSONL) a medida que se simulan.
+
+    Los días se simulan en bloques de dias_por_bloque: dentro de un bloque, los que comparten
+    perfil y horario van juntos en un mismo simular_lote. Al terminar cada bloque se escriben sus
+    días en orden y se vacía el archivo, así la memoria no depende del horizonte y el archivo se
+    puede leer mientras se simula (ver leer_resumenes). El día número i usa siempre los mismos
+    flujos aleatorios, sin importar el tamaño del bloque.
+
+    Devuelve un resumen de todo el período (totales y costo diario medio).
+    """
+    semilla = entropia(semilla)
+    costo_diario = Momentos()
+    totales = {"dias_abiertos": 0, "llegadas": 0, "atendidos": 0, "abandonados": 0, "costo": 0.0}
+    peor = None
+    dias_calendario = calendario(plan, inicio, dias)
+
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        while True:
+            bloque = [dia for _, dia in zip(range(dias_por_bloque), dias_calendario)]
+            if not bloque:
+                break
+
+            # 1. Agrupar los días del bloque que se pueden simular juntos
+            grupos = {}
+            for dia in bloque:
+                _, _, jornada, horario = dia
+                grupos.setdefault((id(jornada.perfil), horario), []).append(dia)
+
+            # 2. Simular cada grupo en lote
+            resumenes = []
+            for (_, horario), dias_grupo in grupos.items():
+                flujos = [FlujosReplica(semilla_replica(semilla, numero)) for numero, *_ in dias_grupo]
+                resultados = simular_lote(None, len(dias_grupo), perfil=dias_grupo[0][2].perfil, muestreador=atencion,
+                                          flujos=flujos, registrar=True, horario=horario)
+                resumenes.extend(_resumir_dias(resultados, dias_grupo))
+
+            # 3. Escribir los días en orden y acumular el período
+            for resumen in sorted(resumenes, key=lambda r: r["dia"]):
+                archivo.write(json.dumps(resumen, ensure_ascii=False, allow_nan=False) + "\n")
+                totales["dias_abiertos"] += 1
+                for clave in ("llegadas", "atendidos", "abandonados", "costo"):
+                    totales[clave] += resumen[clave]
+                costo_diario.agregar(resumen["costo"])
+                if peor is None or resumen["costo"] > peor["costo"]:
+                    peor = resumen
+            archivo.flush()
+
+    totales["costo_diario_medio"] = costo_diario.media
+    totales["costo_diario_desvio"] = costo_diario.desvio()
+    totales["peor_dia"] = None if peor is None else peor["fecha"]
+    totales["costo_peor_dia"] = None if peor is None else peor["costo"]
+    return totales
+
+
+def leer_resumenes(ruta):
+    """
+    Lee los resúmenes diarios de ruta, también mientras la simulación los sigue escribiendo (una
+    última línea incompleta se ignora).
+    """
+    resumenes = []
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea in archivo:
+            if not linea.endswith("\n"):
+                break
+            resumenes.append(json.loads(linea))
+    return resumenes
+
+
+def imprimir_periodo(resumenes):
+    """
+    Totales por día de la semana de una lista de resúmenes diarios.
+    """
+    print(f"\n{'Día':<10} {'Días':>5} {'Llegadas':>9} {'Atendidos':>10} {'Abandonos':>10} {'Costo medio':>12} {'Espera p90 (min)':>17}")
+    for nombre in DIAS_SEMANA:
+        dias = [r for r in resumenes if r["dia_semana"] == nombre]
+        if not dias:
+            continue
+        p90 = np.nanmean(np.array([r["espera_p90"] for r in dias], dtype=float)) / 60  # null -> NaN
+        print(f"{nombre:<10} {len(dias):>5} {sum(r['llegadas'] for r in dias):>9} {sum(r['atendidos'] for r in dias):>10} "
+              f"{sum(r['abandonados'] for r in dias):>10} {np.mean([r['costo'] for r in dias]):>12.0f} {p90:>17.1f}")
+    if resumenes:
+        print(f"\n{len(resumenes)} días, del {resumenes[0]['fecha']} al {resumenes[-1]['fecha']}: "
+              f"costo total ${sum(r['costo'] for r in resumenes):.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simula semanas, meses o años de operación y guarda un resumen por día.")
+    parser.add_argument("--plan", choices=sorted(PLANES), default="tp8")
+    parser.add_argument("--inicio", type=date.fromisoformat, default=date(2025, 1, 6), help="Primer día (AAAA-MM-DD)")
+    parser.add_argument("--dias", type=int, default=365)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--salida", default="dias.jsonl")
+    parser.add_argument("--leer", action="store_true", help="Solo resumir el archivo --salida (aunque se siga escribiendo)")
+    args = parser.parse_args()
+
+    if not args.leer:
+        inicio = time.perf_counter()
+        totales = simular_periodo(PLANES[args.plan], args.inicio, args.dias, args.salida, args.semilla)
+        print(f"{args.dias} días simulados en {time.perf_counter() - inicio:.2f} s ({os.path.getsize(args.salida)} bytes en {args.salida})")
+        for clave, valor in totales.items():
+            print(f"{clave}: {valor}")
+    imprimir_periodo(leer_resumenes(args.salida))
@@ -0,0 +1,349 @@
+import argparse
+import math
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from llegadas import PERFIL_TP7, PERFIL_TP8, PerfilTramos
+from semillas import entropia, semilla_replica
+from simulacion import Local
+
+PERFILES_RED = {"tp7": PERFIL_TP7, "tp8": PERFIL_TP8}
+TRASLADO_MINIMO = 300  # Segundos que tarda un cliente derivado en llegar al local más próximo
+VELOCIDAD = 30 / 3600  # Kilómetros por segundo (30 km/h)
+
+
+class Red:
+    """
+    Locales de la red: posición (en kilómetros), cantidad de boxes y perfil de llegadas de cada uno.
+    Todos abren y cierran a la misma hora (el reloj es común).
+
+    Los vecinos de un local son los que están a menos de radio kilómetros, del más cercano al más
+    lejano; un cliente derivado tarda TRASLADO_MINIMO más la distancia a VELOCIDAD en llegar.
+    """
+    def __init__(self, posiciones, boxes, perfiles, radio=5.0, apertura=8 * 3600):
+        self.posiciones = np.asarray(posiciones, dtype=float)
+        self.boxes = [int(b) for b in boxes]
+        self.perfiles = list(perfiles)
+        self.radio = radio
+        self.apertura = apertura
+        self.duracion = self.perfiles[0].duracion
+        if any(perfil.duracion != self.duracion for perfil in self.perfiles):
+            raise ValueError("Todos los locales de la red deben tener la misma duración del día")
+
+        distancias = np.hypot(*(self.posiciones[:, None, :] - self.posiciones[None, :, :]).transpose(2, 0, 1))
+        self.vecinos = []
+        self.traslados = []  # Segundos hasta cada vecino, en el mismo orden
+        for i, fila in enumerate(distancias):
+            cercanos = [j for j in np.argsort(fila, kind="stable") if j != i and fila[j] <= radio]
+            self.vecinos.append(cercanos)
+            self.traslados.append([TRASLADO_MINIMO + math.ceil(fila[j] / VELOCIDAD) for j in cercanos])
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def ventana(self):
+        """
+        Segundos que se pueden simular los locales sin mirar a los demás: un cliente derivado nunca
+        llega antes que el traslado más corto.
+        """
+        return min((min(traslados) for traslados in self.traslados if traslados), default=self.duracion)
+
+
+def red_aleatoria(sitios, lado=20.0, modelo="tp8", boxes_base=5, radio=5.0, semilla=None):
+    """
+    Red de sitios locales repartidos al azar en un cuadrado de lado kilómetros. Cada local recibe
+    el perfil del modelo con las probabilidades de llegada multiplicadas por un factor lognormal
+    (locales más y menos concurridos) y boxes_base boxes escalados por el mismo factor.
+    """
+    rng = np.random.default_rng(semilla)
+    posiciones = rng.uniform(0, lado, size=(sitios, 2))
+    factores = rng.lognormal(0, 0.35, size=sitios)
+    base = PERFILES_RED[modelo]
+    perfiles = [PerfilTramos([(desde, hasta, min(prob * factor, 1.0)) for desde, hasta, prob in base.tramos], base.duracion)
+                for factor in factores]
+    boxes = np.maximum(1, np.rint(boxes_base * factores)).astype(int)
+    return Red(posiciones, boxes, perfiles, radio)
+
+
+class Politica:
+    """
+    Decide a qué local derivar a un cliente que llega cuando la cola tiene al menos umbral clientes.
+
+    destino recibe el largo de la cola del local al momento de la llegada y el de los demás al
+    comienzo de la ventana en curso (ver simular_red), y devuelve el índice del local elegido o
+    None para que el cliente se quede.
+    """
+    def __init__(self, umbral=10):
+        self.umbral = umbral
+
+    def destino(self, red, origen, largo, largos, rng):
+        raise NotImplementedError
+
+
+class ColaMasCorta(Politica):
+    """
+    Deriva al vecino con menos clientes esperando por box, si tiene menos que el local de origen.
+    """
+    def destino(self, red, origen, largo, largos, rng):
+        mejor = None
+        carga = largo / red.boxes[origen]
+        for vecino in red.vecinos[origen]:
+            carga_vecino = largos[vecino] / red.boxes[vecino]
+            if carga_vecino < carga:
+                mejor, carga = vecino, carga_vecino
+        return mejor
+
+
+class MasCercano(Politica):
+    """
+    Deriva siempre al vecino más cercano.
+    """
+    def destino(self, red, origen, largo, largos, rng):
+        vecinos = red.vecinos[origen]
+        return vecinos[0] if vecinos else None
+
+
+class Aleatoria(Politica):
+    """
+    Deriva a un vecino elegido al azar.
+    """
+    def destino(self, red, origen, largo, largos, rng):
+        vecinos = red.vecinos[origen]
+        return vecinos[rng.integers(len(vecinos))] if vecinos else None
+
+
+POLITICAS = {"cola_corta": ColaMasCorta, "cercano": MasCercano, "aleatoria": Aleatoria}
+
+
+def crear_politica(nombre, umbral=10):
+    """
+    Crea una política de derivación por nombre (None o "ninguna": cada local atiende a sus clientes).
+    """
+    if nombre is None or nombre == "ninguna":
+        return None
+    if nombre not in POLITICAS:
+        raise ValueError(f"Política de derivación desconocida: {nombre}")
+    return POLITICAS[nombre](umbral)
+
+
+class Particion:
+    """
+    Locales de la red que simula un mismo proceso, avanzados de ventana en ventana.
+
+    El local i usa los flujos de la réplica i de semilla (y un generador propio para las políticas
+    al azar), así el resultado no depende de cómo se repartan los locales entre procesos.
+    """
+    def __init__(self, red, indices, politica, semilla):
+        self.red = red
+        self.politica = politica
+        self.locales = {}
+        self.derivados = dict.fromkeys(indices, 0)
+        self.recibidos = dict.fromkeys(indices, 0)
+        self.largos = np.zeros(len(red), dtype=np.int64)  # Largo de las colas al comienzo de la ventana
+        self.salientes = []  # (destino, llegada, orden, tiempo_atencion, paciencia) de la ventana en curso
+        for i in indices:
+            local = Local(red.boxes[i], perfil=red.perfiles[i], apertura=red.apertura, semilla=semilla_replica(semilla, i))
+            local.iniciar()
+            if politica is not None:
+                local.motor_eventos.derivar = self._derivador(i, local)
+            self.locales[i] = local
+
+    def _derivador(self, origen, local):
+        politica = self.politica
+        red = self.red
+        cola = local.cola
+        cierre = local.tiempo_fin_operacion
+        rng = local.flujos.derivacion()
+        traslados = dict(zip(red.vecinos[origen], red.traslados[origen]))
+
+        def derivar(tiempo, tiempo_atencion, paciencia):
+            largo = len(cola)
+            if largo < politica.umbral:
+                return False
+            destino = politica.destino(red, origen, largo, self.largos, rng)
+            if destino is None or tiempo + traslados[destino] >= cierre:
+                return False
+            self.salientes.append((destino, tiempo + traslados[destino], (origen, self.derivados[origen]), tiempo_atencion, paciencia))
+            self.derivados[origen] += 1
+            return True
+        return derivar
+
+    def avanzar(self, hasta, largos, entrantes):
+        """
+        Recibe los clientes derivados a estos locales y simula hasta el segundo hasta (ver resultado).
+        """
+        self.largos = largos
+        for destino, llegada, orden, tiempo_atencion, paciencia in entrantes:
+            self.locales[destino].motor_eventos.recibir(llegada, orden, tiempo_atencion, paciencia)
+            self.recibidos[destino] += 1
+        for local in self.locales.values():
+            local.avanzar_hasta(hasta)
+
+    def resultado(self):
+        """
+        Devuelve los clientes derivados a otros locales durante la última ventana y el largo de la
+        cola de cada local propio.
+        """
+        salientes, self.salientes = self.salientes, []
+        return salientes, {i: len(local.cola) for i, local in self.locales.items()}
+
+    def terminar(self):
+        """
+        Cierra el día de cada local y devuelve su resumen.
+        """
+        sitios = []
+        for i, local in self.locales.items():
+            local.terminar()
+            resumen = local.estadisticas.resumen()
+            sitios.append({
+                "sitio": i,
+                "boxes": local.cantidad_boxes,
+                "llegadas": sum(resumen["llegadas_por_tramo"]) - self.recibidos[i] + self.derivados[i],
+                "derivados": self.derivados[i],
+                "recibidos": self.recibidos[i],
+                "atendidos": local.clientes_atendidos,
+                "abandonados": local.clientes_abandonados,
+                "espera_media": resumen["espera_media"],
+                "costo": local.calcular_costo(),
+            })
+        return sitios
+
+
+def _trabajar(conexion, red, indices, politica, semilla):
+    """
+    Proceso de una partición: avanza sus locales cada vez que recibe una ventana.
+    """
+    particion = Particion(red, indices, politica, semilla)
+    while True:
+        mensaje = conexion.recv()
+        if mensaje is None:
+            conexion.send(particion.terminar())
+            conexion.close()
+            return
+        particion.avanzar(*mensaje)
+        conexion.send(particion.resultado())
+
+
+class ParticionRemota:
+    """
+    Particion simulada en otro proceso, con la misma interfaz. avanzar no espera: el proceso
+    simula la ventana mientras se avanzan las demás particiones, y resultado espera su respuesta.
+    """
+    def __init__(self, red, indices, politica, semilla):
+        self.conexion, remota = multiprocessing.Pipe()
+        self.proceso = multiprocessing.Process(target=_trabajar, args=(remota, red, indices, politica, semilla), daemon=True)
+        self.proceso.start()
+        remota.close()
+
+    def avanzar(self, hasta, largos, entrantes):
+        self.conexion.send((hasta, largos, entrantes))
+
+    def resultado(self):
+        return self.conexion.recv()
+
+    def terminar(self):
+        self.conexion.send(None)
+        sitios = self.conexion.recv()
+        self.proceso.join()
+        return sitios
+
+
+def particionar(red, partes):
+    """
+    Reparte los locales en partes con una carga esperada (llegadas del día) parecida.
+    """
+    cargas = [perfil.llegadas_esperadas() for perfil in red.perfiles]
+    particiones = [[] for _ in range(partes)]
+    totales = [0.0] * partes
+    for i in sorted(range(len(red)), key=lambda i: -cargas[i]):
+        menor = totales.index(min(totales))
+        particiones[menor].append(i)
+        totales[menor] += cargas[i]
+    return [sorted(indices) for indices in particiones if indices]
+
+
+def simular_red(red, politica=None, semilla=None, procesos=None):
+    """
+    Simula un día de todos los locales de la red con un reloj común.
+
+    Los locales se reparten entre procesos y avanzan juntos de a ventanas (ver Red.ventana): como
+    un cliente derivado tarda al menos una ventana en llegar, en cada ventana los procesos simulan
+    sin comunicarse y al final solo intercambian los clientes derivados y el largo de las colas,
+    que es lo que ven las políticas durante la ventana siguiente.
+
+    Devuelve el resumen de cada local, en orden.
+    """
+    semilla = entropia(semilla)
+    procesos = min(procesos or os.cpu_count(), len(red))
+    indices = particionar(red, procesos)
+    duenos = {i: k for k, propios in enumerate(indices) for i in propios}
+    tipo = Particion if len(indices) == 1 else ParticionRemota
+    particiones = [tipo(red, propios, politica, semilla) for propios in indices]
+
+    largos = np.zeros(len(red), dtype=np.int64)
+    entrantes = [[] for _ in particiones]
+    cierre = red.apertura + red.duracion
+    ventana = red.ventana()
+    for hasta in range(red.apertura + ventana, cierre + ventana, ventana):
+        # 1. Mandar a cada partición sus clientes recibidos y el estado de las colas, y simular la ventana
+        for particion, recibidos in zip(particiones, entrantes):
+            particion.avanzar(min(hasta, cierre), largos, recibidos)
+
+        # 2. Repartir los clientes derivados y actualizar los largos para la ventana siguiente
+        largos = largos.copy()
+        entrantes = [[] for _ in particiones]
+        for particion in particiones:
+            salientes, largos_particion = particion.resultado()
+            for saliente in salientes:
+                entrantes[duenos[saliente[0]]].append(saliente)
+            for i, largo in largos_particion.items():
+                largos[i] = largo
+
+    sitios = [sitio for particion in particiones for sitio in particion.terminar()]
+    return sorted(sitios, key=lambda sitio: sitio["sitio"])
+
+
+def resumir_red(sitios):
+    """
+    Totales de la red a partir del resumen de cada local.
+    """
+    totales = {clave: sum(sitio[clave] for sitio in sitios)
+               for clave in ("boxes", "llegadas", "derivados", "atendidos", "abandonados", "costo")}
+    totales["sitios"] = len(sitios)
+    return totales
+
+
+def imprimir_red(sitios, peores=10):
+    """
+    Imprime los locales de mayor costo y los totales de la red.
+    """
+    print(f"\n{'Local':>5} {'Boxes':>5} {'Llegadas':>9} {'Derivados':>10} {'Recibidos':>10} {'Atendidos':>10} "
+          f"{'Abandonos':>10} {'Espera (min)':>13} {'Costo':>9}")
+    for sitio in sorted(sitios, key=lambda sitio: -sitio["costo"])[:peores]:
+        print(f"{sitio['sitio']:>5} {sitio['boxes']:>5} {sitio['llegadas']:>9} {sitio['derivados']:>10} {sitio['recibidos']:>10} "
+              f"{sitio['atendidos']:>10} {sitio['abandonados']:>10} {sitio['espera_media'] / 60:>13.1f} {sitio['costo']:>9.0f}")
+    totales = resumir_red(sitios)
+    print(f"\n{totales['sitios']} locales, {totales['boxes']} boxes: {totales['llegadas']} llegadas, {totales['derivados']} derivadas, "
+          f"{totales['atendidos']} atendidos, {totales['abandonados']} abandonos, costo total ${totales['costo']:.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simula un día de una red de locales que se derivan clientes cuando la cola es larga.")
+    parser.add_argument("--sitios", type=int, default=200)
+    parser.add_argument("--modelo", choices=sorted(PERFILES_RED), default="tp8")
+    parser.add_argument("--politica", choices=["ninguna"] + sorted(POLITICAS), default="cola_corta")
+    parser.add_argument("--umbral", type=int, default=10, help="Largo de la cola desde el que se deriva a los clientes")
+    parser.add_argument("--radio", type=float, default=5.0, help="Distancia máxima a un local vecino (km)")
+    parser.add_argument("--lado", type=float, default=20.0, help="Lado del cuadrado donde están los locales (km)")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--procesos", type=int, default=None)
+    args = parser.parse_args()
+
+    red = red_aleatoria(args.sitios, args.lado, args.modelo, radio=args.radio, semilla=args.semilla)
+    inicio = time.perf_counter()
+    sitios = simular_red(red, crear_politica(args.politica, args.umbral), args.semilla, args.procesos)
+    print(f"{args.sitios} locales simulados en {time.perf_counter() - inicio:.2f} s (ventanas de {red.ventana()} s)")
+    imprimir_red(sitios)
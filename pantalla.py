@@ -0,0 +1,196 @@
+from collections import OrderedDict
+
+from simulacion import COSTO_ABANDONO, COSTO_BOX
+
+# Disposición de la pantalla (en píxeles)
+TAMANOS = {"tp7": (1200, 600), "tp8": (1200, 800)}  # Tamaño de la ventana de cada modelo (ancho, alto)
+X_BOXES = 525
+Y_BOXES = 50
+LADO_BOX = 50
+SEPARACION_BOXES = 60
+Y_ETIQUETA_BOX = 25
+X_COLA = 650
+Y_COLA = 150
+RADIO_CLIENTE = 15
+SEPARACION_COLA = 2 * RADIO_CLIENTE + 10
+X_TEXTOS = 50
+Y_TEXTOS = 150
+INTERLINEA = 30
+
+# Colores en RGB
+BLANCO = (255, 255, 255)
+NEGRO = (0, 0, 0)
+ROJO = (255, 0, 0)
+VERDE = (0, 255, 0)
+AZUL = (0, 0, 255)
+
+ETIQUETAS = (
+    "Hora: ",
+    "Cantidad de clientes Ingresados: ",
+    "Cantidad de clientes Atendidos: ",
+    "Cantidad de clientes Perdidos: ",
+    "Tiempo máximo de atención: ",
+    "Tiempo mínimo de atención: ",
+    "Tiempo máximo de espera: ",
+    "Tiempo mínimo de espera: ",
+    "Costo de tener abiertos los boxes: ",
+    "Costo de los clientes perdidos: ",
+    "Costo operacional total: ",
+)
+
+
+def clientes_visibles(alto):
+    """
+    Cuántos clientes de la cola entran en una pantalla del alto indicado.
+    """
+    return max(0, (alto - Y_COLA + RADIO_CLIENTE) // SEPARACION_COLA + 1)
+
+
+def formatear_duracion(segundos):
+    # Pasa los segundos a minutos y segundos solo si es mayor a 60 segundos
+    if segundos >= 60:
+        return f"{segundos // 60} minutos y {segundos % 60:.0f} segundos"
+    return f"{segundos:.0f} segundos"
+
+
+def formatear_hora(modelo, tiempo_actual):
+    if modelo == "tp7":
+        # tp7 cuenta el tiempo desde 0 (las 8:00)
+        return f"{tiempo_actual // 3600 + 8:02.0f}:{(tiempo_actual % 3600) // 60 + 1:02.0f}"
+    return f"{tiempo_actual // 3600:02.0f}:{(tiempo_actual % 3600) // 60:02.0f}"
+
+
+def valores_estadisticas(modelo, cantidad_boxes, tiempo_actual, atendidos, abandonados,
+                         min_atencion, max_atencion, min_espera, max_espera, costo_box=COSTO_BOX,
+                         costo_abandono=COSTO_ABANDONO):
+    """
+    Texto de cada dato del panel izquierdo, en el orden de ETIQUETAS.
+    """
+    if modelo == "tp8" and atendidos == 0:
+        # tp8 deja los tiempos vacíos hasta que termina la primera atención
+        tiempos = ("", "", "", "")
+    else:
+        tiempos = tuple(formatear_duracion(valor) for valor in (max_atencion, min_atencion, max_espera, min_espera))
+    return (
+        formatear_hora(modelo, tiempo_actual),
+        str(atendidos + abandonados),
+        str(atendidos),
+        str(abandonados),
+        *tiempos,
+        str(cantidad_boxes * costo_box),
+        str(abandonados * costo_abandono),
+        str(cantidad_boxes * costo_box + abandonados * costo_abandono),
+    )
+
+
+class CacheTextos:
+    """
+    Superficies de texto ya renderizadas, por texto, descartando las menos usadas recientemente.
+    """
+    def __init__(self, fuente, color=NEGRO, capacidad=256):
+        self.fuente = fuente
+        self.color = color
+        self.capacidad = capacidad
+        self.superficies = OrderedDict()
+
+    def __call__(self, texto):
+        superficie = self.superficies.get(texto)
+        if superficie is not None:
+            self.superficies.move_to_end(texto)
+            return superficie
+        superficie = self.fuente.render(texto, True, self.color)
+        self.superficies[texto] = superficie
+        if len(self.superficies) > self.capacidad:
+            self.superficies.popitem(last=False)
+        return superficie
+
+
+class Pantalla:
+    """
+    Dibuja el estado del Local con pygame repintando solo lo que cambió desde el frame anterior.
+
+    Las fuentes se crean una sola vez, las etiquetas fijas (nombres de los boxes y títulos de los
+    datos) se dibujan al crear la pantalla y los valores salen de un CacheTextos. Cada frame
+    actualiza en la ventana solo los rectángulos modificados.
+    """
+    def __init__(self, superficie, modelo, cantidad_boxes, capacidad_textos=256):
+        import pygame
+
+        self.pygame = pygame
+        self.superficie = superficie
+        self.modelo = modelo
+        self.cantidad_boxes = cantidad_boxes
+        self.max_cola = clientes_visibles(superficie.get_height())
+        self.textos = CacheTextos(pygame.font.SysFont(None, 23), capacidad=capacidad_textos)
+
+        # Estado dibujado en el frame anterior
+        self.boxes_ocupados = [None] * cantidad_boxes
+        self.largo_cola = 0
+        self.valores = [None] * len(ETIQUETAS)
+        self.rect_valores = [None] * len(ETIQUETAS)
+
+        # Partes fijas: fondo, nombres de los boxes y etiquetas de los datos
+        superficie.fill(BLANCO)
+        fuente_boxes = pygame.font.SysFont(None, 20)
+        for i in range(cantidad_boxes):
+            text = fuente_boxes.render(f"Box {i + 1}", True, NEGRO)
+            superficie.blit(text, text.get_rect(center=(X_BOXES + i * SEPARACION_BOXES + LADO_BOX // 2, Y_ETIQUETA_BOX)))
+        self.x_valores = []
+        for i, etiqueta in enumerate(ETIQUETAS):
+            rect = superficie.blit(self.textos.fuente.render(etiqueta, True, NEGRO), (X_TEXTOS, Y_TEXTOS + i * INTERLINEA))
+            self.x_valores.append(rect.right)
+        self.sucios = [superficie.get_rect()]  # El primer frame se muestra completo
+
+    def dibujar(self, local, tiempo_actual):
+        """
+        Dibuja el estado actual del local y actualiza los rectángulos de la ventana que cambiaron.
+        """
+        self._dibujar_boxes(local.boxes)
+        self._dibujar_cola(len(local.cola))
+        valores = valores_estadisticas(
+            self.modelo, self.cantidad_boxes, tiempo_actual, local.clientes_atendidos, local.clientes_abandonados,
+            local.tiempo_min_atencion, local.tiempo_max_atencion, local.tiempo_min_espera, local.tiempo_max_espera,
+            local.costo_box, local.costo_abandono,
+        )
+        self._dibujar_valores(valores)
+        if self.sucios:
+            self.pygame.display.update(self.sucios)
+            self.sucios = []
+
+    def _dibujar_boxes(self, boxes):
+        draw = self.pygame.draw
+        for i, box in enumerate(boxes):
+            if box.ocupado == self.boxes_ocupados[i]:
+                continue
+            self.boxes_ocupados[i] = box.ocupado
+            x = X_BOXES + i * SEPARACION_BOXES
+            color = ROJO if box.ocupado else VERDE
+            self.sucios.append(draw.rect(self.superficie, color, (x, Y_BOXES, LADO_BOX, LADO_BOX)))
+            if box.ocupado:
+                draw.circle(self.superficie, AZUL, (x + LADO_BOX // 2, Y_BOXES + LADO_BOX // 2), RADIO_CLIENTE)
+
+    def _dibujar_cola(self, largo):
+        largo = min(largo, self.max_cola)
+        if largo == self.largo_cola:
+            return
+        # Solo cambian los lugares entre el largo anterior y el nuevo
+        desde, hasta = min(largo, self.largo_cola), max(largo, self.largo_cola)
+        rect = self.pygame.Rect(X_COLA - RADIO_CLIENTE, Y_COLA + desde * SEPARACION_COLA - RADIO_CLIENTE,
+                                2 * RADIO_CLIENTE, (hasta - desde) * SEPARACION_COLA)
+        self.superficie.fill(BLANCO, rect)
+        for i in range(desde, largo):
+            self.pygame.draw.circle(self.superficie, AZUL, (X_COLA, Y_COLA + i * SEPARACION_COLA), RADIO_CLIENTE)
+        self.sucios.append(rect)
+        self.largo_cola = largo
+
+    def _dibujar_valores(self, valores):
+        for i, valor in enumerate(valores):
+            if valor == self.valores[i]:
+                continue
+            self.valores[i] = valor
+            anterior = self.rect_valores[i]
+            if anterior is not None:
+                self.superficie.fill(BLANCO, anterior)
+            rect = self.superficie.blit(self.textos(valor), (self.x_valores[i], Y_TEXTOS + i * INTERLINEA))
+            self.rect_valores[i] = rect
+            self.sucios.append(rect if anterior is None else rect.union(anterior))
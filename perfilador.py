@@ -0,0 +1,120 @@
+import json
+import time
+
+# Fases de cada segundo simulado, en el orden en que las procesan los motores
+FASES = ("llegadas", "asignacion", "boxes", "cola", "observacion")
+LLEGADAS, ASIGNACION, BOXES, COLA, OBSERVACION = range(len(FASES))
+
+
+class Perfilador:
+    """
+    Tiempo acumulado en cada fase de la simulación y contadores del día simulado.
+
+    Los motores llaman a marcar al empezar cada fase y con None al terminar el segundo. Un Local
+    sin perfilador no mide nada: cada fase cuesta solo una comparación con None. Con traza, además
+    se guarda cada tramo de al menos minimo_traza nanosegundos para exportarlo en el formato de
+    Chrome trace (chrome://tracing o ui.perfetto.dev).
+    """
+    def __init__(self, traza=False, minimo_traza=1000):
+        self.tiempos = [0] * len(FASES)  # Nanosegundos acumulados en cada fase
+        self.llamadas = [0] * len(FASES)
+        self.largo_cola_max = 0
+        self.frames = 0  # Veces que se dibujó (o se observó) el estado
+        self.contadores = {}
+        self.total = 0  # Nanosegundos de toda la simulación, incluida la preparación
+        self.tramos = [] if traza else None  # (fase, inicio, duración) en nanosegundos
+        self.minimo_traza = minimo_traza
+        self._fase = None
+        self._desde = 0
+        self._inicio = time.perf_counter_ns()
+
+    def iniciar(self):
+        self._inicio = time.perf_counter_ns()
+
+    def marcar(self, fase, largo_cola=0):
+        """
+        Termina la fase en curso y empieza fase (None si no empieza ninguna). largo_cola es el largo
+        de la cola en este momento, para su máximo.
+        """
+        ahora = time.perf_counter_ns()
+        if self._fase is not None:
+            duracion = ahora - self._desde
+            self.tiempos[self._fase] += duracion
+            self.llamadas[self._fase] += 1
+            if self.tramos is not None and duracion >= self.minimo_traza:
+                self.tramos.append((self._fase, self._desde, duracion))
+        if largo_cola > self.largo_cola_max:
+            self.largo_cola_max = largo_cola
+        self._fase = fase
+        self._desde = ahora
+
+    def observador(self, al_observar):
+        """
+        Envuelve al_observar (por ejemplo, actualizar_pantalla) para contar los frames.
+        """
+        def observar(tiempo_actual):
+            self.frames += 1
+            al_observar(tiempo_actual)
+        return observar
+
+    def cerrar(self, local):
+        """
+        Termina la medición y toma los contadores de la cola y del local al cierre.
+        """
+        self.marcar(None)
+        self.total = time.perf_counter_ns() - self._inicio
+        cola = local.cola
+        abandonos_box = local.clientes_abandonados - cola.abandonados - len(cola)
+        self.contadores = {
+            "segundos_procesados": self.llamadas[LLEGADAS],
+            "llegadas": cola.ingresados,
+            "extracciones_cola": cola.atendidos,  # Clientes sacados del frente de la cola hacia un box
+            "salidas_box": local.clientes_atendidos + abandonos_box,
+            "abandonos_cola": cola.abandonados,
+            "largo_cola_max": self.largo_cola_max,
+            "frames": self.frames,
+        }
+        self.contadores["eventos"] = (self.contadores["llegadas"] + self.contadores["extracciones_cola"]
+                                      + self.contadores["salidas_box"] + self.contadores["abandonos_cola"])
+
+    def resumen(self):
+        """
+        Devuelve las filas (fase, milisegundos, porcentaje del total, llamadas, microsegundos por
+        llamada); "otros" es el tiempo fuera de las fases (preparación y avance entre eventos).
+        """
+        filas = []
+        for fase, tiempo, llamadas in zip(FASES, self.tiempos, self.llamadas):
+            filas.append((fase, tiempo / 1e6, 100 * tiempo / max(self.total, 1), llamadas, tiempo / 1e3 / max(llamadas, 1)))
+        otros = self.total - sum(self.tiempos)
+        filas.append(("otros", otros / 1e6, 100 * otros / max(self.total, 1), 0, 0.0))
+        return filas
+
+    def imprimir(self):
+        print(f"\n{'Fase':<12} {'Tiempo (ms)':>12} {'%':>6} {'Llamadas':>10} {'µs/llamada':>11}")
+        for fase, milisegundos, porcentaje, llamadas, por_llamada in self.resumen():
+            print(f"{fase:<12} {milisegundos:>12.2f} {porcentaje:>6.1f} {llamadas:>10} {por_llamada:>11.2f}")
+        print(f"{'total':<12} {self.total / 1e6:>12.2f}")
+        print("\n" + ", ".join(f"{nombre}: {valor}" for nombre, valor in self.contadores.items()))
+
+    def informar(self, ruta_traza=None):
+        """
+        Imprime el resumen y, si se indica ruta_traza, exporta la traza.
+        """
+        self.imprimir()
+        if ruta_traza is not None:
+            self.exportar_traza(ruta_traza)
+            print(f"Traza guardada en {ruta_traza}")
+
+    def exportar_traza(self, ruta):
+        """
+        Guarda los tramos en ruta como JSON de Chrome trace (requiere traza=True).
+        """
+        if self.tramos is None:
+            raise ValueError("El perfilador no guardó la traza; crearlo con traza=True")
+        eventos = [{"name": "simular", "cat": "simulacion", "ph": "X", "ts": 0, "dur": self.total / 1e3, "pid": 1, "tid": 1}]
+        eventos.extend(
+            {"name": FASES[fase], "cat": "fase", "ph": "X", "ts": (desde - self._inicio) / 1e3, "dur": duracion / 1e3, "pid": 1, "tid": 1}
+            for fase, desde, duracion in self.tramos
+        )
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms", "otherData": self.contadores}, archivo)
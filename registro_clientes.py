@@ -0,0 +1,221 @@
+import argparse
+import struct
+
+import numpy as np
+
+# Resultado de cada cliente
+SIN_TERMINAR = 0  # Seguía en un box al cierre
+ATENDIDO = 1
+ABANDONO = 2  # Abandonó en la cola, en el box o al cierre
+
+# Columnas del registro y su tipo
+COLUMNAS = {
+    "replica": np.int32,
+    "llegada": np.int64,
+    "vencimiento": np.int64,  # Último segundo que el cliente tolera desde su llegada
+    "inicio_atencion": np.int64,  # -1 si nunca pasó a un box
+    "duracion": np.float64,  # Tiempo de atención sorteado (NaN si nunca pasó a un box)
+    "salida": np.int64,  # -1 si seguía en un box al cierre
+    "resultado": np.int8,
+    "box": np.int16,  # -1 si nunca pasó a un box
+}
+VACIOS = {"inicio_atencion": -1, "duracion": np.nan, "salida": -1, "resultado": SIN_TERMINAR, "box": -1}
+
+
+class RegistroClientes:
+    """
+    Registro de todos los clientes de una o muchas réplicas, guardado por columnas en arrays de NumPy.
+
+    Cada cliente es una fila (su índice) y cada dato una columna de COLUMNAS; no se crea ningún
+    objeto por cliente. Las columnas se reservan de antemano y duplican su capacidad al llenarse.
+    Se guarda en .npz (sin comprimir) o .parquet y se vuelve a cargar mapeado en memoria.
+    """
+    def __init__(self, capacidad=1024):
+        self.n = 0
+        self.columnas = {nombre: np.full(capacidad, VACIOS.get(nombre, 0), dtype=tipo) for nombre, tipo in COLUMNAS.items()}
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, nombre):
+        """
+        Columna nombre de los clientes registrados (una vista, sin copiar).
+        """
+        return self.columnas[nombre][:self.n]
+
+    @classmethod
+    def desde_columnas(cls, **columnas):
+        """
+        Crea un registro con columnas ya calculadas (por ejemplo, las de simular_lote). Las columnas
+        que falten quedan vacías.
+        """
+        n = len(columnas["llegada"])
+        registro = cls(0)
+        registro.n = n
+        for nombre, tipo in COLUMNAS.items():
+            if nombre in columnas:
+                registro.columnas[nombre] = np.asarray(columnas[nombre], dtype=tipo)
+            else:
+                registro.columnas[nombre] = np.full(n, VACIOS.get(nombre, 0), dtype=tipo)
+        return registro
+
+    def _crecer(self):
+        capacidad = max(2 * len(self.columnas["llegada"]), 1024)
+        for nombre, columna in self.columnas.items():
+            nueva = np.full(capacidad, VACIOS.get(nombre, 0), dtype=columna.dtype)
+            nueva[:self.n] = columna[:self.n]
+            self.columnas[nombre] = nueva
+
+    def agregar(self, llegada, vencimiento, replica=0):
+        """
+        Registra la llegada de un cliente y devuelve su índice.
+        """
+        if self.n == len(self.columnas["llegada"]):
+            self._crecer()
+        indice = self.n
+        columnas = self.columnas
+        columnas["replica"][indice] = replica
+        columnas["llegada"][indice] = llegada
+        columnas["vencimiento"][indice] = vencimiento
+        self.n += 1
+        return indice
+
+    def iniciar_atencion(self, indice, tiempo, box, duracion):
+        columnas = self.columnas
+        columnas["inicio_atencion"][indice] = tiempo
+        columnas["box"][indice] = box
+        columnas["duracion"][indice] = duracion
+
+    def terminar(self, indice, tiempo, resultado):
+        """
+        Registra la salida de un cliente que estaba en un box (ATENDIDO o ABANDONO).
+        """
+        self.columnas["salida"][indice] = tiempo
+        self.columnas["resultado"][indice] = resultado
+
+    def cerrar(self, tiempo_cierre):
+        """
+        Completa a los clientes que nunca pasaron a un box: abandonaron al vencer su paciencia o,
+        si seguían esperando, al cierre.
+        """
+        sin_box = self["box"] < 0
+        self["salida"][sin_box] = np.minimum(self["vencimiento"][sin_box] + 1, tiempo_cierre)
+        self["resultado"][sin_box] = ABANDONO
+
+    def tiempos_espera(self):
+        """
+        Tiempo desde la llegada hasta la salida de los clientes atendidos.
+        """
+        atendidos = self["resultado"] == ATENDIDO
+        return self["salida"][atendidos] - self["llegada"][atendidos]
+
+    def llegadas_por_tramo(self, desde, duracion, ancho=1800):
+        """
+        Cantidad de llegadas de cada tramo de ancho segundos entre desde y desde + duracion.
+        """
+        tramos = -(-duracion // ancho)
+        return np.bincount(np.minimum((self["llegada"] - desde) // ancho, tramos - 1), minlength=tramos)
+
+    def resumen(self):
+        """
+        Devuelve los totales y tiempos de todos los clientes registrados, calculados por columnas.
+        """
+        resultado = self["resultado"]
+        espera = self.tiempos_espera()
+        duracion = self["duracion"][resultado == ATENDIDO]
+        return {
+            "replicas": int(np.unique(self["replica"]).size),
+            "clientes_ingresados": self.n,
+            "clientes_atendidos": int(np.count_nonzero(resultado == ATENDIDO)),
+            "clientes_abandonados": int(np.count_nonzero(resultado == ABANDONO)),
+            "espera_media": float(espera.mean()) if espera.size else float("nan"),
+            "espera_p90": float(np.percentile(espera, 90)) if espera.size else float("nan"),
+            "atencion_media": float(duracion.mean()) if duracion.size else float("nan"),
+        }
+
+    def guardar(self, ruta):
+        """
+        Guarda las columnas en ruta: Parquet si termina en .parquet (requiere pyarrow), si no .npz
+        (agregando la extensión si falta, igual que cargar). Devuelve la ruta del archivo.
+        """
+        ruta = ruta_archivo(ruta)
+        if ruta.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            pq.write_table(pa.table({nombre: self[nombre] for nombre in COLUMNAS}), ruta)
+        else:
+            # Sin comprimir, para poder mapear cada columna en memoria al cargarla
+            np.savez(ruta, **{nombre: self[nombre] for nombre in COLUMNAS})
+        return ruta
+
+    @classmethod
+    def cargar(cls, ruta):
+        """
+        Carga un registro guardado con guardar, con las columnas mapeadas en memoria (solo lectura).
+        """
+        ruta = ruta_archivo(ruta)
+        if ruta.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            tabla = pq.read_table(ruta, memory_map=True)
+            columnas = {nombre: tabla.column(nombre).to_numpy() for nombre in tabla.column_names}
+        else:
+            columnas = _mapear_npz(ruta)
+        return cls.desde_columnas(**columnas)
+
+
+def ruta_archivo(ruta):
+    """
+    Ruta del archivo de un registro: la misma si termina en .parquet o .npz, si no con .npz
+    agregado (como hace np.savez).
+    """
+    ruta = str(ruta)
+    return ruta if ruta.endswith((".parquet", ".npz")) else ruta + ".npz"
+
+
+def _mapear_npz(ruta):
+    """
+    Mapea en memoria cada array de un .npz sin comprimir (np.load ignora mmap_mode para .npz).
+    """
+    import zipfile
+
+    columnas = {}
+    with zipfile.ZipFile(ruta) as archivo, open(ruta, "rb") as f:
+        for info in archivo.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{ruta} está comprimido y no se puede mapear en memoria")
+            # Los datos empiezan después del encabezado local del zip y del encabezado .npy
+            f.seek(info.header_offset + 26)
+            largo_nombre, largo_extra = struct.unpack("<HH", f.read(4))
+            f.seek(largo_nombre + largo_extra, 1)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                forma, fortran, tipo = np.lib.format.read_array_header_1_0(f)
+            else:
+                forma, fortran, tipo = np.lib.format.read_array_header_2_0(f)
+            nombre = info.filename.removesuffix(".npy")
+            columnas[nombre] = np.memmap(ruta, dtype=tipo, mode="r", offset=f.tell(), shape=forma,
+                                         order="F" if fortran else "C")
+    return columnas
+
+
+if __name__ == "__main__":
+    from llegadas import PERFILES
+    from motor_vectorizado import simular_lote
+
+    parser = argparse.ArgumentParser(description="Simula muchos días y guarda el registro de todos los clientes.")
+    parser.add_argument("--modelo", choices=sorted(PERFILES), default="tp8")
+    parser.add_argument("--boxes", type=int, default=5)
+    parser.add_argument("--replicas", type=int, default=1000)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--salida", default="clientes.npz", help="Archivo .npz o .parquet")
+    args = parser.parse_args()
+
+    resultados = simular_lote(args.boxes, args.replicas, perfil=PERFILES[args.modelo],
+                              rng=np.random.default_rng(args.semilla), registrar=True)
+    ruta = resultados.registro.guardar(args.salida)
+    registro = RegistroClientes.cargar(ruta)
+    print(f"{ruta}: {len(registro)} clientes de {args.replicas} réplicas")
+    for clave, valor in registro.resumen().items():
+        print(f"{clave}: {valor}")
@@ -0,0 +1,233 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from barrido import comparar_con_mejor, dividir_tareas, resumir
+from llegadas import PERFILES
+from motor_vectorizado import ANCHO_TRAMO, simular_lote
+from muestreo_atencion import DISTRIBUCIONES_CLI
+from registro_clientes import ABANDONO
+from semillas import flujos_replicas
+from simulacion import COSTO_ABANDONO, COSTO_BOX
+
+PERCENTILES = (5, 25, 50, 75, 95)  # Bandas de los gráficos: 5-95, 25-75 y la mediana
+FORMATOS = ("png", "svg")
+
+
+def agregar_por_tramo(registro, replicas, duracion, ancho=ANCHO_TRAMO):
+    """
+    Resume el registro de un lote (simular_lote con registrar) por réplica y tramo de ancho
+    segundos desde la apertura, sin recorrer los clientes uno por uno: cada columna se cuenta con
+    np.bincount sobre el índice replica * tramos + tramo.
+
+    Devuelve arrays de (replicas, tramos) con las llegadas, los abandonos y el tiempo medio en la
+    cola de los clientes que llegan en cada tramo (NaN si no llega ninguno), y el largo medio de la
+    cola durante cada tramo.
+    """
+    tramos = -(-duracion // ancho)
+    replica = registro["replica"].astype(np.int64)
+    llegada = registro["llegada"]
+    # Sale de la cola al pasar a un box o, si nunca pasó, al abandonar o al cierre (ver cerrar)
+    inicio_atencion = registro["inicio_atencion"]
+    salida_cola = np.where(inicio_atencion >= 0, inicio_atencion, registro["salida"])
+
+    # 1. Llegadas, abandonos y tiempo en la cola según el tramo de llegada
+    celda = replica * tramos + np.minimum(llegada // ancho, tramos - 1)
+    llegadas = np.bincount(celda, minlength=replicas * tramos).reshape(replicas, tramos)
+    abandonos = np.bincount(celda, weights=registro["resultado"] == ABANDONO, minlength=replicas * tramos).reshape(replicas, tramos)
+    en_cola = np.bincount(celda, weights=salida_cola - llegada, minlength=replicas * tramos).reshape(replicas, tramos)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        espera_media = en_cola / llegadas
+
+    # 2. Largo medio de la cola: tiempo acumulado en la cola hasta cada borde de tramo, por diferencias
+    bordes = np.minimum(np.arange(tramos + 1) * ancho, duracion)
+    acumulado = np.empty((replicas, tramos + 1))
+    for k, borde in enumerate(bordes):
+        dentro = np.clip(borde - llegada, 0, salida_cola - llegada)
+        acumulado[:, k] = np.bincount(replica, weights=dentro, minlength=replicas)
+    cola_media = np.diff(acumulado, axis=1) / np.diff(bordes)
+
+    return {"llegadas": llegadas, "abandonos": abandonos, "espera_media": espera_media, "cola_media": cola_media}
+
+
+def _simular_bloque(tarea):
+    """
+    Simula un bloque de réplicas de una cantidad de boxes y lo resume por tramo (se ejecuta en un
+    proceso del pool). Devuelve lo mismo que barrido._simular_tarea más los arrays por tramo.
+    """
+    cantidad_boxes, desde, replicas, modelo, atencion, semilla, comunes = tarea
+    perfil = PERFILES[modelo]
+    flujos = flujos_replicas(semilla, replicas, desde, configuracion=None if comunes else cantidad_boxes)
+    resultados = simular_lote(cantidad_boxes, replicas, perfil=perfil, muestreador=atencion, flujos=flujos, registrar=True)
+    tramos = agregar_por_tramo(resultados.registro, replicas, perfil.duracion)
+    return (cantidad_boxes, resultados.calcular_costo(), resultados.clientes_atendidos, resultados.clientes_abandonados,
+            resultados.tiempo_max_espera, tramos)
+
+
+def bandas(valores, percentiles=PERCENTILES):
+    """
+    Percentiles de cada tramo entre las réplicas (filas de valores), ignorando las réplicas sin dato
+    en ese tramo. Devuelve un array de (len(percentiles), tramos).
+    """
+    with np.errstate(invalid="ignore"):
+        return np.nanpercentile(valores, percentiles, axis=0)
+
+
+def resumir_reporte(cantidad_boxes, partes, nivel=0.95, percentiles=PERCENTILES):
+    """
+    Resume los bloques de una cantidad de boxes (en orden de réplica) como barrido.resumir y agrega
+    lo que necesitan los gráficos: llegadas medias y bandas por tramo, y la distribución de abandonos.
+    """
+    resumen = resumir(cantidad_boxes, [parte[:4] for parte in partes], nivel)
+    tramos = {nombre: np.concatenate([parte[4][nombre] for parte in partes]) for nombre in partes[0][4]}
+    resumen.llegadas_media = tramos["llegadas"].mean(axis=0)
+    resumen.abandonos_media = tramos["abandonos"].mean(axis=0)
+    resumen.bandas_espera = bandas(tramos["espera_media"], percentiles)
+    resumen.bandas_cola = bandas(tramos["cola_media"], percentiles)
+    # Días con cada cantidad de abandonos (con los boxes fijos, el costo de un día depende solo de ellos)
+    resumen.dias_por_abandonos = np.bincount(np.concatenate([parte[2] for parte in partes]).astype(np.int64))
+    resumen.costo_boxes = cantidad_boxes * COSTO_BOX
+    return resumen
+
+
+def _dibujar_configuracion(tarea):
+    """
+    Guarda la figura de una cantidad de boxes (se ejecuta en un proceso del pool). Usa Figure sin
+    pyplot: no abre ninguna ventana ni depende del backend interactivo.
+    """
+    from matplotlib.figure import Figure
+
+    resumen, ruta, percentiles = tarea
+    tramos = len(resumen.llegadas_media)
+    horas = 8 + (np.arange(tramos) + 0.5) * ANCHO_TRAMO / 3600  # Centro de cada media hora (abre a las 8)
+
+    figura = Figure(figsize=(12, 8))
+    (llegadas, costos), (espera, cola) = figura.subplots(2, 2)
+    figura.suptitle(f"{resumen.cantidad_boxes} boxes, {resumen.replicas} réplicas")
+
+    # Llegadas y abandonos medios por media hora
+    ancho = ANCHO_TRAMO / 3600
+    llegadas.bar(horas, resumen.llegadas_media, width=ancho, edgecolor="black", color="skyblue", label="Llegadas")
+    llegadas.bar(horas, resumen.abandonos_media, width=ancho, edgecolor="black", color="red", label="Abandonos")
+    llegadas.set_xlabel("Hora del día")
+    llegadas.set_ylabel("Clientes por día (media)")
+    llegadas.set_title("Clientes por media hora")
+    llegadas.legend()
+
+    # Bandas de percentiles entre réplicas
+    for eje, valores, escala, titulo, unidad in ((espera, resumen.bandas_espera, 60, "Tiempo en la cola según la llegada", "Minutos"),
+                                                 (cola, resumen.bandas_cola, 1, "Largo medio de la cola", "Clientes")):
+        valores = valores / escala
+        eje.fill_between(horas, valores[0], valores[-1], color="tab:blue", alpha=0.2, label=f"p{percentiles[0]}-p{percentiles[-1]}")
+        eje.fill_between(horas, valores[1], valores[-2], color="tab:blue", alpha=0.4, label=f"p{percentiles[1]}-p{percentiles[-2]}")
+        eje.plot(horas, valores[len(percentiles) // 2], color="tab:blue", label="Mediana")
+        eje.set_xlabel("Hora del día")
+        eje.set_ylabel(unidad)
+        eje.set_title(titulo)
+        eje.legend()
+
+    # Distribución del costo diario (ya contada por cantidad de abandonos)
+    bordes = resumen.costo_boxes + (np.arange(len(resumen.dias_por_abandonos) + 1) - 0.5) * COSTO_ABANDONO
+    costos.stairs(resumen.dias_por_abandonos / resumen.replicas, bordes, fill=True, color="green")
+    costos.axvline(resumen.costo_medio, color="black", linestyle="--", label=f"Media ${resumen.costo_medio:.0f}")
+    costos.set_xlabel("Costo del día")
+    costos.set_ylabel("Fracción de días")
+    costos.set_title("Distribución del costo")
+    costos.legend()
+
+    figura.tight_layout()
+    figura.savefig(ruta)
+    return ruta
+
+
+def _dibujar_barrido(tarea):
+    """
+    Guarda la figura que compara todas las cantidades de boxes (se ejecuta en un proceso del pool).
+    """
+    from matplotlib.figure import Figure
+
+    resumenes, ruta = tarea
+    boxes = [resumen.cantidad_boxes for resumen in resumenes]
+    figura = Figure(figsize=(12, 4))
+    costo, abandono, espera = figura.subplots(1, 3)
+
+    costo.errorbar(boxes, [resumen.costo_medio for resumen in resumenes], yerr=[resumen.costo_ic for resumen in resumenes],
+                   marker="o", capsize=3)
+    costo.set_title("Costo medio (IC 95%)")
+    abandono.errorbar(boxes, [resumen.tasa_abandono * 100 for resumen in resumenes],
+                      yerr=[resumen.tasa_abandono_ic * 100 for resumen in resumenes], marker="o", capsize=3, color="red")
+    abandono.set_title("% de clientes que abandonan")
+    espera.plot(boxes, [resumen.espera_max_media / 60 for resumen in resumenes], marker="o", color="tab:orange")
+    espera.set_title("Espera máxima media (min)")
+    for eje in (costo, abandono, espera):
+        eje.set_xlabel("Boxes")
+        eje.set_xticks(boxes)
+
+    figura.tight_layout()
+    figura.savefig(ruta)
+    return ruta
+
+
+def generar_reporte(cantidades_boxes=range(1, 11), replicas=10000, modelo="tp8", semilla=None, procesos=None, carpeta="reporte",
+                    formato="png", tamano_bloque=2000, nivel=0.95, atencion=None, comunes=True, percentiles=PERCENTILES):
+    """
+    Simula replicas días de cada cantidad de boxes con el motor vectorizado y guarda en carpeta una
+    figura por cantidad de boxes y una del barrido completo (formato png o svg). Cada bloque de
+    réplicas se resume por tramo en su proceso, así que al proceso principal solo vuelven arrays de
+    (réplicas, tramos); las figuras también se dibujan en paralelo.
+
+    Devuelve los resúmenes (ver resumir_reporte) y las rutas de las figuras.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato} (opciones: {', '.join(FORMATOS)})")
+    cantidades_boxes = list(cantidades_boxes)
+    tareas = dividir_tareas(cantidades_boxes, replicas, modelo, atencion, semilla, tamano_bloque, comunes)
+    os.makedirs(carpeta, exist_ok=True)
+    procesos = procesos or os.cpu_count()
+
+    pool = ProcessPoolExecutor(max_workers=procesos) if procesos > 1 else None
+    try:
+        # 1. Simular y resumir los bloques
+        salidas = list(map(_simular_bloque, tareas) if pool is None else pool.map(_simular_bloque, tareas))
+        resumenes = [resumir_reporte(cantidad_boxes, [salida[1:] for salida in salidas if salida[0] == cantidad_boxes], nivel, percentiles)
+                     for cantidad_boxes in cantidades_boxes]
+        comparar_con_mejor(resumenes, nivel)
+
+        # 2. Dibujar las figuras
+        figuras = [(resumen, os.path.join(carpeta, f"boxes_{resumen.cantidad_boxes:02d}.{formato}"), percentiles) for resumen in resumenes]
+        barrido = (resumenes, os.path.join(carpeta, f"barrido.{formato}"))
+        if pool is None:
+            rutas = [*map(_dibujar_configuracion, figuras), _dibujar_barrido(barrido)]
+        else:
+            pendiente = pool.submit(_dibujar_barrido, barrido)
+            rutas = [*pool.map(_dibujar_configuracion, figuras), pendiente.result()]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return resumenes, rutas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simula muchas réplicas de cada cantidad de boxes y guarda los gráficos sin abrir ventanas.")
+    parser.add_argument("--boxes", type=int, nargs=2, default=(1, 10), metavar=("MIN", "MAX"))
+    parser.add_argument("--replicas", type=int, default=10000)
+    parser.add_argument("--modelo", choices=sorted(PERFILES), default="tp8")
+    parser.add_argument("--atencion", choices=DISTRIBUCIONES_CLI, default="normal_recortada")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--carpeta", default="reporte", help="Carpeta donde guardar las figuras")
+    parser.add_argument("--formato", choices=FORMATOS, default="png")
+    parser.add_argument("--bloque", type=int, default=2000, help="Réplicas simuladas juntas en cada tarea")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resumenes, rutas = generar_reporte(range(args.boxes[0], args.boxes[1] + 1), args.replicas, args.modelo, args.semilla, args.procesos,
+                                       args.carpeta, args.formato, args.bloque, atencion=args.atencion)
+    print(f"\n{'Boxes':>5} {'Costo medio':>12} {'IC 95%':>8} {'% abandono':>11} {'Cola máx. (mediana)':>20}")
+    for resumen in resumenes:
+        print(f"{resumen.cantidad_boxes:>5} {resumen.costo_medio:>12.0f} {resumen.costo_ic:>8.0f} "
+              f"{resumen.tasa_abandono * 100:>10.1f}% {np.nanmax(resumen.bandas_cola[len(PERCENTILES) // 2]):>20.1f}")
+    print(f"\n{len(rutas)} figuras en {args.carpeta} ({time.perf_counter() - inicio:.2f} s)")
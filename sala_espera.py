@@ -0,0 +1,150 @@
+import heapq
+import math
+from collections import deque
+
+
+class SalaEspera:
+    """
+    Cola de clientes esperando un box, con la misma paciencia para todos.
+
+    Como los clientes llegan en orden y todos esperan lo mismo, el orden de llegada es también el
+    orden de vencimiento: los que abandonan siempre salen por el frente de la cola.
+    """
+    def __init__(self, paciencia=1800):
+        self.paciencia = paciencia
+        self._clientes = deque()
+        self.ingresados = 0  # Total de clientes que entraron a la sala
+        self.atendidos = 0   # Total de clientes que salieron hacia un box
+        self.abandonados = 0  # Total de clientes que se fueron por superar la paciencia
+
+    def __len__(self):
+        return len(self._clientes)
+
+    def __bool__(self):
+        return bool(self._clientes)
+
+    def __iter__(self):
+        return iter(self._clientes)
+
+    def append(self, cliente, paciencia=None):
+        """
+        Agrega un cliente al final de la cola.
+        """
+        if paciencia is not None and paciencia != self.paciencia:
+            raise ValueError("SalaEspera requiere la misma paciencia para todos los clientes; usar SalaEsperaVariable")
+        self._clientes.append(cliente)
+        self.ingresados += 1
+
+    def popleft(self):
+        """
+        Saca al primer cliente de la cola para llevarlo a un box.
+        """
+        return self.extraer()[0]
+
+    def extraer(self):
+        """
+        Saca al primer cliente de la cola y devuelve (cliente, último segundo en que sigue esperando).
+        """
+        cliente = self._clientes.popleft()
+        self.atendidos += 1
+        return cliente, cliente.tiempo_llegada + self.paciencia
+
+    def proximo_vencimiento(self):
+        """
+        Primer segundo en el que algún cliente abandona la cola (infinito si está vacía).
+        """
+        if not self._clientes:
+            return math.inf
+        return self._clientes[0].tiempo_llegada + self.paciencia + 1
+
+    def expirar(self, tiempo_actual):
+        """
+        Saca de la cola a los clientes que superaron la paciencia y devuelve cuántos abandonaron.
+        """
+        clientes = self._clientes
+        limite = tiempo_actual - self.paciencia
+        abandonan = 0
+        while clientes and clientes[0].tiempo_llegada < limite:
+            clientes.popleft()
+            abandonan += 1
+        self.abandonados += abandonan
+        return abandonan
+
+
+class SalaEsperaVariable(SalaEspera):
+    """
+    Cola de clientes esperando un box cuando cada cliente tiene su propia paciencia.
+
+    Los clientes se atienden en orden de llegada, pero abandonan en orden de vencimiento, que se
+    lleva en un heap. Los que ya salieron se marcan y se descartan del heap cuando llegan al tope.
+    """
+    def __init__(self, paciencia=1800):
+        super().__init__(paciencia)
+        self._vencimientos = []  # Heap de (vencimiento, orden, entrada)
+        self._largo = 0
+
+    def __len__(self):
+        return self._largo
+
+    def __bool__(self):
+        return self._largo > 0
+
+    def __iter__(self):
+        return (entrada[0] for entrada in self._clientes if entrada[2])
+
+    def append(self, cliente, paciencia=None):
+        """
+        Agrega un cliente al final de la cola con su propia paciencia.
+        """
+        paciencia = self.paciencia if paciencia is None else paciencia
+        entrada = [cliente, cliente.tiempo_llegada + paciencia, True]
+        self._clientes.append(entrada)
+        heapq.heappush(self._vencimientos, (entrada[1], self.ingresados, entrada))
+        self.ingresados += 1
+        self._largo += 1
+
+    def extraer(self):
+        """
+        Saca al primer cliente que sigue esperando y devuelve (cliente, último segundo en que sigue esperando).
+        """
+        clientes = self._clientes
+        while not clientes[0][2]:
+            clientes.popleft()
+        entrada = clientes.popleft()
+        entrada[2] = False
+        self._largo -= 1
+        self.atendidos += 1
+        return entrada[0], entrada[1]
+
+    def _descartar_vencimientos_invalidos(self):
+        vencimientos = self._vencimientos
+        while vencimientos and not vencimientos[0][2][2]:
+            heapq.heappop(vencimientos)
+
+    def proximo_vencimiento(self):
+        """
+        Primer segundo en el que algún cliente abandona la cola (infinito si está vacía).
+        """
+        self._descartar_vencimientos_invalidos()
+        if not self._vencimientos:
+            return math.inf
+        return self._vencimientos[0][0] + 1
+
+    def expirar(self, tiempo_actual):
+        """
+        Saca de la cola a los clientes que superaron su paciencia y devuelve cuántos abandonaron.
+        """
+        vencimientos = self._vencimientos
+        abandonan = 0
+        while vencimientos and vencimientos[0][0] < tiempo_actual:
+            entrada = heapq.heappop(vencimientos)[2]
+            if entrada[2]:
+                entrada[2] = False
+                abandonan += 1
+        self._largo -= abandonan
+        self.abandonados += abandonan
+        # Los abandonos del frente ya no hacen falta en la cola de llegada
+        clientes = self._clientes
+        while clientes and not clientes[0][2]:
+            clientes.popleft()
+        return abandonan
@@ -0,0 +1,69 @@
+import numpy as np
+
+FLUJOS = ("llegadas", "atencion", "paciencia")
+
+
+class FlujosReplica:
+    """
+    Generadores independientes de una réplica: uno para las llegadas, otro para los tiempos de
+    atención y otro para la paciencia, derivados de la misma SeedSequence.
+
+    Los hijos se arman desde spawn_key (como semilla.spawn() en una SeedSequence recién creada) sin
+    modificar semilla, así la misma SeedSequence da siempre los mismos flujos.
+    """
+    def __init__(self, semilla=None):
+        if not isinstance(semilla, np.random.SeedSequence):
+            semilla = np.random.SeedSequence(semilla)
+        self.semilla = semilla
+        self.llegadas, self.atencion, self.paciencia = (np.random.default_rng(_hijo(semilla, i)) for i in range(len(FLUJOS)))
+
+    def derivacion(self):
+        """
+        Generador para las políticas de derivación al azar (ver multisitio.py): el hijo que sigue a
+        los de FLUJOS, independiente de las llegadas, la atención y la paciencia.
+        """
+        return np.random.default_rng(_hijo(self.semilla, len(FLUJOS)))
+
+
+def _hijo(semilla, indice):
+    """
+    Hijo indice de semilla, el mismo que daría semilla.spawn() en una SeedSequence recién creada.
+    """
+    return np.random.SeedSequence(semilla.entropy, spawn_key=(*semilla.spawn_key, indice), pool_size=semilla.pool_size)
+
+
+def entropia(semilla=None):
+    """
+    Fija la semilla raíz (sorteándola si es None) para poder repetirla en varias configuraciones.
+    """
+    return np.random.SeedSequence(semilla).entropy
+
+
+def semilla_replica(semilla, indice, configuracion=None):
+    """
+    SeedSequence de la réplica número indice: equivale al hijo indice de SeedSequence(semilla).spawn().
+
+    Sin configuracion, la réplica usa los mismos números aleatorios en todas las configuraciones
+    (números aleatorios comunes); con configuracion cada una recibe flujos independientes.
+    """
+    clave = (indice,) if configuracion is None else (configuracion, indice)
+    return np.random.SeedSequence(semilla, spawn_key=clave)
+
+
+def flujos_replicas(semilla, replicas, desde=0, configuracion=None):
+    """
+    Flujos de las réplicas desde, desde + 1, ..., desde + replicas - 1.
+    """
+    return [FlujosReplica(semilla_replica(semilla, i, configuracion)) for i in range(desde, desde + replicas)]
+
+
+def reduccion_varianza(a, b):
+    """
+    Cuántas veces menor es la varianza de la diferencia a - b con números aleatorios comunes que si
+    a y b se hubieran simulado con números independientes (Var(a) + Var(b)).
+    """
+    varianza_diferencia = np.var(np.asarray(a) - np.asarray(b), ddof=1)
+    varianza_independiente = np.var(a, ddof=1) + np.var(b, ddof=1)
+    if varianza_diferencia == 0:
+        return np.inf if varianza_independiente > 0 else 1.0
+    return float(varianza_independiente / varianza_diferencia)
@@ -0,0 +1,396 @@
+import pickle
+import zlib
+
+from estadisticas import ANCHO_TRAMO, Estadisticas
+from llegadas import DURACION, PERFIL_TP7
+from motor_eventos import PACIENCIA, MotorEventos
+from muestreo_atencion import crear_muestreador
+from perfilador import ASIGNACION, BOXES, COLA, LLEGADAS, OBSERVACION
+from registro_clientes import ABANDONO, ATENDIDO, RegistroClientes
+from sala_espera import SalaEspera, SalaEsperaVariable
+from semillas import FlujosReplica
+
+MOTORES = ("eventos", "ticks")
+COSTO_BOX = 1000  # Costo de tener abierto un box durante el día
+COSTO_BOX_HORA = COSTO_BOX * 3600 / DURACION  # Costo de cada hora de box abierto (horarios por tramos)
+COSTO_ABANDONO = 10000  # Costo de cada cliente que abandona
+
+
+class Cliente:
+    """
+    Representa un cliente que ingresa al local.
+    """
+    __slots__ = ("tiempo_llegada", "tiempo_atencion", "tiempo_salida", "tiempo_espera", "indice")
+
+    def __init__(self, tiempo_llegada):
+        self.tiempo_llegada = tiempo_llegada
+        self.tiempo_atencion = None
+        self.tiempo_salida = None
+        self.tiempo_espera = None
+        self.indice = None  # Fila del cliente en el RegistroClientes del local
+
+
+class Box:
+    """
+    Representa un box de atención al cliente.
+    """
+    __slots__ = ("ocupado", "cliente_actual", "tiempo_inicio_atencion", "vencimiento")
+
+    def __init__(self):
+        self.ocupado = False
+        self.cliente_actual = None
+        self.tiempo_inicio_atencion = None
+        self.vencimiento = None  # Último segundo que el cliente actual tolera desde su llegada
+
+
+class Local:
+    """
+    Representa el local de servicio.
+
+    El modelo se configura con datos: el perfil de llegadas (ver llegadas.py), la distribución de
+    los tiempos de atención (ver crear_muestreador), la paciencia (segundos o una distribución), los
+    costos y el segundo de apertura. motor elige el simulador por defecto: "eventos" (MotorEventos)
+    o "ticks", el bucle de referencia que avanza segundo a segundo. Con registrar_clientes, cada
+    cliente del día queda en un RegistroClientes (self.registro). Con un Perfilador, los motores
+    miden el tiempo de cada fase de la simulación.
+
+    Con el motor de eventos, el día también se puede simular de a tramos (iniciar, avanzar_hasta,
+    terminar) y, en una pausa, guardar una instantánea, bifurcarlo o cambiar la cantidad de boxes.
+    """
+    def __init__(self, cantidad_boxes, perfil=PERFIL_TP7, muestreador=None, paciencia=PACIENCIA,
+                 costo_box=COSTO_BOX, costo_abandono=COSTO_ABANDONO, apertura=8 * 3600, semilla=None,
+                 motor="eventos", detallado=False, registrar_clientes=False, perfilador=None):
+        if motor not in MOTORES:
+            raise ValueError(f"Motor desconocido: {motor}")
+        self.cantidad_boxes = cantidad_boxes
+        self.boxes = [Box() for _ in range(cantidad_boxes)]
+        self.perfil = perfil
+        self.paciencia = paciencia
+        self.costo_box = costo_box
+        self.costo_abandono = costo_abandono
+        self.apertura = apertura
+        self.motor = motor
+        self.detallado = detallado  # Informar cada atención y los abandonos al cierre
+        self.registrar_clientes = registrar_clientes
+        self.cola = SalaEspera(paciencia) if isinstance(paciencia, (int, float)) else SalaEsperaVariable()
+        self.flujos = FlujosReplica(semilla)  # Generadores de llegadas, atención y paciencia
+        self.muestreador = crear_muestreador(muestreador).con_generador(self.flujos.atencion)  # Distribución de los tiempos de atención
+        self.clientes_atendidos = 0
+        self.clientes_abandonados = 0
+        self.tiempo_inicio_operacion = None
+        self.tiempo_fin_operacion = None
+        self.tiempo_min_atencion = float('inf')
+        self.tiempo_max_atencion = 0
+        self.tiempo_min_espera = float('inf')
+        self.tiempo_max_espera = 0
+        self.estadisticas = None  # Estadisticas del último día simulado
+        self.registro = None  # RegistroClientes del último día simulado (con registrar_clientes)
+        self.perfilador = perfilador  # Perfilador que mide las fases de la simulación (None para no medir)
+        self.motor_eventos = None  # MotorEventos del día en curso (entre iniciar y terminar)
+        self.historial_boxes = []  # (segundo, cantidad de boxes desde ese segundo), desde la apertura
+
+    def simular(self, motor=None, al_observar=None):
+        """
+        Simula la operación del local durante un día y devuelve sus Estadisticas (llegadas y
+        abandonos por media hora, tiempos de espera y atención, largo de la cola y uso de los boxes).
+        al_observar se llama cada 100 segundos con el tiempo actual.
+        """
+        motor = self.motor if motor is None else motor
+        if motor not in MOTORES:
+            raise ValueError(f"Motor desconocido: {motor}")
+        if motor == "eventos":
+            self.iniciar(al_observar)
+            return self.terminar()
+        self._simular_por_segundos(self._preparar(al_observar))
+        return self._cerrar()
+
+    def _preparar(self, al_observar):
+        """
+        Prepara los tiempos de operación y las estadísticas del día; devuelve el observador a usar.
+        """
+        self.tiempo_inicio_operacion = self.apertura  # Tiempo de apertura en segundos
+        self.tiempo_fin_operacion = self.apertura + self.perfil.duracion  # Tiempo de cierre en segundos
+        self.estadisticas = Estadisticas(self.cantidad_boxes, self.apertura, self.perfil.duracion)
+        self.registro = RegistroClientes() if self.registrar_clientes else None
+        self.historial_boxes = [(self.apertura, self.cantidad_boxes)]
+        perfilador = self.perfilador
+        if perfilador is not None:
+            perfilador.iniciar()
+            if al_observar is not None:
+                al_observar = perfilador.observador(al_observar)
+        return al_observar
+
+    def _cerrar(self):
+        if self.perfilador is not None:
+            self.perfilador.cerrar(self)
+        if self.detallado:
+            print(f"Al cierre del local, {len(self.cola)} clientes abandonan el local")
+        return self.estadisticas
+
+    def iniciar(self, al_observar=None):
+        """
+        Prepara el día con el motor de eventos sin simular nada todavía.
+        """
+        al_observar = self._preparar(al_observar)
+        al_atender = self._informar_atencion if self.detallado else None
+        self.motor_eventos = MotorEventos(self, self.perfil, Cliente, paciencia=self.paciencia, flujos=self.flujos,
+                                          muestreador=self.muestreador, al_observar=al_observar, al_atender=al_atender,
+                                          estadisticas=self.estadisticas, registro=self.registro, perfilador=self.perfilador)
+
+    def avanzar_hasta(self, tiempo):
+        """
+        Simula los segundos anteriores a tiempo (a lo sumo hasta el cierre).
+        """
+        self.motor_eventos.avanzar_hasta(min(tiempo, self.tiempo_fin_operacion))
+
+    def tiempo_simulado(self):
+        """
+        Primer segundo que todavía no se simuló.
+        """
+        return self.motor_eventos.tiempo + 1
+
+    def terminar(self):
+        """
+        Simula lo que falta del día y devuelve sus Estadisticas.
+        """
+        self.motor_eventos.ejecutar()
+        self.motor_eventos = None
+        return self._cerrar()
+
+    def cambiar_boxes(self, cantidad):
+        """
+        Cambia la cantidad de boxes desde el primer segundo sin simular. Los boxes nuevos empiezan
+        libres. Al cerrar boxes, los clientes que se estaban atendiendo en ellos siguen en boxes
+        libres de los que quedan, así que no se pueden cerrar más boxes que los libres.
+        """
+        if self.motor_eventos is None:
+            raise ValueError("Solo se puede cambiar la cantidad de boxes de un día iniciado (ver iniciar)")
+        boxes = self.boxes
+        if sum(box.ocupado for box in boxes) > cantidad:
+            raise ValueError(f"Hay más de {cantidad} boxes ocupados")
+        renumerados = {}  # Índice anterior -> nuevo de los boxes ocupados que cambian de lugar
+        if cantidad < len(boxes):
+            libres = [i for i in range(cantidad) if not boxes[i].ocupado]
+            ocupados = [i for i in range(cantidad, len(boxes)) if boxes[i].ocupado]
+            quedan = boxes[:cantidad]
+            for anterior, nuevo in zip(ocupados, libres):
+                quedan[nuevo] = boxes[anterior]
+                renumerados[anterior] = nuevo
+            self.boxes = quedan
+        else:
+            boxes.extend(Box() for _ in range(cantidad - len(boxes)))
+        self.historial_boxes.append((self.tiempo_simulado(), cantidad))
+        self.cantidad_boxes = cantidad
+        self.motor_eventos.renumerar_boxes(renumerados)
+
+    def instantanea(self):
+        """
+        Estado completo del día en curso (reloj, boxes, cola, contadores, estadísticas y estado de
+        los generadores aleatorios), serializado y comprimido. Ver restaurar.
+        """
+        if self.motor_eventos is None:
+            raise ValueError("Solo se puede tomar una instantánea de un día iniciado (ver iniciar)")
+        return zlib.compress(pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def restaurar(datos):
+        """
+        Reconstruye el local de una instantánea, listo para seguir con avanzar_hasta o terminar. Sin
+        observador ni perfilador: la animación y las mediciones no forman parte del estado.
+        """
+        return pickle.loads(zlib.decompress(datos))
+
+    def bifurcar(self, ramas=1):
+        """
+        Devuelve ramas copias independientes del día en curso. Como llevan el estado de los
+        generadores, todas ven las mismas llegadas futuras salvo que se resorteen (ver resortear).
+        """
+        datos = self.instantanea()
+        return [Local.restaurar(datos) for _ in range(ramas)]
+
+    def resortear(self, semilla=None):
+        """
+        Sortea de nuevo las llegadas posteriores al último segundo simulado (con sus tiempos de
+        atención y paciencias) con los flujos de semilla.
+        """
+        self.motor_eventos.sortear(FlujosReplica(semilla))
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado["perfilador"] = None  # Mide una sola corrida
+        return estado
+
+    def _simular_por_segundos(self, al_observar):
+        """
+        Bucle de referencia: avanza de a un segundo sorteando si llega un cliente en cada uno.
+        """
+        probabilidades = self.perfil.probabilidades().tolist()  # Probabilidad de llegada de cada segundo desde la apertura
+        azar = self.flujos.llegadas.random
+        paciencias = None
+        if not isinstance(self.paciencia, (int, float)):
+            paciencias = crear_muestreador(self.paciencia).con_generador(self.flujos.paciencia)
+        estadisticas = self.estadisticas
+        registro = self.registro
+        perfilador = self.perfilador
+        ocupados = 0  # Cantidad de boxes ocupados
+
+        tiempo_actual = self.tiempo_inicio_operacion
+        while tiempo_actual < self.tiempo_fin_operacion:
+            # 1. Verificar si un cliente ingresa
+            if perfilador is not None:
+                perfilador.marcar(LLEGADAS)
+            if azar() < probabilidades[tiempo_actual - self.apertura]:
+                cliente = Cliente(tiempo_actual)
+                paciencia = self.paciencia if paciencias is None else round(paciencias.siguiente())
+                self.cola.append(cliente, None if paciencias is None else paciencia)
+                estadisticas.registrar_llegada(tiempo_actual)
+                if registro is not None:
+                    cliente.indice = registro.agregar(tiempo_actual, tiempo_actual + paciencia)
+
+            # 2. Atender a los clientes en la cola
+            if perfilador is not None:
+                perfilador.marcar(ASIGNACION, len(self.cola))
+            for i, box in enumerate(self.boxes):
+                if not box.ocupado and self.cola:
+                    cliente, box.vencimiento = self.cola.extraer()
+                    box.ocupado = True
+                    box.cliente_actual = cliente
+                    box.tiempo_inicio_atencion = tiempo_actual
+                    cliente.tiempo_atencion = self.muestreador.siguiente()  # Tiempo de atención en segundos
+                    ocupados += 1
+                    if registro is not None:
+                        registro.iniciar_atencion(cliente.indice, tiempo_actual, i, cliente.tiempo_atencion)
+                    if self.detallado:
+                        self._informar_atencion(cliente, tiempo_actual)
+
+            # 3. Actualizar el estado de los boxes y manejar clientes que abandonan
+            if perfilador is not None:
+                perfilador.marcar(BOXES)
+            for box in self.boxes:
+                if box.ocupado:
+                    cliente = box.cliente_actual
+                    tiempo_restante_atencion = cliente.tiempo_atencion - (tiempo_actual - box.tiempo_inicio_atencion)
+                    if tiempo_restante_atencion <= 0:
+                        # Cliente termina atención
+                        box.ocupado = False
+                        ocupados -= 1
+                        cliente.tiempo_salida = tiempo_actual
+                        cliente.tiempo_espera = cliente.tiempo_salida - cliente.tiempo_llegada
+                        estadisticas.registrar_atencion(cliente.tiempo_atencion, cliente.tiempo_espera)
+                        self.clientes_atendidos += 1
+                        if registro is not None:
+                            registro.terminar(cliente.indice, tiempo_actual, ATENDIDO)
+
+                        # Actualizar tiempos min y max de atención
+                        self.tiempo_min_atencion = min(self.tiempo_min_atencion, cliente.tiempo_atencion)
+                        self.tiempo_max_atencion = max(self.tiempo_max_atencion, cliente.tiempo_atencion)
+
+                        # Actualizar tiempos min y max de espera
+                        self.tiempo_min_espera = min(self.tiempo_min_espera, cliente.tiempo_espera)
+                        self.tiempo_max_espera = max(self.tiempo_max_espera, cliente.tiempo_espera)
+
+                    elif box.vencimiento < tiempo_actual:
+                        # Cliente que estaba siendo atendido abandona el local
+                        box.ocupado = False
+                        ocupados -= 1
+                        self.clientes_abandonados += 1  # Incrementa el contador de clientes abandonados
+                        estadisticas.registrar_abandono(tiempo_actual)
+                        if registro is not None:
+                            registro.terminar(cliente.indice, tiempo_actual, ABANDONO)
+
+            # 4. Eliminar clientes que abandonan la cola
+            if perfilador is not None:
+                perfilador.marcar(COLA)
+            expirados = self.cola.expirar(tiempo_actual)
+            if expirados:
+                self.clientes_abandonados += expirados
+                estadisticas.registrar_abandono(tiempo_actual, expirados)
+            estadisticas.registrar_estado(tiempo_actual, len(self.cola), ocupados)
+
+            # 5. Observar el estado (animación)
+            if perfilador is not None:
+                perfilador.marcar(OBSERVACION)
+            if al_observar is not None and tiempo_actual % 100 == 0:  # Actualizar cada 100 unidades de tiempo
+                al_observar(tiempo_actual)
+            if perfilador is not None:
+                perfilador.marcar(None)
+
+            tiempo_actual += 1  # Incrementar el tiempo para avanzar la simulación
+
+        # 6. Al finalizar la simulación, agregar los clientes que quedaron en la cola a los abandonados
+        self.clientes_abandonados += len(self.cola)
+        estadisticas.registrar_abandono(self.tiempo_fin_operacion, len(self.cola))
+        estadisticas.cerrar(self.tiempo_fin_operacion)
+        if registro is not None:
+            registro.cerrar(self.tiempo_fin_operacion)
+
+    def _informar_atencion(self, cliente, tiempo_actual):
+        print(f"Cliente comienza atención a las {tiempo_actual/3600:.2f} horas")
+
+    def costo_boxes(self):
+        """
+        Costo de los boxes. Si la cantidad de boxes cambió durante el día, cada box se cobra por el
+        tiempo que estuvo abierto.
+        """
+        if len(self.historial_boxes) <= 1:
+            return self.cantidad_boxes * self.costo_box
+        limites = [tiempo for tiempo, _ in self.historial_boxes[1:]] + [self.tiempo_fin_operacion]
+        segundos_box = sum(cantidad * (hasta - desde) for (desde, cantidad), hasta in zip(self.historial_boxes, limites))
+        return segundos_box * self.costo_box / self.perfil.duracion
+
+    def calcular_costo(self):
+        """
+        Calcula el costo total de la operación.
+        """
+        costo_perdida_clientes = self.clientes_abandonados * self.costo_abandono  # Costo por clientes abandonados
+        costo_total = self.costo_boxes() + costo_perdida_clientes
+        return costo_total
+
+    def resultados(self):
+        """
+        Devuelve las estadísticas finales de la simulación.
+        """
+        resumen = self.estadisticas.resumen() if self.estadisticas is not None else {}
+        return {
+            "cantidad_boxes": self.cantidad_boxes,
+            "clientes_ingresados": self.clientes_atendidos + self.clientes_abandonados,
+            "clientes_atendidos": self.clientes_atendidos,
+            "clientes_abandonados": self.clientes_abandonados,
+            "tiempo_min_atencion": self.tiempo_min_atencion,
+            "tiempo_max_atencion": self.tiempo_max_atencion,
+            "tiempo_min_espera": self.tiempo_min_espera,
+            "tiempo_max_espera": self.tiempo_max_espera,
+            "llegadas_por_media_hora": resumen.get("llegadas_por_tramo", []),
+            "abandonos_por_media_hora": resumen.get("abandonos_por_tramo", []),
+            "espera_media": resumen.get("espera_media"),
+            "espera_p90": resumen.get("espera_p90"),
+            "largo_cola_medio": resumen.get("largo_cola_medio"),
+            "utilizacion": resumen.get("utilizacion"),
+            "costo": self.calcular_costo(),
+        }
+
+    def imprimir_resultados(self, por_media_hora=False):
+        print(f"\nResultados de la simulación:")
+        print(f"Boxes de atención: {self.cantidad_boxes}")
+        print(f"Clientes ingresados: {self.clientes_atendidos + self.clientes_abandonados}")
+        print(f"Clientes atendidos: {self.clientes_atendidos}")
+        print(f"Clientes abandonados: {self.clientes_abandonados}")
+        if por_media_hora and self.estadisticas is not None:
+            for i, cantidad in enumerate(self.estadisticas.llegadas.cuentas.tolist()):
+                desde = self.tiempo_inicio_operacion + i * ANCHO_TRAMO  # Los tramos se cuentan desde la apertura
+                hasta = desde + ANCHO_TRAMO
+                print(f"Clientes ingresados entre las {desde // 3600}:{desde % 3600 // 60:02d} "
+                      f"y las {hasta // 3600}:{hasta % 3600 // 60:02d}: {cantidad}")
+        print(f"Costo total por clientes abandonados: ${self.clientes_abandonados * self.costo_abandono}")
+        print(f"Costo total por boxes: ${self.costo_boxes():.0f}")
+        print(f"Tiempo mínimo de atención en box: {self.tiempo_min_atencion/60:.2f} minutos")
+        print(f"Tiempo máximo de atención en box: {self.tiempo_max_atencion/60:.2f} minutos")
+        print(f"Tiempo mínimo de espera en salón: {self.tiempo_min_espera/60:.2f} minutos")
+        print(f"Tiempo máximo de espera en salón: {self.tiempo_max_espera/60:.2f} minutos")
+        if self.estadisticas is not None and self.clientes_atendidos:
+            resumen = self.estadisticas.resumen()
+            print(f"Tiempo medio de espera en salón: {resumen['espera_media']/60:.2f} minutos "
+                  f"(percentil 90: {resumen['espera_p90']/60:.2f} minutos)")
+            print(f"Largo medio de la cola: {resumen['largo_cola_medio']:.2f} clientes")
+            print(f"Utilización de los boxes: {resumen['utilizacion']:.1%}")
+        print(f"Costo de la operación: ${self.calcular_costo()}")
@@ -0,0 +1,342 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import importlib
+import json
+import struct
+import threading
+import time
+
+from pantalla import formatear_hora
+
+GUID_WEBSOCKET = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+LIMITE_ENCABEZADOS = 16384  # Bytes máximos de una petición HTTP
+LIMITE_TRAMA = 4096  # Bytes máximos de una trama WebSocket del cliente (sus mensajes se ignoran)
+CIERRE_DEMASIADO_GRANDE = 1009  # Código de cierre WebSocket para un mensaje que supera el límite
+
+PAGINA = """<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>Simulación de Boxes de Atención</title>
+<style>body{font-family:sans-serif;margin:2em}td{padding:2px 12px}.box{display:inline-block;width:28px;height:28px;margin:2px}</style>
+</head><body><h2>Simulación de Boxes de Atención</h2><div id="boxes"></div><p id="cola"></p><table id="datos"></table>
+<script>
+const estado = {};
+const fuente = new EventSource("/eventos");
+fuente.onmessage = (mensaje) => {
+  const datos = JSON.parse(mensaje.data);
+  Object.assign(estado, datos.completo || {}, datos.cambios || {});
+  document.getElementById("boxes").innerHTML = (estado.boxes || []).map(
+    (ocupado) => `<span class="box" style="background:${ocupado ? "red" : "lime"}"></span>`).join("");
+  document.getElementById("cola").textContent = `Clientes en la cola: ${estado.largo_cola}`;
+  document.getElementById("datos").innerHTML = Object.entries(estado).filter(([clave]) => clave !== "boxes").map(
+    ([clave, valor]) => `<tr><td>${clave}</td><td>${valor ?? ""}</td></tr>`).join("");
+};
+</script></body></html>
+"""
+
+
+def metricas(local, tiempo_actual, modelo="tp8"):
+    """
+    Los datos que muestra actualizar_pantalla (hora, clientes, tiempos extremos de atención y
+    espera en segundos, costos, boxes ocupados y largo de la cola) como diccionario serializable.
+    """
+    atendidos = local.clientes_atendidos
+    abandonados = local.clientes_abandonados
+    hay_tiempos = atendidos > 0
+    costo_boxes = local.costo_boxes()  # Prorrateado si la cantidad de boxes cambió
+    return {
+        "hora": formatear_hora(modelo, tiempo_actual),
+        "tiempo": tiempo_actual,
+        "ingresados": atendidos + abandonados,
+        "atendidos": atendidos,
+        "perdidos": abandonados,
+        "atencion_max": local.tiempo_max_atencion if hay_tiempos else None,
+        "atencion_min": local.tiempo_min_atencion if hay_tiempos else None,
+        "espera_max": local.tiempo_max_espera if hay_tiempos else None,
+        "espera_min": local.tiempo_min_espera if hay_tiempos else None,
+        "costo_boxes": costo_boxes,
+        "costo_abandonos": abandonados * local.costo_abandono,
+        "costo_total": costo_boxes + abandonados * local.costo_abandono,
+        "boxes": [int(box.ocupado) for box in local.boxes],
+        "largo_cola": len(local.cola),
+    }
+
+
+def diferencias(anterior, actual):
+    """
+    Claves de actual cuyo valor cambió respecto de anterior (las listas se mandan enteras).
+    """
+    return {clave: valor for clave, valor in actual.items() if anterior.get(clave) != valor}
+
+
+def _trama_websocket(texto, codigo=0x1):
+    """
+    Trama WebSocket del servidor (sin máscara) con un mensaje de texto o de control.
+    """
+    datos = texto.encode() if isinstance(texto, str) else texto
+    largo = len(datos)
+    if largo < 126:
+        encabezado = struct.pack("!BB", 0x80 | codigo, largo)
+    elif largo < 1 << 16:
+        encabezado = struct.pack("!BBH", 0x80 | codigo, 126, largo)
+    else:
+        encabezado = struct.pack("!BBQ", 0x80 | codigo, 127, largo)
+    return encabezado + datos
+
+
+class Tablero:
+    """
+    Servidor HTTP local que transmite en vivo los datos de la pantalla de una simulación, para
+    verla desde el navegador (/) o desde otros programas:
+
+    - GET /estado: el último estado como JSON.
+    - GET /eventos: Server-Sent Events.
+    - GET /ws: WebSocket.
+
+    Los flujos mandan primero {"completo": estado} y después, como mucho tasa veces por segundo,
+    {"cambios": ...} con las claves que cambiaron desde el último mensaje a ese cliente.
+
+    La simulación no espera nunca a la red: publicar solo reemplaza el último estado, y el servidor
+    corre en su propio thread con un loop de asyncio. Cada cliente recibe el estado más reciente
+    cuando termina de recibir el anterior, así un cliente lento se saltea los intermedios sin
+    demorar a la simulación ni a los demás.
+    """
+    def __init__(self, puerto=8765, anfitrion="127.0.0.1", tasa=10, espera_maxima=30):
+        self.puerto = puerto
+        self.anfitrion = anfitrion
+        self.tasa = tasa  # Mensajes por segundo a cada cliente, como mucho
+        self.espera_maxima = espera_maxima  # Segundos que se espera a un cliente trabado antes de cortarlo
+        self._ultimo = (0, None)  # (versión, estado); se reemplaza entero, sin bloqueos
+        self.clientes = 0
+        self._loop = None
+        self._servidor = None
+        self._thread = None
+        self._listo = threading.Event()
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *error):
+        self.cerrar()
+
+    def iniciar(self):
+        """
+        Levanta el servidor en un thread y espera a que acepte conexiones.
+        """
+        self._thread = threading.Thread(target=self._correr, daemon=True)
+        self._thread.start()
+        self._listo.wait()
+        if self._servidor is None:
+            raise OSError(f"No se pudo escuchar en {self.anfitrion}:{self.puerto}")
+
+    def cerrar(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    def publicar(self, estado):
+        """
+        Reemplaza el último estado (desde cualquier thread; no bloquea).
+        """
+        self._ultimo = (self._ultimo[0] + 1, estado)
+
+    def publicar_final(self, local, modelo="tp8", **datos):
+        """
+        Publica las métricas de local al cierre, con terminado=True y los datos agregados.
+        """
+        self.publicar(dict(metricas(local, local.tiempo_fin_operacion, modelo), terminado=True, **datos))
+
+    def esperar(self):
+        """
+        Sigue sirviendo el último estado hasta Ctrl+C.
+        """
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+    def observador(self, local, modelo="tp8", ritmo=None):
+        """
+        Devuelve un al_observar para la simulación de local que publica sus métricas, como mucho
+        tasa veces por segundo de reloj (el resto de las observaciones solo leen el reloj).
+
+        Con ritmo, además demora la simulación para avanzar ritmo segundos simulados por segundo
+        real, como el límite de fps de la animación.
+        """
+        intervalo = 1 / self.tasa
+        proxima = 0.0
+        inicio = None
+
+        def al_observar(tiempo_actual):
+            nonlocal proxima, inicio
+            ahora = time.monotonic()
+            if ritmo is not None:
+                if inicio is None:
+                    inicio = (ahora, tiempo_actual)
+                adelanto = inicio[0] + (tiempo_actual - inicio[1]) / ritmo - ahora
+                if adelanto > 0:
+                    time.sleep(adelanto)
+                    ahora += adelanto
+            if ahora >= proxima:
+                proxima = ahora + intervalo
+                self.publicar(metricas(local, tiempo_actual, modelo))
+        return al_observar
+
+    def _correr(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._servidor = self._loop.run_until_complete(
+                asyncio.start_server(self._atender, self.anfitrion, self.puerto, limit=LIMITE_ENCABEZADOS))
+            self.puerto = self._servidor.sockets[0].getsockname()[1]  # Con puerto 0, el que asignó el sistema
+        except OSError:
+            self._loop.close()
+            self._loop = None
+            self._listo.set()
+            return
+        self._listo.set()
+        self._loop.run_forever()
+
+        # Cortar las conexiones abiertas antes de cerrar el loop
+        self._servidor.close()
+        pendientes = asyncio.all_tasks(self._loop)
+        for tarea in pendientes:
+            tarea.cancel()
+        self._loop.run_until_complete(asyncio.gather(*pendientes, return_exceptions=True))
+        self._loop.run_until_complete(self._servidor.wait_closed())
+        self._loop.close()
+
+    async def _atender(self, lector, escritor):
+        try:
+            peticion = await lector.readuntil(b"\r\n\r\n")
+            lineas = peticion.decode("latin-1").split("\r\n")
+            metodo, ruta, _ = lineas[0].split(" ", 2)
+            encabezados = dict((clave.strip().lower(), valor.strip()) for clave, _, valor in
+                               (linea.partition(":") for linea in lineas[1:] if linea))
+            ruta = ruta.split("?", 1)[0]
+            if metodo != "GET":
+                await self._responder(escritor, "405 Method Not Allowed", "text/plain", b"Solo GET")
+            elif ruta == "/":
+                await self._responder(escritor, "200 OK", "text/html; charset=utf-8", PAGINA.encode())
+            elif ruta == "/estado":
+                await self._responder(escritor, "200 OK", "application/json", json.dumps(self._ultimo[1]).encode())
+            elif ruta == "/eventos":
+                escritor.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n\r\n")
+                await self._transmitir_hasta_cierre(self._esperar_fin(lector), escritor,
+                                                    lambda texto: f"data: {texto}\n\n".encode())
+            elif ruta == "/ws" and encabezados.get("upgrade", "").lower() == "websocket":
+                aceptar = base64.b64encode(hashlib.sha1((encabezados["sec-websocket-key"] + GUID_WEBSOCKET).encode()).digest())
+                escritor.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                               b"Sec-WebSocket-Accept: " + aceptar + b"\r\n\r\n")
+                await self._transmitir_hasta_cierre(self._leer_websocket(lector, escritor), escritor, _trama_websocket)
+            else:
+                await self._responder(escritor, "404 Not Found", "text/plain", b"No existe")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError, KeyError, asyncio.TimeoutError):
+            pass
+        except asyncio.CancelledError:
+            pass  # El tablero se está cerrando
+        finally:
+            escritor.close()
+
+    async def _responder(self, escritor, estado, tipo, cuerpo):
+        escritor.write(f"HTTP/1.1 {estado}\r\nContent-Type: {tipo}\r\nContent-Length: {len(cuerpo)}\r\n"
+                       f"Connection: close\r\n\r\n".encode() + cuerpo)
+        await escritor.drain()
+
+    async def _transmitir_hasta_cierre(self, lectura, escritor, enmarcar):
+        """
+        Transmite a un cliente mientras lectura (la corrutina que lee lo que manda) no termine: así
+        se detecta que el cliente cerró aunque el estado ya no cambie y no haya nada que escribirle.
+        """
+        lectura = asyncio.ensure_future(lectura)
+        transmision = asyncio.ensure_future(self._transmitir(escritor, enmarcar))
+        try:
+            await asyncio.wait((lectura, transmision), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            lectura.cancel()
+            transmision.cancel()
+            await asyncio.gather(lectura, transmision, return_exceptions=True)
+
+    async def _esperar_fin(self, lector):
+        """
+        Descarta lo que mande un cliente de SSE (no debería mandar nada) hasta que cierra la conexión.
+        """
+        while await lector.read(LIMITE_TRAMA):
+            pass
+
+    async def _transmitir(self, escritor, enmarcar):
+        """
+        Manda a un cliente el estado completo y después sus cambios, a lo sumo tasa veces por segundo,
+        hasta que se cierra la conexión.
+        """
+        self.clientes += 1
+        try:
+            version, enviado = 0, None
+            while not escritor.is_closing():
+                actual, estado = self._ultimo
+                if actual != version and estado is not None:
+                    mensaje = {"completo": estado} if enviado is None else {"cambios": diferencias(enviado, estado)}
+                    escritor.write(enmarcar(json.dumps(mensaje)))
+                    # Un cliente lento solo demora su propia corrutina; al volver lee el estado más reciente
+                    await asyncio.wait_for(escritor.drain(), self.espera_maxima)
+                    version, enviado = actual, estado
+                await asyncio.sleep(1 / self.tasa)
+        finally:
+            self.clientes -= 1
+
+    async def _leer_websocket(self, lector, escritor):
+        """
+        Lee las tramas del cliente hasta que cierra (los mensajes del cliente se ignoran). Una trama
+        de más de LIMITE_TRAMA bytes cierra la conexión sin leerla.
+        """
+        while True:
+            primero, segundo = await lector.readexactly(2)
+            largo = segundo & 0x7F
+            if largo == 126:
+                largo = struct.unpack("!H", await lector.readexactly(2))[0]
+            elif largo == 127:
+                largo = struct.unpack("!Q", await lector.readexactly(8))[0]
+            if largo > LIMITE_TRAMA:
+                escritor.write(_trama_websocket(struct.pack("!H", CIERRE_DEMASIADO_GRANDE), 0x8))
+                await escritor.drain()
+                return
+            mascara = await lector.readexactly(4) if segundo & 0x80 else b"\0\0\0\0"
+            datos = await lector.readexactly(largo)
+            if largo:
+                # Desenmascarar toda la trama de una vez como un entero grande
+                mascara = (mascara * (largo // 4 + 1))[:largo]
+                datos = (int.from_bytes(datos, "big") ^ int.from_bytes(mascara, "big")).to_bytes(largo, "big")
+            codigo = primero & 0x0F
+            if codigo == 0x8:
+                escritor.write(_trama_websocket(b"", 0x8))
+                return
+            if codigo == 0x9:
+                escritor.write(_trama_websocket(datos, 0xA))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simula días sin ventana y transmite la pantalla por HTTP (SSE y WebSocket).")
+    parser.add_argument("--modelo", choices=("tp7", "tp8"), default="tp8")
+    parser.add_argument("--boxes", type=int, default=5)
+    parser.add_argument("--dias", type=int, default=1)
+    parser.add_argument("--ritmo", type=float, default=600, help="Segundos simulados por segundo real (0: sin límite)")
+    parser.add_argument("--tasa", type=float, default=10, help="Mensajes por segundo a cada cliente, como mucho")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--anfitrion", default="127.0.0.1")
+    parser.add_argument("--semilla", type=int, default=None)
+    args = parser.parse_args()
+
+    modulo = importlib.import_module(args.modelo)
+    with Tablero(args.puerto, args.anfitrion, args.tasa) as tablero:
+        print(f"Tablero en http://{args.anfitrion}:{tablero.puerto}/ (Ctrl+C para terminar)")
+        for dia in range(args.dias):
+            semilla = None if args.semilla is None else args.semilla + dia
+            local = modulo.Local(args.boxes, semilla=semilla)
+            local.simular(headless=True, al_observar=tablero.observador(local, args.modelo, args.ritmo or None))
+            tablero.publicar_final(local, args.modelo, dia=dia + 1)
+            print(f"Día {dia + 1}: {local.clientes_atendidos} atendidos, {local.clientes_abandonados} perdidos, "
+                  f"costo ${local.calcular_costo():.0f}")
+        tablero.esperar()
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from barrido import barrer_boxes, barrer_secuencial, intervalo_confianza, mejor_configuracion
+
+
+def test_intervalo_confianza():
+    media, semiancho = intervalo_confianza(np.array([1.0, 2.0, 3.0, 4.0]))
+    assert media == 2.5 and semiancho == pytest.approx(2.054, abs=1e-3)
+    assert intervalo_confianza([5.0])[1] == np.inf
+
+
+def test_barrido_no_depende_de_los_procesos():
+    serie = barrer_boxes(range(3, 6), replicas=60, semilla=1, procesos=1, tamano_bloque=25)
+    paralelo = barrer_boxes(range(3, 6), replicas=60, semilla=1, procesos=2, tamano_bloque=25)
+    for a, b in zip(serie, paralelo):
+        assert np.array_equal(a.costos, b.costos)
+
+
+def test_secuencial_rechaza_un_presupuesto_insuficiente():
+    with pytest.raises(ValueError):
+        barrer_secuencial(range(1, 6), presupuesto=5, lote=10, procesos=1, semilla=1)
+
+
+@pytest.mark.parametrize("presupuesto", [10, 37, 600])
+def test_secuencial_respeta_el_presupuesto(presupuesto):
+    resumenes = barrer_secuencial(range(1, 6), tolerancia_costo=1, presupuesto=presupuesto, lote=10, procesos=1, semilla=1)
+    assert all(resumen.replicas >= 2 for resumen in resumenes)
+    assert sum(resumen.replicas for resumen in resumenes) <= presupuesto
+    assert not any(resumen.convergio for resumen in resumenes)  # Con tolerancia $1 no alcanza nunca
+
+
+def test_secuencial_converge_y_elige_como_el_barrido_fijo():
+    resumenes = barrer_secuencial(range(7, 11), tolerancia_costo=8000, tolerancia_abandono=None, presupuesto=5000,
+                                  procesos=1, semilla=2)
+    assert all(resumen.convergio and resumen.costo_ic <= 8000 for resumen in resumenes)
+    fijo = barrer_boxes(range(7, 11), replicas=500, semilla=2, procesos=1)
+    assert mejor_configuracion(resumenes).cantidad_boxes == mejor_configuracion(fijo).cantidad_boxes
@@ -0,0 +1,57 @@
+import pytest
+
+from bifurcacion import explorar
+from llegadas import PERFIL_TP8
+from simulacion import Local
+
+
+def totales(local):
+    return (local.clientes_atendidos, local.clientes_abandonados, local.tiempo_max_espera, local.calcular_costo())
+
+
+def test_restaurar_sigue_igual_que_sin_pausa():
+    """
+    Un día pausado, guardado y restaurado termina igual que el día simulado de una vez.
+    """
+    continuo = Local(4, perfil=PERFIL_TP8, semilla=5)
+    continuo.simular()
+
+    pausado = Local(4, perfil=PERFIL_TP8, semilla=5)
+    pausado.iniciar()
+    pausado.avanzar_hasta(pausado.apertura + 7200)
+    restaurado = Local.restaurar(pausado.instantanea())
+    restaurado.terminar()
+    assert totales(restaurado) == totales(continuo)
+
+    # El original sigue igual y las ramas son independientes entre sí
+    ramas = pausado.bifurcar(2)
+    for local in [pausado, *ramas]:
+        local.terminar()
+        assert totales(local) == totales(continuo)
+
+
+def test_explorar_rechaza_cerrar_boxes_ocupados():
+    local = Local(5, perfil=PERFIL_TP8, semilla=1)
+    local.iniciar()
+    local.avanzar_hasta(local.apertura + 7200)
+    ocupados = sum(box.ocupado for box in local.boxes)
+    assert ocupados > 1
+    with pytest.raises(ValueError):
+        explorar(local, [ocupados - 1, 5], procesos=1)
+    assert set(explorar(local, [ocupados, 6], procesos=1)) == {ocupados, 6}
+
+
+def test_boxes_cambiados_se_cobran_por_tiempo_abierto(capsys):
+    """
+    Con 4 boxes la primera mitad del día y 6 la segunda se cobran 5 días de box, también en el
+    costo impreso.
+    """
+    local = Local(4, perfil=PERFIL_TP8, semilla=2)
+    local.iniciar()
+    local.avanzar_hasta(local.apertura + PERFIL_TP8.duracion // 2)
+    local.cambiar_boxes(6)
+    local.terminar()
+    assert local.costo_boxes() == pytest.approx(5 * local.costo_box)
+    assert local.calcular_costo() == pytest.approx(5 * local.costo_box + local.clientes_abandonados * local.costo_abandono)
+    local.imprimir_resultados()
+    assert f"Costo total por boxes: ${5 * local.costo_box}\n" in capsys.readouterr().out
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from estadisticas import DigestoCuantiles, HistogramaTramos, Momentos, PromedioTemporal
+from llegadas import PERFIL_TP7
+from simulacion import Local
+
+
+def test_momentos_igual_a_numpy_tambien_al_unir():
+    valores = np.random.default_rng(1).lognormal(6, 0.5, 1000)
+    partes = [Momentos() for _ in range(3)]
+    for i, valor in enumerate(valores):
+        partes[i % 3].agregar(valor)
+    total = partes[0].unir(partes[1]).unir(partes[2])
+    assert total.n == len(valores)
+    assert total.media == pytest.approx(valores.mean())
+    assert total.varianza() == pytest.approx(valores.var(ddof=1))
+    assert (total.minimo, total.maximo) == (valores.min(), valores.max())
+
+
+def test_digesto_estima_cuantiles():
+    valores = np.random.default_rng(2).exponential(600, 20000)
+    digesto, otro = DigestoCuantiles(), DigestoCuantiles()
+    for valor in valores[:10000]:
+        digesto.agregar(valor)
+    for valor in valores[10000:]:
+        otro.agregar(valor)
+    digesto.unir(otro)
+    for q in (0.5, 0.9, 0.99):
+        assert digesto.cuantil(q) == pytest.approx(np.quantile(valores, q), rel=0.02)
+    assert np.isnan(DigestoCuantiles().cuantil(0.5))
+
+
+def test_histograma_y_promedio_temporal():
+    histograma = HistogramaTramos(duracion=3600, ancho=1800)
+    for tiempo in (0, 1799, 1800, 3600):  # El cierre cuenta en el último tramo
+        histograma.agregar(tiempo)
+    assert histograma.cuentas.tolist() == [2, 2]
+
+    promedio = PromedioTemporal()
+    promedio.actualizar(0, 2)
+    promedio.actualizar(10, 4)
+    promedio.cerrar(20)
+    assert promedio.promedio() == 3
+
+
+def test_estadisticas_del_dia_coinciden_con_el_local(capsys):
+    local = Local(3, perfil=PERFIL_TP7, apertura=0, semilla=4)
+    estadisticas = local.simular()
+    resumen = estadisticas.resumen()
+    # Los que siguen en un box al cierre llegaron pero no terminaron
+    sin_terminar = sum(resumen["llegadas_por_tramo"]) - local.clientes_atendidos - local.clientes_abandonados
+    assert 0 <= sin_terminar <= local.cantidad_boxes
+    assert sum(resumen["abandonos_por_tramo"]) == local.clientes_abandonados
+    assert resumen["clientes_atendidos"] == local.clientes_atendidos
+    assert 0 < resumen["utilizacion"] <= 1
+
+    # Las medias horas se cuentan desde la apertura del local (tp7 abre en 0)
+    local.imprimir_resultados(por_media_hora=True)
+    assert "entre las 0:00 y las 0:30" in capsys.readouterr().out
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from horarios import EvaluadorHorarios, mejor_fijo, mitades_sucesivas, optimizar_horario
+from llegadas import PERFIL_TP8
+from motor_vectorizado import simular_lote, sortear_clientes
+from multidia import PERFIL_DIA_COMPLETO
+from semillas import entropia, flujos_replicas
+
+
+@pytest.mark.parametrize("perfil", [PERFIL_TP8, PERFIL_DIA_COMPLETO])
+def test_horario_fijo_cuesta_lo_mismo_que_la_cantidad_fija(perfil):
+    """
+    Un horario con los mismos boxes todo el día cobra un día completo de cada box, sea cual sea
+    la duración del día.
+    """
+    clientes = sortear_clientes(10, perfil, None, flujos=flujos_replicas(entropia(1), 10))
+    tramos = -(-perfil.duracion // 1800)
+    fijo = simular_lote(5, 10, perfil=perfil, clientes=clientes)
+    horario = simular_lote(None, 10, perfil=perfil, clientes=clientes, horario=[5] * tramos)
+    assert np.allclose(fijo.calcular_costo(), horario.calcular_costo())
+    costos = simular_lote(5, 10, perfil=perfil, clientes=clientes, costo_box=2000, costo_abandono=1).calcular_costo()
+    assert np.array_equal(costos, 5 * 2000 + fijo.clientes_abandonados)
+
+
+def test_evaluador_reutiliza_las_replicas():
+    with EvaluadorHorarios(semilla=2, procesos=1) as evaluador:
+        horarios = [(4,) * 8, (5,) * 8]
+        primero = evaluador.evaluar(horarios, 20)
+        assert evaluador.simulados == 40
+        assert evaluador.evaluar(horarios, 20) == primero
+        assert evaluador.simulados == 40
+        evaluador.evaluar(horarios, 30)
+        assert evaluador.simulados == 60
+        assert mejor_fijo(evaluador) in horarios
+
+
+def test_mitades_sucesivas_ordena_a_todos():
+    candidatos = [(cantidad,) * 8 for cantidad in range(3, 11)]
+    with EvaluadorHorarios(semilla=3, procesos=1) as evaluador:
+        ranking = mitades_sucesivas(evaluador, candidatos, 2000)
+    assert sorted(ranking) == sorted(candidatos)
+    assert ranking[0] in [(8,) * 8, (9,) * 8, (10,) * 8]  # Con pocos boxes abandonan demasiados
+
+
+def test_optimizar_no_empeora_al_mejor_fijo():
+    evaluador, ranking = optimizar_horario(presupuesto=3000, candidatos=16, rondas=2, semilla=4, procesos=1)
+    mejor = ranking[0]
+    fijo = mejor_fijo(evaluador)
+    replicas = len(evaluador.costos[mejor])
+    assert evaluador.costos[mejor][:replicas].mean() <= evaluador.costos[fijo][:replicas].mean()
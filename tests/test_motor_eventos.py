@@ -0,0 +1,33 @@
+import numpy as np
+
+from llegadas import PERFIL_TP8
+from simulacion import Local
+
+
+def test_ticks_y_eventos_coinciden_en_promedio():
+    """
+    El bucle por segundos y el motor de eventos sortean distinto, pero simulan el mismo modelo: la
+    diferencia de las medias entre muchos días está dentro del error de muestreo.
+    """
+    dias = 200
+    resultados = {}
+    for motor in ("ticks", "eventos"):
+        atendidos, abandonados = [], []
+        for dia in range(dias):
+            local = Local(4, perfil=PERFIL_TP8, semilla=1000 * (motor == "ticks") + dia, motor=motor)
+            local.simular()
+            atendidos.append(local.clientes_atendidos)
+            abandonados.append(local.clientes_abandonados)
+        resultados[motor] = (np.array(atendidos), np.array(abandonados))
+    for ticks, eventos in zip(resultados["ticks"], resultados["eventos"]):
+        error = np.sqrt(ticks.var(ddof=1) / dias + eventos.var(ddof=1) / dias)
+        assert abs(ticks.mean() - eventos.mean()) < 4 * error
+
+
+def test_eventos_repite_el_dia_con_la_misma_semilla():
+    costos = []
+    for _ in range(2):
+        local = Local(4, perfil=PERFIL_TP8, semilla=3)
+        local.simular()
+        costos.append((local.clientes_atendidos, local.clientes_abandonados, local.tiempo_max_espera))
+    assert costos[0] == costos[1]
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from llegadas import PERFIL_TP7, PERFIL_TP8
+from motor_vectorizado import simular_lote
+from semillas import entropia, flujos_replicas, semilla_replica
+from simulacion import Local
+
+
+@pytest.mark.parametrize("perfil, cantidad_boxes", [(PERFIL_TP7, 3), (PERFIL_TP8, 4), (PERFIL_TP8, 8)])
+def test_eventos_y_vectorizado_con_los_mismos_flujos(perfil, cantidad_boxes):
+    """
+    Con los mismos flujos, MotorEventos y simular_lote simulan exactamente los mismos días.
+    """
+    semilla = entropia(11)
+    replicas = 20
+    lote = simular_lote(cantidad_boxes, replicas, perfil=perfil, flujos=flujos_replicas(semilla, replicas))
+    for i in range(replicas):
+        local = Local(cantidad_boxes, perfil=perfil, semilla=semilla_replica(semilla, i))
+        local.simular()
+        assert local.clientes_atendidos == lote.clientes_atendidos[i]
+        assert local.clientes_abandonados == lote.clientes_abandonados[i]
+        assert local.tiempo_min_atencion == lote.tiempo_min_atencion[i]
+        assert local.tiempo_max_atencion == lote.tiempo_max_atencion[i]
+        assert local.tiempo_min_espera == lote.tiempo_min_espera[i]
+        assert local.tiempo_max_espera == lote.tiempo_max_espera[i]
+        assert local.calcular_costo() == lote.calcular_costo()[i]
+
+
+def test_lote_con_rng_es_repetible():
+    a = simular_lote(5, 50, perfil=PERFIL_TP8, rng=np.random.default_rng(1))
+    b = simular_lote(5, 50, perfil=PERFIL_TP8, rng=np.random.default_rng(1))
+    assert np.array_equal(a.calcular_costo(), b.calcular_costo())
@@ -0,0 +1,53 @@
+import json
+from datetime import date
+
+import pytest
+
+from multidia import PERFIL_DIA_COMPLETO, PLANES, Jornada, calendario, leer_resumenes, simular_periodo
+from simulacion import COSTO_ABANDONO, COSTO_BOX
+
+# Lunes sin boxes (nadie es atendido), martes con 6 boxes las 12 horas y el resto cerrado
+PLAN_PRUEBA = [Jornada(PERFIL_DIA_COMPLETO, boxes=0), Jornada(PERFIL_DIA_COMPLETO, boxes=6)] + [None] * 5
+
+
+def _rechazar_nan(constante):
+    raise ValueError(f"JSON no estricto: {constante}")
+
+
+def test_calendario_salta_los_dias_cerrados_y_hereda_el_horario():
+    dias = list(calendario(PLANES["tp8"], date(2024, 1, 1), 14))  # Dos semanas desde un lunes
+    assert [fecha.weekday() for _, fecha, _, _ in dias] == [0, 1, 2, 3, 4, 5] * 2
+    assert all(horario == (10,) * 8 for _, fecha, _, horario in dias if fecha.weekday() < 5)
+    with pytest.raises(ValueError):
+        list(calendario([Jornada(PERFIL_DIA_COMPLETO)] * 7, date(2024, 1, 1), 1))
+
+
+def test_periodo_json_estricto_y_totales(tmp_path):
+    ruta = tmp_path / "dias.jsonl"
+    totales = simular_periodo(PLAN_PRUEBA, date(2024, 1, 1), 14, ruta, semilla=1)
+    lineas = ruta.read_text(encoding="utf-8").splitlines()
+    resumenes = [json.loads(linea, parse_constant=_rechazar_nan) for linea in lineas]
+    assert resumenes == leer_resumenes(ruta)
+
+    assert [r["dia_semana"] for r in resumenes] == ["lunes", "martes"] * 2
+    sin_boxes = resumenes[0]
+    assert sin_boxes["atendidos"] == 0 and sin_boxes["espera_media"] is None and sin_boxes["espera_p90"] is None
+    assert totales["dias_abiertos"] == 4
+    for clave in ("llegadas", "atendidos", "abandonados", "costo"):
+        assert totales[clave] == sum(r[clave] for r in resumenes)
+
+
+def test_dia_completo_cobra_un_dia_de_cada_box(tmp_path):
+    ruta = tmp_path / "dias.jsonl"
+    simular_periodo(PLAN_PRUEBA, date(2024, 1, 1), 7, ruta, semilla=2)
+    martes = leer_resumenes(ruta)[1]
+    assert martes["duracion"] == 12 * 3600 and martes["horas_box"] == 6 * 12
+    assert martes["costo"] == 6 * COSTO_BOX + martes["abandonados"] * COSTO_ABANDONO
+
+
+def test_resultado_no_depende_del_tamano_del_bloque(tmp_path):
+    completos = tmp_path / "completos.jsonl"
+    chicos = tmp_path / "chicos.jsonl"
+    simular_periodo(PLANES["completo"], date(2024, 1, 1), 10, completos, semilla=5)
+    simular_periodo(PLANES["completo"], date(2024, 1, 1), 10, chicos, semilla=5, dias_por_bloque=3)
+    assert leer_resumenes(completos) == leer_resumenes(chicos)
@@ -0,0 +1,16 @@
+import pytest
+
+from multisitio import crear_politica, red_aleatoria, simular_red
+
+
+@pytest.mark.parametrize("politica", [None, "cola_corta", "cercano", "aleatoria"])
+def test_simular_red_no_depende_de_los_procesos(politica):
+    """
+    Repartir los locales entre procesos no cambia el resultado de ningún local.
+    """
+    red = red_aleatoria(8, lado=6.0, semilla=3)
+    serie = simular_red(red, crear_politica(politica, umbral=3), semilla=4, procesos=1)
+    paralelo = simular_red(red, crear_politica(politica, umbral=3), semilla=4, procesos=3)
+    assert serie == paralelo
+    if politica is not None:
+        assert sum(sitio["derivados"] for sitio in serie) > 0
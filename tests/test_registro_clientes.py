@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from llegadas import PERFIL_TP8
+from motor_vectorizado import simular_lote
+from registro_clientes import ABANDONO, ATENDIDO, COLUMNAS, RegistroClientes
+from simulacion import Local
+
+
+@pytest.fixture
+def registro():
+    return simular_lote(4, 20, perfil=PERFIL_TP8, rng=np.random.default_rng(1), registrar=True).registro
+
+
+def iguales(a, b):
+    return all(np.array_equal(a[nombre], b[nombre], equal_nan=True) for nombre in COLUMNAS)
+
+
+@pytest.mark.parametrize("nombre", ["clientes.npz", "clientes"])
+def test_npz_ida_y_vuelta(registro, tmp_path, nombre):
+    """
+    guardar y cargar con la misma ruta, con o sin la extensión .npz.
+    """
+    ruta = registro.guardar(tmp_path / nombre)
+    assert ruta.endswith(".npz")
+    cargado = RegistroClientes.cargar(tmp_path / nombre)
+    assert len(cargado) == len(registro) and iguales(cargado, registro)
+    assert not cargado["llegada"].flags.writeable  # Mapeado en memoria, solo lectura
+
+
+def test_parquet_ida_y_vuelta(registro, tmp_path):
+    pytest.importorskip("pyarrow")
+    registro.guardar(tmp_path / "clientes.parquet")
+    assert iguales(RegistroClientes.cargar(tmp_path / "clientes.parquet"), registro)
+
+
+def test_registro_del_dia_coincide_con_el_local():
+    local = Local(4, perfil=PERFIL_TP8, semilla=2, registrar_clientes=True)
+    local.simular()
+    registro = local.registro
+    resumen = registro.resumen()
+    assert resumen["clientes_atendidos"] == local.clientes_atendidos
+    assert resumen["clientes_abandonados"] == local.clientes_abandonados
+    assert registro.tiempos_espera().max() == local.tiempo_max_espera
+    assert np.all(registro["salida"][registro["resultado"] == ABANDONO] <= registro["vencimiento"][registro["resultado"] == ABANDONO] + 1)
+    assert np.all(registro["inicio_atencion"][registro["resultado"] == ATENDIDO] >= 0)
+
+
+def test_registro_crece_al_agregar():
+    registro = RegistroClientes(capacidad=2)
+    for i in range(5):
+        assert registro.agregar(i, i + 10) == i
+    registro.cerrar(12)
+    assert registro["salida"].tolist() == [11, 12, 12, 12, 12]
+    assert (registro["resultado"] == ABANDONO).all()
@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import pytest
+
+from llegadas import PERFIL_TP8
+from motor_vectorizado import ANCHO_TRAMO, simular_lote
+from registro_clientes import ABANDONO
+from reportes import agregar_por_tramo, generar_reporte
+from semillas import entropia, flujos_replicas
+from simulacion import COSTO_ABANDONO, COSTO_BOX
+
+
+def test_agregar_por_tramo_igual_que_contar_segundo_a_segundo():
+    """
+    Compara con la cuenta directa: cada cliente está en la cola desde su llegada hasta que pasa a
+    un box o se va, y el largo de la cola se suma segundo a segundo.
+    """
+    replicas, duracion = 4, PERFIL_TP8.duracion
+    resultados = simular_lote(3, replicas, perfil=PERFIL_TP8, flujos=flujos_replicas(entropia(6), replicas), registrar=True)
+    registro = resultados.registro
+    tramos = agregar_por_tramo(registro, replicas, duracion)
+    cantidad_tramos = -(-duracion // ANCHO_TRAMO)
+
+    llegadas = np.zeros((replicas, cantidad_tramos))
+    abandonos = np.zeros((replicas, cantidad_tramos))
+    en_cola = np.zeros((replicas, cantidad_tramos))
+    cola = np.zeros((replicas, duracion))
+    for replica, llegada, inicio, salida, resultado in zip(registro["replica"], registro["llegada"], registro["inicio_atencion"],
+                                                           registro["salida"], registro["resultado"]):
+        sale = inicio if inicio >= 0 else salida
+        tramo = min(llegada // ANCHO_TRAMO, cantidad_tramos - 1)
+        llegadas[replica, tramo] += 1
+        abandonos[replica, tramo] += resultado == ABANDONO
+        en_cola[replica, tramo] += sale - llegada
+        cola[replica, llegada:min(sale, duracion)] += 1
+
+    assert np.array_equal(tramos["llegadas"], llegadas)
+    assert np.array_equal(tramos["abandonos"], abandonos)
+    with np.errstate(invalid="ignore"):
+        assert np.allclose(tramos["espera_media"], en_cola / llegadas, equal_nan=True)
+    assert np.allclose(tramos["cola_media"], cola.reshape(replicas, cantidad_tramos, ANCHO_TRAMO).mean(axis=2))
+    assert tramos["llegadas"].sum(axis=1).tolist() == np.bincount(registro["replica"], minlength=replicas).tolist()
+
+
+def test_reporte_cuenta_los_dias_por_abandonos(tmp_path):
+    pytest.importorskip("matplotlib")
+    resumenes, rutas = generar_reporte([3, 6], replicas=30, semilla=2, procesos=1, carpeta=tmp_path, tamano_bloque=12)
+    for resumen in resumenes:
+        dias = resumen.dias_por_abandonos
+        assert dias.sum() == resumen.replicas == 30
+        assert np.arange(len(dias)) @ dias / resumen.replicas == pytest.approx(resumen.abandonados_medio)
+        # Con los boxes fijos, el costo del día es el de los boxes más el de sus abandonos
+        abandonados = (resumen.costos - resumen.costo_boxes) / COSTO_ABANDONO
+        assert resumen.costo_boxes == resumen.cantidad_boxes * COSTO_BOX
+        assert np.array_equal(dias, np.bincount(abandonados.astype(int)))
+        assert resumen.llegadas_media.shape == resumen.abandonos_media.shape == resumen.bandas_cola.shape[1:]
+    assert len(rutas) == 3 and all(os.path.getsize(ruta) > 0 for ruta in rutas)
@@ -0,0 +1,47 @@
+import math
+
+from sala_espera import SalaEspera, SalaEsperaVariable
+from simulacion import Cliente
+
+
+def llenar(sala, llegadas, paciencias=None):
+    for i, llegada in enumerate(llegadas):
+        sala.append(Cliente(llegada), None if paciencias is None else paciencias[i])
+
+
+def test_sala_espera_vence_por_el_frente():
+    sala = SalaEspera(paciencia=10)
+    llenar(sala, [0, 5, 20])
+    assert sala.proximo_vencimiento() == 11
+    assert sala.expirar(10) == 0  # Tolera hasta el segundo llegada + paciencia
+    assert sala.expirar(11) == 1
+    assert sala.proximo_vencimiento() == 16
+    assert sala.expirar(30) == 1
+    assert len(sala) == 1 and sala.abandonados == 2
+    cliente, vencimiento = sala.extraer()
+    assert cliente.tiempo_llegada == 20 and vencimiento == 30
+    assert not sala and sala.proximo_vencimiento() == math.inf
+
+
+def test_sala_espera_variable_vence_por_paciencia():
+    sala = SalaEsperaVariable()
+    llenar(sala, [0, 1, 2], paciencias=[100, 5, 50])
+    assert sala.proximo_vencimiento() == 7
+    assert sala.expirar(7) == 1
+    assert len(sala) == 2
+    # Se atiende por orden de llegada aunque venza después
+    cliente, vencimiento = sala.extraer()
+    assert cliente.tiempo_llegada == 0 and vencimiento == 100
+    assert sala.proximo_vencimiento() == 53
+    assert sala.expirar(53) == 1
+    assert not sala and sala.proximo_vencimiento() == math.inf
+    assert (sala.ingresados, sala.atendidos, sala.abandonados) == (3, 1, 2)
+
+
+def test_sala_espera_variable_ignora_a_los_ya_atendidos():
+    sala = SalaEsperaVariable()
+    llenar(sala, [0, 1], paciencias=[3, 100])
+    sala.extraer()  # El que vencía primero ya pasó a un box
+    assert sala.proximo_vencimiento() == 102
+    assert sala.expirar(50) == 0
+    assert len(sala) == 1
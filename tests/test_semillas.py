@@ -0,0 +1,46 @@
+import numpy as np
+
+from llegadas import PERFIL_TP8
+from semillas import FlujosReplica, entropia, flujos_replicas, semilla_replica
+from simulacion import Local
+
+
+def sorteos(generador):
+    return generador.random(8)
+
+
+def test_flujos_repetibles_con_la_misma_seedsequence():
+    """
+    Crear flujos no modifica la SeedSequence: dos Local creados con la misma ven los mismos clientes.
+    """
+    semilla = np.random.SeedSequence(7)
+    costos = []
+    for _ in range(2):
+        local = Local(4, perfil=PERFIL_TP8, semilla=semilla)
+        local.simular()
+        costos.append((local.clientes_atendidos, local.clientes_abandonados, local.calcular_costo()))
+    assert costos[0] == costos[1]
+    assert np.array_equal(sorteos(FlujosReplica(semilla).llegadas), sorteos(FlujosReplica(semilla).llegadas))
+
+
+def test_flujos_equivalen_a_spawn():
+    esperados = [sorteos(np.random.default_rng(hijo)) for hijo in np.random.SeedSequence(5).spawn(3)]
+    flujos = FlujosReplica(5)
+    for esperado, generador in zip(esperados, (flujos.llegadas, flujos.atencion, flujos.paciencia)):
+        assert np.array_equal(esperado, sorteos(generador))
+
+
+def test_derivacion_independiente_de_los_demas_flujos():
+    flujos = FlujosReplica(np.random.SeedSequence(9))
+    derivacion = sorteos(flujos.derivacion())
+    for generador in (flujos.llegadas, flujos.atencion, flujos.paciencia):
+        assert not np.array_equal(derivacion, sorteos(generador))
+    assert np.array_equal(derivacion, sorteos(FlujosReplica(np.random.SeedSequence(9)).derivacion()))
+
+
+def test_replicas_comunes_e_independientes():
+    semilla = entropia(3)
+    comunes = flujos_replicas(semilla, 3)
+    assert np.array_equal(sorteos(comunes[1].llegadas), sorteos(FlujosReplica(semilla_replica(semilla, 1)).llegadas))
+    propias = flujos_replicas(semilla, 3, configuracion=4)
+    assert not np.array_equal(sorteos(flujos_replicas(semilla, 3)[1].llegadas), sorteos(propias[1].llegadas))
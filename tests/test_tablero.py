@@ -0,0 +1,85 @@
+import base64
+import json
+import os
+import socket
+import time
+import urllib.request
+
+import pytest
+
+from llegadas import PERFIL_TP8
+from simulacion import Local
+from tablero import Tablero, diferencias, metricas
+
+
+def _esperar(condicion, limite=5.0):
+    fin = time.monotonic() + limite
+    while not condicion():
+        if time.monotonic() > fin:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def _conectar(tablero, ruta, encabezados=""):
+    cliente = socket.create_connection(("127.0.0.1", tablero.puerto), timeout=5)
+    cliente.sendall(f"GET {ruta} HTTP/1.1\r\nHost: localhost\r\n{encabezados}\r\n".encode())
+    respuesta = b""
+    while b"\r\n\r\n" not in respuesta:
+        respuesta += cliente.recv(4096)
+    return cliente, respuesta
+
+
+@pytest.fixture
+def local():
+    local = Local(4, perfil=PERFIL_TP8, semilla=1)
+    local.iniciar()
+    local.avanzar_hasta(local.apertura + 3600)
+    local.cambiar_boxes(6)
+    local.terminar()
+    return local
+
+
+def test_diferencias_solo_manda_lo_que_cambio():
+    anterior = {"hora": "08:00", "boxes": [0, 1], "largo_cola": 3}
+    actual = {"hora": "08:01", "boxes": [0, 1], "largo_cola": 3, "terminado": True}
+    assert diferencias(anterior, actual) == {"hora": "08:01", "terminado": True}
+    assert diferencias(actual, actual) == {}
+
+
+def test_metricas_con_los_costos_del_local(local):
+    datos = metricas(local, local.tiempo_fin_operacion)
+    assert json.loads(json.dumps(datos)) == datos
+    assert datos["ingresados"] == local.clientes_atendidos + local.clientes_abandonados
+    assert datos["costo_boxes"] == pytest.approx(local.costo_boxes())
+    assert datos["costo_total"] == pytest.approx(local.calcular_costo())
+    assert len(datos["boxes"]) == 6
+
+
+def test_estado_despues_de_publicar_final(local):
+    with Tablero(puerto=0) as tablero:
+        tablero.publicar_final(local, dia=1)
+        with urllib.request.urlopen(f"http://127.0.0.1:{tablero.puerto}/estado", timeout=5) as respuesta:
+            estado = json.load(respuesta)
+    assert estado["terminado"] is True and estado["dia"] == 1
+    assert estado["atendidos"] == local.clientes_atendidos
+
+
+@pytest.mark.parametrize("ruta", ["/eventos", "/ws"])
+def test_cliente_cerrado_deja_de_contarse(local, ruta):
+    """
+    Después de publicar_final el estado no cambia más, así que al cliente no se le escribe nada:
+    igual tiene que dejar de contarse en cuanto cierra la conexión.
+    """
+    with Tablero(puerto=0, tasa=50) as tablero:
+        tablero.publicar_final(local)
+        encabezados = ""
+        if ruta == "/ws":
+            clave = base64.b64encode(os.urandom(16)).decode()
+            encabezados = f"Upgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: {clave}\r\nSec-WebSocket-Version: 13\r\n"
+        cliente, respuesta = _conectar(tablero, ruta, encabezados)
+        assert respuesta.split(b" ", 2)[1] in (b"200", b"101")
+        assert _esperar(lambda: tablero.clientes == 1)
+        time.sleep(0.2)  # Ya recibió el estado completo y no hay cambios
+        cliente.close()
+        assert _esperar(lambda: tablero.clientes == 0)
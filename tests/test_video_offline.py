@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from simulacion import COSTO_ABANDONO, COSTO_BOX  # noqa: E402
+from video_offline import Rasterizador, grabar_instantaneas, textos_pantalla  # noqa: E402
+
+
+def test_textos_con_los_costos_del_local():
+    instantaneas, _ = grabar_instantaneas("tp8", 3, semilla=1)
+    final = instantaneas[-1]
+    abandonados = int(final[4])
+    assert abandonados > 0
+
+    assert textos_pantalla("tp8", 3, final)[-1].endswith(f" {3 * COSTO_BOX + abandonados * COSTO_ABANDONO}")
+    costos = textos_pantalla("tp8", 3, final, costo_box=250, costo_abandono=40)[-3:]
+    for texto, valor in zip(costos, (750, abandonados * 40, 750 + abandonados * 40)):
+        assert texto.endswith(f" {valor}")
+
+
+def test_rasterizador_dibuja_los_costos_recibidos():
+    instantaneas, _ = grabar_instantaneas("tp8", 3, semilla=2)
+    por_defecto = Rasterizador("tp8", 3)
+    propio = Rasterizador("tp8", 3, costo_box=250, costo_abandono=40)
+    frame = por_defecto.dibujar(instantaneas[-1], por_defecto.nuevo_frame()).copy()
+    assert not np.array_equal(frame, propio.dibujar(instantaneas[-1], propio.nuevo_frame()))
+    assert np.array_equal(frame, Rasterizador("tp8", 3, COSTO_BOX, COSTO_ABANDONO).dibujar(instantaneas[-1], por_defecto.nuevo_frame()))
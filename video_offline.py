@@ -0,0 +1,242 @@
+import argparse
+import importlib
+import os
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from animacion import nombre_disponible
+from pantalla import (ETIQUETAS, INTERLINEA, LADO_BOX, RADIO_CLIENTE, SEPARACION_BOXES, SEPARACION_COLA, TAMANOS,
+                      X_BOXES, X_COLA, X_TEXTOS, Y_BOXES, Y_COLA, Y_ETIQUETA_BOX, Y_TEXTOS, clientes_visibles,
+                      valores_estadisticas)
+from simulacion import COSTO_ABANDONO, COSTO_BOX
+
+# Colores en BGR (el orden de OpenCV; pantalla usa RGB)
+BLANCO = (255, 255, 255)
+NEGRO = (0, 0, 0)
+ROJO = (0, 0, 255)
+VERDE = (0, 255, 0)
+AZUL = (255, 0, 0)
+
+FUENTE = cv2.FONT_HERSHEY_SIMPLEX
+ESCALA_ETIQUETA = 0.4
+ESCALA_TEXTO = 0.55
+
+# Columnas de cada instantánea
+COLUMNAS = ("tiempo", "ocupados", "largo_cola", "atendidos", "abandonados",
+            "min_atencion", "max_atencion", "min_espera", "max_espera")
+
+
+class RegistroInstantaneas:
+    """
+    Observador de Local.simular que guarda el estado visible del local cada vez que se llama
+    (el mismo momento en que la versión animada redibuja la pantalla).
+    """
+    def __init__(self, local):
+        self.local = local
+        self.filas = []
+
+    def __call__(self, tiempo_actual):
+        local = self.local
+        ocupados = 0  # Un bit por box ocupado
+        for i, box in enumerate(local.boxes):
+            if box.ocupado:
+                ocupados |= 1 << i
+        self.filas.append((
+            tiempo_actual, ocupados, len(local.cola), local.clientes_atendidos, local.clientes_abandonados,
+            local.tiempo_min_atencion, local.tiempo_max_atencion, local.tiempo_min_espera, local.tiempo_max_espera,
+        ))
+
+    def instantaneas(self):
+        return np.array(self.filas, dtype=float).reshape(-1, len(COLUMNAS))
+
+
+def grabar_instantaneas(modelo, cantidad_boxes, motor="eventos", semilla=None, muestreador=None):
+    """
+    Simula un día a máxima velocidad y devuelve las instantáneas (una fila por frame) y el Local.
+    """
+    modulo = importlib.import_module(modelo)
+    local = modulo.Local(cantidad_boxes, muestreador=muestreador, semilla=semilla)
+    registro = RegistroInstantaneas(local)
+    local.simular(motor=motor, headless=True, al_observar=registro)
+    return registro.instantaneas(), local
+
+
+def _ascii(texto):
+    """
+    Quita los acentos: las fuentes Hershey de OpenCV solo tienen caracteres ASCII.
+    """
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+
+
+def textos_pantalla(modelo, cantidad_boxes, instantanea, costo_box=COSTO_BOX, costo_abandono=COSTO_ABANDONO):
+    """
+    Textos del panel izquierdo para una instantánea, con el formato de actualizar_pantalla y los
+    costos del Local que se grabó.
+    """
+    tiempo, _, _, atendidos, abandonados, min_atencion, max_atencion, min_espera, max_espera = map(float, instantanea)
+    # Los contadores y las esperas son enteros en el Local
+    min_espera = int(min_espera) if np.isfinite(min_espera) else min_espera
+    valores = valores_estadisticas(modelo, cantidad_boxes, tiempo, int(atendidos), int(abandonados),
+                                   min_atencion, max_atencion, min_espera, int(max_espera), costo_box, costo_abandono)
+    return [_ascii(etiqueta + valor) for etiqueta, valor in zip(ETIQUETAS, valores)]
+
+
+class Rasterizador:
+    """
+    Dibuja instantáneas directamente en buffers BGR de NumPy, sin pygame ni ventana.
+    Lo que no cambia entre frames (fondo y nombres de los boxes) se dibuja una sola vez.
+    """
+    def __init__(self, modelo, cantidad_boxes, costo_box=COSTO_BOX, costo_abandono=COSTO_ABANDONO):
+        self.modelo = modelo
+        self.cantidad_boxes = cantidad_boxes
+        self.costo_box = costo_box
+        self.costo_abandono = costo_abandono
+        self.ancho, self.alto = TAMANOS[modelo]
+        self.fondo = np.full((self.alto, self.ancho, 3), BLANCO, dtype=np.uint8)
+        for i in range(cantidad_boxes):
+            etiqueta = f"Box {i + 1}"
+            (ancho_texto, alto_texto), _ = cv2.getTextSize(etiqueta, FUENTE, ESCALA_ETIQUETA, 1)
+            centro = X_BOXES + i * SEPARACION_BOXES + LADO_BOX // 2
+            cv2.putText(self.fondo, etiqueta, (centro - ancho_texto // 2, Y_ETIQUETA_BOX + alto_texto // 2),
+                        FUENTE, ESCALA_ETIQUETA, NEGRO, 1, cv2.LINE_AA)
+        # Cuántos clientes de la cola entran en la pantalla
+        self.max_cola = clientes_visibles(self.alto)
+
+    def nuevo_frame(self):
+        return np.empty_like(self.fondo)
+
+    def dibujar(self, instantanea, frame):
+        """
+        Dibuja la instantánea en frame (un array (alto, ancho, 3) uint8 que se sobrescribe).
+        """
+        np.copyto(frame, self.fondo)
+        ocupados = int(instantanea[1])
+
+        # Boxes: rojo si está ocupado (con el cliente en azul), verde si está libre
+        for i in range(self.cantidad_boxes):
+            x = X_BOXES + i * SEPARACION_BOXES
+            ocupado = ocupados >> i & 1
+            frame[Y_BOXES:Y_BOXES + LADO_BOX, x:x + LADO_BOX] = ROJO if ocupado else VERDE
+            if ocupado:
+                cv2.circle(frame, (x + LADO_BOX // 2, Y_BOXES + LADO_BOX // 2), RADIO_CLIENTE, AZUL, -1, cv2.LINE_AA)
+
+        # Cola de clientes (solo los que entran en la pantalla)
+        for i in range(min(int(instantanea[2]), self.max_cola)):
+            cv2.circle(frame, (X_COLA, Y_COLA + i * SEPARACION_COLA), RADIO_CLIENTE, AZUL, -1, cv2.LINE_AA)
+
+        # Textos a la izquierda de la pantalla (putText ubica la línea de base, no la esquina superior)
+        for i, texto in enumerate(textos_pantalla(self.modelo, self.cantidad_boxes, instantanea, self.costo_box, self.costo_abandono)):
+            cv2.putText(frame, texto, (X_TEXTOS, Y_TEXTOS + i * INTERLINEA + 14), FUENTE, ESCALA_TEXTO, NEGRO, 1, cv2.LINE_AA)
+        return frame
+
+
+def _rasterizar_rango(tarea):
+    """
+    Dibuja un rango de frames en la memoria compartida de la tanda (se ejecuta en un proceso del pool).
+    """
+    nombre_memoria, forma, modelo, cantidad_boxes, costos, instantaneas, desde = tarea
+    memoria = shared_memory.SharedMemory(name=nombre_memoria)
+    try:
+        frames = np.ndarray(forma, dtype=np.uint8, buffer=memoria.buf)
+        rasterizador = Rasterizador(modelo, cantidad_boxes, *costos)
+        for i, instantanea in enumerate(instantaneas):
+            rasterizador.dibujar(instantanea, frames[desde + i])
+        del frames
+    finally:
+        memoria.close()
+
+
+def _dividir(cantidad, partes):
+    """
+    Divide range(cantidad) en hasta partes rangos contiguos (desde, hasta) de tamaño parecido.
+    """
+    limites = np.linspace(0, cantidad, min(partes, cantidad) + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(limites[:-1], limites[1:]) if b > a]
+
+
+def renderizar_video(instantaneas, modelo, cantidad_boxes, nombre_archivo, fps=30, procesos=None, frames_por_tanda=None,
+                     costo_box=COSTO_BOX, costo_abandono=COSTO_ABANDONO):
+    """
+    Codifica las instantáneas como video con cv2.VideoWriter, un frame por instantánea. Los costos
+    del panel son los del Local que se grabó (costo_box y costo_abandono).
+
+    Los frames se dibujan en tandas sobre dos bloques de memoria compartida: mientras el pool
+    dibuja una tanda (repartida en rangos de frames entre los procesos), se codifica la anterior.
+    Devuelve la cantidad de frames escritos.
+    """
+    ancho, alto = TAMANOS[modelo]
+    out = cv2.VideoWriter(nombre_archivo, cv2.VideoWriter_fourcc(*'XVID'), fps, (ancho, alto))
+    if not out.isOpened():
+        raise RuntimeError(f"No se pudo abrir {nombre_archivo} para escribir el video")
+    procesos = procesos or os.cpu_count()
+    cantidad = len(instantaneas)
+
+    try:
+        if procesos == 1 or cantidad < 2:
+            rasterizador = Rasterizador(modelo, cantidad_boxes, costo_box, costo_abandono)
+            frame = rasterizador.nuevo_frame()
+            for instantanea in instantaneas:
+                out.write(rasterizador.dibujar(instantanea, frame))
+            return cantidad
+
+        tanda = frames_por_tanda or procesos * 8
+        forma = (tanda, alto, ancho, 3)
+        memorias = [shared_memory.SharedMemory(create=True, size=int(np.prod(forma))) for _ in range(2)]
+        try:
+            buffers = [np.ndarray(forma, dtype=np.uint8, buffer=memoria.buf) for memoria in memorias]
+            with ProcessPoolExecutor(max_workers=procesos) as pool:
+                anterior = None
+                for numero, base in enumerate(range(0, cantidad, tanda)):
+                    lote = instantaneas[base:base + tanda]
+                    memoria = memorias[numero % 2]
+                    futuros = [
+                        pool.submit(_rasterizar_rango, (memoria.name, forma, modelo, cantidad_boxes, (costo_box, costo_abandono),
+                                                       lote[desde:hasta], desde))
+                        for desde, hasta in _dividir(len(lote), procesos)
+                    ]
+                    if anterior is not None:
+                        _escribir_tanda(out, *anterior)
+                    anterior = (futuros, buffers[numero % 2], len(lote))
+                if anterior is not None:
+                    _escribir_tanda(out, *anterior)
+            del buffers
+        finally:
+            for memoria in memorias:
+                memoria.close()
+                memoria.unlink()
+        return cantidad
+    finally:
+        out.release()
+
+
+def _escribir_tanda(out, futuros, frames, cantidad):
+    for futuro in futuros:
+        futuro.result()
+    for frame in frames[:cantidad]:
+        out.write(frame)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera el video de la simulación sin abrir ninguna ventana.")
+    parser.add_argument("--modelo", choices=sorted(TAMANOS), default="tp8")
+    parser.add_argument("--boxes", type=int, default=5)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--motor", choices=("ticks", "eventos"), default="eventos")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--salida", default=None)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    instantaneas, local = grabar_instantaneas(args.modelo, args.boxes, args.motor, args.semilla)
+    simulado = time.perf_counter()
+    nombre_archivo = args.salida or nombre_disponible(args.modelo)
+    frames = renderizar_video(instantaneas, args.modelo, args.boxes, nombre_archivo, args.fps, args.procesos,
+                              costo_box=local.costo_box, costo_abandono=local.costo_abandono)
+    fin = time.perf_counter()
+    print(f"{nombre_archivo}: {frames} frames (simulación {simulado - inicio:.2f} s, video {fin - simulado:.2f} s)")